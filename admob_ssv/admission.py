@@ -0,0 +1,177 @@
+import threading
+
+from django.core.cache import cache
+
+from admob_ssv.conf import settings
+from admob_ssv.metrics import get_metrics
+
+
+class AdmissionController:
+    """
+    Caps the number of callbacks being verified at a time, so that bursts of
+    callbacks are turned away right away instead of queueing up until they
+    time out.
+
+    The cap applies per process, and optionally across all processes using a
+    counter in Django's cache. With a target latency, the per process cap
+    adapts to the observed latency: it's lowered multiplicatively while
+    verifications take longer than the target and raised additively again
+    while they don't, up to `ADMOB_SSV_MAX_IN_FLIGHT`.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._in_flight = 0
+        self._limit: float | None = None
+
+    @property
+    def in_flight(self) -> int:
+        return self._in_flight
+
+    @property
+    def limit(self) -> int | None:
+        max_in_flight = settings.max_in_flight
+        if max_in_flight is None:
+            return None
+        if self._limit is None:
+            return max_in_flight
+        return min(int(self._limit), max_in_flight)
+
+    def acquire(self) -> bool:
+        if not self.acquire_local_slot():
+            return False
+
+        if not self.acquire_fleet_slot():
+            self.release_local_slot()
+            return False
+
+        return True
+
+    async def aacquire(self) -> bool:
+        if not self.acquire_local_slot():
+            return False
+
+        if not await self.aacquire_fleet_slot():
+            self.release_local_slot()
+            return False
+
+        return True
+
+    def release(self, seconds: float) -> None:
+        self.release_fleet_slot()
+        self.release_local_slot()
+        self.adapt_limit(seconds)
+
+    async def arelease(self, seconds: float) -> None:
+        await self.arelease_fleet_slot()
+        self.release_local_slot()
+        self.adapt_limit(seconds)
+
+    def acquire_local_slot(self) -> bool:
+        with self._lock:
+            limit = self.limit
+            if limit is not None and self._in_flight >= limit:
+                return False
+            self._in_flight += 1
+            in_flight = self._in_flight
+
+        get_metrics().gauge("in_flight", in_flight)
+        return True
+
+    def release_local_slot(self) -> None:
+        with self._lock:
+            self._in_flight -= 1
+            in_flight = self._in_flight
+
+        get_metrics().gauge("in_flight", in_flight)
+
+    def acquire_fleet_slot(self) -> bool:
+        fleet_max_in_flight = settings.fleet_max_in_flight
+        if fleet_max_in_flight is None:
+            return True
+
+        # The counter expires regularly, so that slots leaked by processes
+        # which died while verifying don't stay taken. This makes the count
+        # approximate for a moment after each expiry.
+        key = settings.fleet_in_flight_cache_key
+        timeout = settings.fleet_in_flight_timeout.total_seconds()
+        cache.add(key, 0, timeout)
+
+        try:
+            fleet_in_flight = cache.incr(key)
+        except ValueError:
+            cache.add(key, 1, timeout)
+            fleet_in_flight = 1
+
+        if fleet_in_flight > fleet_max_in_flight:
+            self.release_fleet_slot()
+            return False
+
+        return True
+
+    async def aacquire_fleet_slot(self) -> bool:
+        fleet_max_in_flight = settings.fleet_max_in_flight
+        if fleet_max_in_flight is None:
+            return True
+
+        key = settings.fleet_in_flight_cache_key
+        timeout = settings.fleet_in_flight_timeout.total_seconds()
+        await cache.aadd(key, 0, timeout)
+
+        try:
+            fleet_in_flight = await cache.aincr(key)
+        except ValueError:
+            await cache.aadd(key, 1, timeout)
+            fleet_in_flight = 1
+
+        if fleet_in_flight > fleet_max_in_flight:
+            await self.arelease_fleet_slot()
+            return False
+
+        return True
+
+    def release_fleet_slot(self) -> None:
+        if settings.fleet_max_in_flight is None:
+            return
+
+        try:
+            cache.decr(settings.fleet_in_flight_cache_key)
+        except ValueError:
+            # The counter has expired in the meantime.
+            pass
+
+    async def arelease_fleet_slot(self) -> None:
+        if settings.fleet_max_in_flight is None:
+            return
+
+        try:
+            await cache.adecr(settings.fleet_in_flight_cache_key)
+        except ValueError:
+            # The counter has expired in the meantime.
+            pass
+
+    def adapt_limit(self, seconds: float) -> None:
+        target_latency = settings.admission_target_latency
+        max_in_flight = settings.max_in_flight
+        if target_latency is None or max_in_flight is None:
+            return
+
+        with self._lock:
+            limit = self._limit if self._limit is not None else float(max_in_flight)
+
+            if seconds > target_latency.total_seconds():
+                limit = max(limit * 0.9, 1.0)
+            else:
+                limit = min(limit + 1 / limit, float(max_in_flight))
+
+            self._limit = limit
+
+        get_metrics().gauge("in_flight_limit", int(limit))
+
+    def reset(self) -> None:
+        with self._lock:
+            self._in_flight = 0
+            self._limit = None
+
+
+admission_controller = AdmissionController()
@@ -0,0 +1,41 @@
+import logging
+
+from django.apps import AppConfig
+
+logger = logging.getLogger(__name__)
+
+
+class AdmobSSVConfig(AppConfig):
+    name = "admob_ssv"
+    verbose_name = "Admob SSV"
+    default_auto_field = "django.db.models.BigAutoField"
+
+    def ready(self):
+        from admob_ssv.conf import settings
+
+        if settings.preload_on_startup:
+            self.preload()
+
+        if settings.warm_keys_on_startup:
+            self.warm_public_keys()
+
+    def preload(self):
+        # Heavy dependencies are imported lazily, so that processes only pay
+        # for what they use. Importing them here instead makes the latency of
+        # the first callback predictable.
+        from admob_ssv.sources import get_key_source
+        from admob_ssv.verifiers import get_verifier
+        from admob_ssv.views import AdmobSSVView  # noqa: F401
+
+        get_verifier().preload()
+        get_key_source().preload()
+
+    def warm_public_keys(self):
+        from admob_ssv.views import AdmobSSVView
+
+        # A key server outage must not keep the project from starting, the
+        # keys are fetched on demand once it's reachable again.
+        try:
+            AdmobSSVView().warm_public_keys()
+        except Exception:
+            logger.exception("Warming the Admob SSV public keys failed")
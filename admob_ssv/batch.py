@@ -0,0 +1,168 @@
+import base64
+import binascii
+import itertools
+import multiprocessing
+import os
+import urllib.parse
+from collections import deque
+from collections.abc import Iterable, Iterator, Mapping
+from concurrent.futures import Executor, Future, ProcessPoolExecutor
+from typing import Any, NamedTuple
+
+from admob_ssv.conf import settings
+from admob_ssv.verifiers import load_key, load_verifier
+from admob_ssv.views import AdmobSSVView
+
+
+class VerificationResult(NamedTuple):
+    query: dict[str, str]
+    is_valid: bool
+    error: str | None = None
+
+
+def verify_callbacks(
+    callbacks: Iterable[str | Mapping[str, Any]],
+    processes: int | None = None,
+    chunk_size: int = 1000,
+    view: AdmobSSVView | None = None,
+) -> Iterator[VerificationResult]:
+    """
+    Verifies stored callbacks, e.g. for auditing them, and yields a result for
+    each of them in the same order.
+
+    Callbacks are given as query strings or as mappings of their query
+    parameters. They are read in chunks of `chunk_size`, whose callbacks are
+    grouped by key_id, so that each public key is parsed once per group, and
+    verified by a pool of `processes` processes. Pass `processes=0` to verify
+    them in the current process instead.
+
+    Public keys are looked up the same way the view does.
+    """
+    view = view or AdmobSSVView()
+    backend = settings.verifier_backend
+
+    if processes == 0:
+        for chunk in chunked(callbacks, chunk_size):
+            yield from collect(submit_chunk(None, view, backend, chunk))
+        return
+
+    processes = processes or os.cpu_count() or 1
+
+    # Worker processes are spawned rather than forked, because forking a
+    # process running threads, e.g. the key refresher, isn't safe.
+    with ProcessPoolExecutor(
+        max_workers=processes, mp_context=multiprocessing.get_context("spawn")
+    ) as executor:
+        # Only a few chunks are in flight at a time, so that arbitrarily many
+        # callbacks can be streamed through without piling up in memory.
+        pending: deque = deque()
+
+        for chunk in chunked(callbacks, chunk_size):
+            pending.append(submit_chunk(executor, view, backend, chunk))
+            if len(pending) > processes:
+                yield from collect(pending.popleft())
+
+        while pending:
+            yield from collect(pending.popleft())
+
+
+def chunked(iterable: Iterable, size: int) -> Iterator[list]:
+    iterator = iter(iterable)
+    while chunk := list(itertools.islice(iterator, size)):
+        yield chunk
+
+
+def submit_chunk(
+    executor: Executor | None,
+    view: AdmobSSVView,
+    backend: str,
+    chunk: list[str | Mapping[str, Any]],
+) -> tuple[list, list[dict[str, str]], list[Future]]:
+    results: list[VerificationResult | None] = [None] * len(chunk)
+    groups: dict[str, list[tuple[int, bytes, bytes]]] = {}
+    queries = []
+
+    for index, callback in enumerate(chunk):
+        if isinstance(callback, Mapping):
+            # Missing optional fields are stored as None, e.g. by the example
+            # project's `Verification` model, but weren't part of the callback.
+            query_string = urllib.parse.urlencode(
+                {
+                    str(name): str(value)
+                    for name, value in callback.items()
+                    if value is not None
+                }
+            )
+        else:
+            query_string = callback
+
+        query = dict(urllib.parse.parse_qsl(query_string, keep_blank_values=True))
+        queries.append(query)
+
+        encoded_signature = query.get(view.SIGNATURE_PARAM_NAME, None)
+        if encoded_signature is None:
+            results[index] = VerificationResult(query, False, "Missing signature")
+            continue
+
+        key_id = query.get(view.KEY_ID_PARAM_NAME, None)
+        if key_id is None:
+            results[index] = VerificationResult(query, False, "Missing key_id")
+            continue
+
+        try:
+            # Decoded like `AdmobSSVView.get_signature` does.
+            signature = base64.urlsafe_b64decode(encoded_signature + "===")
+        except (binascii.Error, ValueError):
+            results[index] = VerificationResult(query, False, "Invalid signature")
+            continue
+
+        content = view.get_sorted_unverified_content(query_string)
+        groups.setdefault(key_id, []).append((index, signature, content))
+
+    futures = []
+
+    for key_id, items in groups.items():
+        public_key = view.get_public_key(key_id)
+
+        if public_key is None:
+            for index, _, _ in items:
+                results[index] = VerificationResult(
+                    queries[index], False, "Unknown key_id"
+                )
+            continue
+
+        if executor is None:
+            future: Future = Future()
+            future.set_result(verify_group(backend, public_key, items))
+        else:
+            future = executor.submit(verify_group, backend, public_key, items)
+
+        futures.append(future)
+
+    return results, queries, futures
+
+
+def collect(
+    submitted: tuple[list, list[dict[str, str]], list[Future]],
+) -> Iterator[VerificationResult]:
+    results, queries, futures = submitted
+
+    for future in futures:
+        for index, is_valid in future.result():
+            error = None if is_valid else "Invalid signature"
+            results[index] = VerificationResult(queries[index], is_valid, error)
+
+    yield from results
+
+
+def verify_group(
+    backend: str, public_key: str, items: list[tuple[int, bytes, bytes]]
+) -> list[tuple[int, bool]]:
+    # Runs in the worker processes, which don't necessarily have Django set up,
+    # so the verifier backend is passed in instead of being read from settings.
+    verifier = load_verifier(backend)
+    verifying_key = load_key(backend, public_key)
+    return [
+        (index, verifier.verify(verifying_key, signature, content))
+        for index, signature, content in items
+    ]
@@ -0,0 +1,87 @@
+from collections.abc import Mapping
+
+
+class SSVCallback:
+    """
+    Verified SSV callback, sent to `valid_admob_ssv` receivers as `callback`.
+
+    Numeric fields are parsed into integers on first access and kept, so that
+    receivers don't need to repeat the conversion. Instances are immutable.
+    """
+
+    __slots__ = (
+        "_ad_network",
+        "_ad_unit",
+        "_key_id",
+        "_query",
+        "_reward_amount",
+        "_timestamp",
+    )
+
+    def __init__(self, query: Mapping[str, str]) -> None:
+        object.__setattr__(self, "_query", query)
+
+    def __setattr__(self, name: str, value: object) -> None:
+        raise AttributeError(f"{type(self).__name__} is immutable")
+
+    def __delattr__(self, name: str) -> None:
+        raise AttributeError(f"{type(self).__name__} is immutable")
+
+    def __repr__(self) -> str:
+        return f"<{type(self).__name__} transaction_id={self.transaction_id!r}>"
+
+    def _get_int(self, name: str) -> int:
+        # Slots that haven't been assigned yet raise AttributeError.
+        try:
+            return getattr(self, f"_{name}")
+        except AttributeError:
+            value = int(self._query[name])
+            object.__setattr__(self, f"_{name}", value)
+            return value
+
+    @property
+    def query(self) -> Mapping[str, str]:
+        return self._query
+
+    @property
+    def ad_network(self) -> int:
+        return self._get_int("ad_network")
+
+    @property
+    def ad_unit(self) -> int:
+        return self._get_int("ad_unit")
+
+    @property
+    def key_id(self) -> int:
+        return self._get_int("key_id")
+
+    @property
+    def reward_amount(self) -> int:
+        return self._get_int("reward_amount")
+
+    @property
+    def timestamp(self) -> int:
+        """
+        Time of the reward in milliseconds since the epoch.
+        """
+        return self._get_int("timestamp")
+
+    @property
+    def reward_item(self) -> str:
+        return self._query["reward_item"]
+
+    @property
+    def signature(self) -> str:
+        return self._query["signature"]
+
+    @property
+    def transaction_id(self) -> str:
+        return self._query["transaction_id"]
+
+    @property
+    def custom_data(self) -> str | None:
+        return self._query.get("custom_data", None)
+
+    @property
+    def user_id(self) -> str | None:
+        return self._query.get("user_id", None)
@@ -1,9 +1,26 @@
+from collections.abc import Collection, Sequence
 from datetime import timedelta
 
 from django.conf import settings as django_settings
 
 
 class Settings:
+    @property
+    def max_query_length(self) -> int:
+        return getattr(
+            django_settings,
+            "ADMOB_SSV_MAX_QUERY_LENGTH",
+            4096,
+        )
+
+    @property
+    def max_query_params(self) -> int:
+        return getattr(
+            django_settings,
+            "ADMOB_SSV_MAX_QUERY_PARAMS",
+            32,
+        )
+
     @property
     def keys_server_url(self) -> str:
         return getattr(
@@ -12,6 +29,59 @@ class Settings:
             "https://www.gstatic.com/admob/reward/verifier-keys.json",
         )
 
+    @property
+    def keys_server_connect_timeout(self) -> timedelta:
+        return getattr(
+            django_settings,
+            "ADMOB_SSV_KEYS_SERVER_CONNECT_TIMEOUT",
+            timedelta(seconds=3),
+        )
+
+    @property
+    def keys_server_read_timeout(self) -> timedelta:
+        return getattr(
+            django_settings,
+            "ADMOB_SSV_KEYS_SERVER_READ_TIMEOUT",
+            timedelta(seconds=10),
+        )
+
+    @property
+    def keys_server_retries(self) -> int:
+        return getattr(
+            django_settings,
+            "ADMOB_SSV_KEYS_SERVER_RETRIES",
+            2,
+        )
+
+    @property
+    def keys_server_retry_backoff(self) -> timedelta:
+        return getattr(
+            django_settings,
+            "ADMOB_SSV_KEYS_SERVER_RETRY_BACKOFF",
+            timedelta(milliseconds=500),
+        )
+
+    @property
+    def keys_file(self) -> str | None:
+        return getattr(
+            django_settings,
+            "ADMOB_SSV_KEYS_FILE",
+            None,
+        )
+
+    @property
+    def keys_sources(self) -> Sequence[str]:
+        # Falls back to the keys file, if there is one, for compatibility.
+        default_keys_sources = ["admob_ssv.sources.HttpKeySource"]
+        if self.keys_file is not None:
+            default_keys_sources.append("admob_ssv.sources.FileKeySource")
+
+        return getattr(
+            django_settings,
+            "ADMOB_SSV_KEYS_SOURCES",
+            default_keys_sources,
+        )
+
     @property
     def keys_cache_timeout(self) -> timedelta:
         return getattr(
@@ -28,5 +98,253 @@ class Settings:
             "admob_ssv.public_keys",
         )
 
+    @property
+    def keys_local_cache_timeout(self) -> timedelta:
+        return getattr(
+            django_settings,
+            "ADMOB_SSV_KEYS_LOCAL_CACHE_TIMEOUT",
+            timedelta(minutes=1),
+        )
+
+    @property
+    def keys_fetch_lock_timeout(self) -> timedelta | None:
+        return getattr(
+            django_settings,
+            "ADMOB_SSV_KEYS_FETCH_LOCK_TIMEOUT",
+            None,
+        )
+
+    @property
+    def keys_refresh_interval(self) -> timedelta:
+        return getattr(
+            django_settings,
+            "ADMOB_SSV_KEYS_REFRESH_INTERVAL",
+            timedelta(minutes=1),
+        )
+
+    @property
+    def unknown_key_ids_cache_timeout(self) -> timedelta:
+        return getattr(
+            django_settings,
+            "ADMOB_SSV_UNKNOWN_KEY_IDS_CACHE_TIMEOUT",
+            timedelta(minutes=10),
+        )
+
+    @property
+    def keys_stale_timeout(self) -> timedelta:
+        return getattr(
+            django_settings,
+            "ADMOB_SSV_KEYS_STALE_TIMEOUT",
+            timedelta(days=1),
+        )
+
+    @property
+    def keys_background_refresh_interval(self) -> timedelta | None:
+        return getattr(
+            django_settings,
+            "ADMOB_SSV_KEYS_BACKGROUND_REFRESH_INTERVAL",
+            None,
+        )
+
+    @property
+    def transaction_ids_cache_timeout(self) -> timedelta | None:
+        return getattr(
+            django_settings,
+            "ADMOB_SSV_TRANSACTION_IDS_CACHE_TIMEOUT",
+            None,
+        )
+
+    @property
+    def transaction_ids_allow_list(self) -> Collection[str]:
+        return getattr(
+            django_settings,
+            "ADMOB_SSV_TRANSACTION_IDS_ALLOW_LIST",
+            ("123456789",),
+        )
+
+    @property
+    def dispatcher_backend(self) -> str:
+        return getattr(
+            django_settings,
+            "ADMOB_SSV_DISPATCHER_BACKEND",
+            "admob_ssv.dispatchers.SyncDispatcher",
+        )
+
+    @property
+    def dispatcher_threads(self) -> int:
+        return getattr(
+            django_settings,
+            "ADMOB_SSV_DISPATCHER_THREADS",
+            4,
+        )
+
+    @property
+    def outbox_max_attempts(self) -> int:
+        return getattr(
+            django_settings,
+            "ADMOB_SSV_OUTBOX_MAX_ATTEMPTS",
+            5,
+        )
+
+    @property
+    def outbox_retry_delay(self) -> timedelta:
+        return getattr(
+            django_settings,
+            "ADMOB_SSV_OUTBOX_RETRY_DELAY",
+            timedelta(minutes=1),
+        )
+
+    @property
+    def dispatcher_task(self) -> str | None:
+        return getattr(
+            django_settings,
+            "ADMOB_SSV_DISPATCHER_TASK",
+            None,
+        )
+
+    @property
+    def async_verification_threads(self) -> int:
+        return getattr(
+            django_settings,
+            "ADMOB_SSV_ASYNC_VERIFICATION_THREADS",
+            4,
+        )
+
+    @property
+    def verification_processes(self) -> int | None:
+        return getattr(
+            django_settings,
+            "ADMOB_SSV_VERIFICATION_PROCESSES",
+            None,
+        )
+
+    @property
+    def verification_queue_size(self) -> int:
+        return getattr(
+            django_settings,
+            "ADMOB_SSV_VERIFICATION_QUEUE_SIZE",
+            64,
+        )
+
+    @property
+    def max_in_flight(self) -> int | None:
+        return getattr(
+            django_settings,
+            "ADMOB_SSV_MAX_IN_FLIGHT",
+            None,
+        )
+
+    @property
+    def fleet_max_in_flight(self) -> int | None:
+        return getattr(
+            django_settings,
+            "ADMOB_SSV_FLEET_MAX_IN_FLIGHT",
+            None,
+        )
+
+    @property
+    def fleet_in_flight_cache_key(self) -> str:
+        return getattr(
+            django_settings,
+            "ADMOB_SSV_FLEET_IN_FLIGHT_CACHE_KEY",
+            "admob_ssv.in_flight",
+        )
+
+    @property
+    def fleet_in_flight_timeout(self) -> timedelta:
+        return getattr(
+            django_settings,
+            "ADMOB_SSV_FLEET_IN_FLIGHT_TIMEOUT",
+            timedelta(minutes=1),
+        )
+
+    @property
+    def admission_target_latency(self) -> timedelta | None:
+        return getattr(
+            django_settings,
+            "ADMOB_SSV_ADMISSION_TARGET_LATENCY",
+            None,
+        )
+
+    @property
+    def retry_after(self) -> timedelta:
+        return getattr(
+            django_settings,
+            "ADMOB_SSV_RETRY_AFTER",
+            timedelta(seconds=30),
+        )
+
+    @property
+    def journal_directory(self) -> str | None:
+        return getattr(
+            django_settings,
+            "ADMOB_SSV_JOURNAL_DIRECTORY",
+            None,
+        )
+
+    @property
+    def journal_segment_size(self) -> int:
+        return getattr(
+            django_settings,
+            "ADMOB_SSV_JOURNAL_SEGMENT_SIZE",
+            64 * 1024 * 1024,
+        )
+
+    @property
+    def journal_buffer_size(self) -> int:
+        return getattr(
+            django_settings,
+            "ADMOB_SSV_JOURNAL_BUFFER_SIZE",
+            64 * 1024,
+        )
+
+    @property
+    def journal_max_segments(self) -> int | None:
+        return getattr(
+            django_settings,
+            "ADMOB_SSV_JOURNAL_MAX_SEGMENTS",
+            None,
+        )
+
+    @property
+    def verifying_keys_cache_size(self) -> int:
+        return getattr(
+            django_settings,
+            "ADMOB_SSV_VERIFYING_KEYS_CACHE_SIZE",
+            16,
+        )
+
+    @property
+    def verifier_backend(self) -> str:
+        return getattr(
+            django_settings,
+            "ADMOB_SSV_VERIFIER_BACKEND",
+            "admob_ssv.verifiers.EcdsaVerifier",
+        )
+
+    @property
+    def preload_on_startup(self) -> bool:
+        return getattr(
+            django_settings,
+            "ADMOB_SSV_PRELOAD_ON_STARTUP",
+            False,
+        )
+
+    @property
+    def warm_keys_on_startup(self) -> bool:
+        return getattr(
+            django_settings,
+            "ADMOB_SSV_WARM_KEYS_ON_STARTUP",
+            False,
+        )
+
+    @property
+    def metrics_backend(self) -> str:
+        return getattr(
+            django_settings,
+            "ADMOB_SSV_METRICS_BACKEND",
+            "admob_ssv.metrics.NullMetrics",
+        )
+
 
 settings = Settings()
@@ -0,0 +1,130 @@
+import hashlib
+import math
+import threading
+import time
+from collections import OrderedDict
+
+from django.core.cache import cache
+
+from admob_ssv.conf import settings
+
+
+class TransactionIdStore:
+    """
+    Remembers the transaction_ids of dispatched callbacks, so that callbacks
+    retried by Admob are neither verified nor dispatched again.
+
+    Transaction ids are stored in Django's cache, with a bounded process-local
+    copy of recently seen transaction ids in front of it.
+    """
+
+    max_size = 4096
+
+    def __init__(self) -> None:
+        self._transaction_ids: OrderedDict[str, float] = OrderedDict()
+        self._lock = threading.Lock()
+
+    @property
+    def enabled(self) -> bool:
+        return settings.transaction_ids_cache_timeout is not None
+
+    def is_ignored(self, transaction_id: str) -> bool:
+        return not self.enabled or transaction_id in settings.transaction_ids_allow_list
+
+    def contains(self, transaction_id: str) -> bool:
+        if self.is_ignored(transaction_id):
+            return False
+
+        if self.contains_locally(transaction_id):
+            return True
+
+        if cache.get(self.get_cache_key(transaction_id)) is None:
+            return False
+
+        self.add_locally(transaction_id)
+        return True
+
+    async def acontains(self, transaction_id: str) -> bool:
+        if self.is_ignored(transaction_id):
+            return False
+
+        if self.contains_locally(transaction_id):
+            return True
+
+        if await cache.aget(self.get_cache_key(transaction_id)) is None:
+            return False
+
+        self.add_locally(transaction_id)
+        return True
+
+    def add(self, transaction_id: str) -> bool:
+        """
+        Returns False if the transaction_id has been added before, e.g. by a
+        concurrent request for the same callback.
+        """
+        if self.is_ignored(transaction_id):
+            return True
+
+        added = cache.add(
+            self.get_cache_key(transaction_id), True, self.get_cache_timeout()
+        )
+        self.add_locally(transaction_id)
+        return added
+
+    async def aadd(self, transaction_id: str) -> bool:
+        if self.is_ignored(transaction_id):
+            return True
+
+        added = await cache.aadd(
+            self.get_cache_key(transaction_id), True, self.get_cache_timeout()
+        )
+        self.add_locally(transaction_id)
+        return added
+
+    def discard(self, transaction_id: str) -> None:
+        if self.is_ignored(transaction_id):
+            return
+
+        cache.delete(self.get_cache_key(transaction_id))
+        self.discard_locally(transaction_id)
+
+    async def adiscard(self, transaction_id: str) -> None:
+        if self.is_ignored(transaction_id):
+            return
+
+        await cache.adelete(self.get_cache_key(transaction_id))
+        self.discard_locally(transaction_id)
+
+    def contains_locally(self, transaction_id: str) -> bool:
+        expires_at = self._transaction_ids.get(transaction_id, None)
+        return expires_at is not None and time.monotonic() < expires_at
+
+    def add_locally(self, transaction_id: str) -> None:
+        timeout = settings.transaction_ids_cache_timeout.total_seconds()
+
+        with self._lock:
+            self._transaction_ids[transaction_id] = time.monotonic() + timeout
+            self._transaction_ids.move_to_end(transaction_id)
+            while len(self._transaction_ids) > self.max_size:
+                self._transaction_ids.popitem(last=False)
+
+    def discard_locally(self, transaction_id: str) -> None:
+        with self._lock:
+            self._transaction_ids.pop(transaction_id, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._transaction_ids.clear()
+
+    def get_cache_timeout(self) -> int:
+        return math.floor(settings.transaction_ids_cache_timeout.total_seconds())
+
+    @staticmethod
+    def get_cache_key(transaction_id: str) -> str:
+        # Transaction ids are hashed, since unverified callbacks might carry
+        # arbitrary transaction ids which aren't valid cache keys.
+        digest = hashlib.sha256(transaction_id.encode("utf-8")).hexdigest()
+        return f"admob_ssv.transaction_ids.{digest}"
+
+
+transaction_ids = TransactionIdStore()
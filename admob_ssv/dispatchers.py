@@ -0,0 +1,175 @@
+import functools
+import logging
+from concurrent.futures import Future, ThreadPoolExecutor
+
+from asgiref.sync import sync_to_async
+from django.db import close_old_connections, transaction
+from django.utils import timezone
+from django.utils.module_loading import import_string
+
+from admob_ssv.callbacks import SSVCallback
+from admob_ssv.conf import settings
+from admob_ssv.signals import valid_admob_ssv
+
+logger = logging.getLogger(__name__)
+
+
+def send_valid_admob_ssv(query: dict[str, str]) -> None:
+    valid_admob_ssv.send(sender=None, query=query, callback=SSVCallback(query))
+
+
+class Dispatcher:
+    """
+    Base class of dispatchers, which hand verified callbacks over to the
+    receivers of the `valid_admob_ssv` signal.
+    """
+
+    def dispatch(self, query: dict[str, str]) -> None:
+        raise NotImplementedError
+
+    async def adispatch(self, query: dict[str, str]) -> None:
+        await sync_to_async(self.dispatch)(query)
+
+
+class SyncDispatcher(Dispatcher):
+    """
+    Sends the signal right away, before the response is returned.
+    """
+
+    def dispatch(self, query: dict[str, str]) -> None:
+        send_valid_admob_ssv(query)
+
+    async def adispatch(self, query: dict[str, str]) -> None:
+        # Signal.asend was added in Django 5.0.
+        if hasattr(valid_admob_ssv, "asend"):
+            await valid_admob_ssv.asend(
+                sender=None, query=query, callback=SSVCallback(query)
+            )
+        else:
+            await sync_to_async(send_valid_admob_ssv)(query)
+
+
+def send_valid_admob_ssv_in_thread(query: dict[str, str]) -> None:
+    # Pool threads outlive requests, so the database connections of receivers
+    # are recycled the way Django does around each request.
+    close_old_connections()
+    try:
+        send_valid_admob_ssv(query)
+    finally:
+        close_old_connections()
+
+
+class ThreadPoolDispatcher(Dispatcher):
+    """
+    Sends the signal from a thread pool, after the response has been returned.
+
+    Callbacks which haven't been dispatched yet are lost if the process exits.
+    """
+
+    def __init__(self) -> None:
+        self.executor = ThreadPoolExecutor(
+            max_workers=settings.dispatcher_threads,
+            thread_name_prefix="admob-ssv-dispatch",
+        )
+
+    def dispatch(self, query: dict[str, str]) -> None:
+        future = self.executor.submit(send_valid_admob_ssv_in_thread, query)
+        future.add_done_callback(self.log_exception)
+
+    async def adispatch(self, query: dict[str, str]) -> None:
+        self.dispatch(query)
+
+    @staticmethod
+    def log_exception(future: Future) -> None:
+        exception = future.exception()
+        if exception is not None:
+            logger.error(
+                "Dispatching a valid Admob SSV callback failed", exc_info=exception
+            )
+
+
+class DatabaseOutboxDispatcher(Dispatcher):
+    """
+    Stores callbacks in a database table, from which they are dispatched by the
+    `process_admob_ssv_outbox` management command.
+
+    Requires `admob_ssv` to be part of the `INSTALLED_APPS`.
+    """
+
+    def dispatch(self, query: dict[str, str]) -> None:
+        from admob_ssv.models import OutboxEntry
+
+        OutboxEntry.objects.create(query=query)
+
+
+class CeleryDispatcher(Dispatcher):
+    """
+    Enqueues callbacks using the Celery task at `ADMOB_SSV_DISPATCHER_TASK`,
+    which is expected to call `send_valid_admob_ssv` with the given query.
+    """
+
+    def dispatch(self, query: dict[str, str]) -> None:
+        task = import_string(settings.dispatcher_task)
+        task.delay(query)
+
+
+def process_outbox(limit: int | None = None) -> int:
+    """
+    Dispatches the entries of the outbox in order and returns how many of them
+    were dispatched.
+
+    Entries whose receivers fail are logged and retried in later runs, after
+    `ADMOB_SSV_OUTBOX_RETRY_DELAY`, doubling with each attempt. Entries that
+    failed `ADMOB_SSV_OUTBOX_MAX_ATTEMPTS` times are left in the outbox, but
+    aren't retried anymore, so that they don't hold up the others.
+    """
+    from admob_ssv.models import OutboxEntry
+
+    processed = 0
+    attempted = 0
+
+    while limit is None or attempted < limit:
+        # Each entry is dispatched in its own transaction, so that a failing
+        # receiver leaves the entry for the next attempt without dispatching
+        # any other entry more than once.
+        with transaction.atomic():
+            entry = (
+                OutboxEntry.objects.select_for_update(skip_locked=True)
+                .filter(
+                    attempts__lt=settings.outbox_max_attempts,
+                    available_at__lte=timezone.now(),
+                )
+                .order_by("pk")
+                .first()
+            )
+
+            if entry is None:
+                break
+
+            attempted += 1
+
+            try:
+                with transaction.atomic():
+                    send_valid_admob_ssv(entry.query)
+            except Exception:
+                logger.exception("Dispatching %s failed", entry)
+                retry_delay = settings.outbox_retry_delay * 2**entry.attempts
+                entry.attempts += 1
+                entry.available_at = timezone.now() + retry_delay
+                entry.save(update_fields=["attempts", "available_at"])
+                continue
+
+            entry.delete()
+
+        processed += 1
+
+    return processed
+
+
+@functools.cache
+def load_dispatcher(backend: str) -> Dispatcher:
+    return import_string(backend)()
+
+
+def get_dispatcher() -> Dispatcher:
+    return load_dispatcher(settings.dispatcher_backend)
@@ -0,0 +1,203 @@
+import logging
+import urllib.parse
+from collections.abc import Awaitable, Callable, Iterable, MutableMapping
+from typing import Any
+
+from asgiref.sync import sync_to_async
+from django.core import signals
+from django.http import HttpResponse, HttpResponseServerError
+
+from admob_ssv.views import AdmobSSVView, AsyncAdmobSSVView
+
+# Failures are logged like Django logs them for the requests it handles.
+request_logger = logging.getLogger("django.request")
+
+ASGIApplication = Callable[
+    [MutableMapping[str, Any], Callable[[], Awaitable], Callable[[dict], Awaitable]],
+    Awaitable[None],
+]
+WSGIApplication = Callable[[dict, Callable], Iterable[bytes]]
+
+
+class QueryParams(dict):
+    """
+    Query parameters of a callback, standing in for `request.GET`. Like
+    `QueryDict`, repeated parameters resolve to their last value.
+    """
+
+    def dict(self) -> dict[str, str]:
+        return {**self}
+
+
+class CallbackRequest:
+    """
+    Minimal stand-in for `HttpRequest`, carrying nothing but the query string
+    of a callback, which is all the views look at.
+    """
+
+    __slots__ = ("META", "_query_params")
+
+    def __init__(self, query_string: str) -> None:
+        self.META = {"QUERY_STRING": query_string}
+        self._query_params: QueryParams | None = None
+
+    @property
+    def GET(self) -> QueryParams:
+        # Parsed on first use, which oversized query strings never get to.
+        if self._query_params is None:
+            self._query_params = QueryParams(
+                urllib.parse.parse_qsl(
+                    self.META["QUERY_STRING"], keep_blank_values=True
+                )
+            )
+        return self._query_params
+
+
+def get_response_headers(response: HttpResponse) -> list[tuple[str, str]]:
+    return [*response.items(), ("Content-Length", str(len(response.content)))]
+
+
+def get_error_response(request: CallbackRequest, path: str) -> HttpResponse:
+    """
+    Reports the exception being handled like Django does for the requests it
+    handles, and returns a 500 response, so that Admob retries the callback.
+    """
+    signals.got_request_exception.send(sender=None, request=request)
+    request_logger.exception(
+        "Internal Server Error: %s", path, extra={"status_code": 500}
+    )
+    return HttpResponseServerError()
+
+
+class AdmobSSVWSGIHandler:
+    """
+    WSGI application handling callbacks to `path` without going through
+    Django's middleware, URL resolver and request parsing. Callbacks are
+    handled by `AdmobSSVView.get`, so that they're validated, deduplicated,
+    verified and dispatched just like by the view. Django's `request_started`
+    and `request_finished` signals are sent around each callback, so that
+    database connections are closed once they're too old or broken.
+
+    Requests to other paths are passed on to `application`, e.g. the Django
+    project's WSGI application, or answered with 404 if there is none.
+    """
+
+    def __init__(
+        self,
+        application: WSGIApplication | None = None,
+        path: str = "/admob-ssv/",
+        view: AdmobSSVView | None = None,
+    ) -> None:
+        self.application = application
+        self.path = path
+        self.view = view or AdmobSSVView()
+
+    def __call__(self, environ: dict, start_response: Callable) -> Iterable[bytes]:
+        if environ.get("PATH_INFO") != self.path:
+            if self.application is not None:
+                return self.application(environ, start_response)
+            response = HttpResponse("Not Found", status=404)
+        elif environ["REQUEST_METHOD"] != "GET":
+            response = HttpResponse(status=405, headers={"Allow": "GET"})
+        else:
+            # Decoded like Django's WSGIRequest does.
+            query_string = (
+                environ.get("QUERY_STRING", "")
+                .encode("iso-8859-1")
+                .decode(errors="replace")
+            )
+            response = self.handle(CallbackRequest(query_string), environ)
+
+        start_response(
+            f"{response.status_code} {response.reason_phrase}",
+            get_response_headers(response),
+        )
+        return [response.content]
+
+    def handle(self, request: CallbackRequest, environ: dict) -> HttpResponse:
+        signals.request_started.send(sender=self.__class__, environ=environ)
+        try:
+            return self.view.get(request)
+        except Exception:  # noqa: BLE001
+            return get_error_response(request, self.path)
+        finally:
+            signals.request_finished.send(sender=self.__class__)
+
+
+class AdmobSSVASGIHandler:
+    """
+    ASGI counterpart of `AdmobSSVWSGIHandler`, handling callbacks to `path` by
+    `AsyncAdmobSSVView.get`.
+
+    Without an `application` to pass other requests on to, lifespan events are
+    acknowledged, so that it can also be served on its own.
+    """
+
+    def __init__(
+        self,
+        application: ASGIApplication | None = None,
+        path: str = "/admob-ssv/",
+        view: AsyncAdmobSSVView | None = None,
+    ) -> None:
+        self.application = application
+        self.path = path
+        self.view = view or AsyncAdmobSSVView()
+
+    async def __call__(
+        self,
+        scope: MutableMapping[str, Any],
+        receive: Callable[[], Awaitable],
+        send: Callable[[dict], Awaitable],
+    ) -> None:
+        if scope["type"] == "http" and scope["path"] == self.path:
+            if scope["method"] != "GET":
+                response = HttpResponse(status=405, headers={"Allow": "GET"})
+            else:
+                query_string = scope.get("query_string", b"").decode(errors="replace")
+                response = await self.handle(CallbackRequest(query_string), scope)
+        elif self.application is not None:
+            await self.application(scope, receive, send)
+            return
+        elif scope["type"] == "lifespan":
+            await self.handle_lifespan(receive, send)
+            return
+        else:
+            response = HttpResponse("Not Found", status=404)
+
+        await send(
+            {
+                "type": "http.response.start",
+                "status": response.status_code,
+                "headers": [
+                    (name.lower().encode("latin-1"), value.encode("latin-1"))
+                    for name, value in get_response_headers(response)
+                ],
+            }
+        )
+        await send({"type": "http.response.body", "body": response.content})
+
+    async def handle(
+        self, request: CallbackRequest, scope: MutableMapping[str, Any]
+    ) -> HttpResponse:
+        # Sent from the thread the view's database queries run in, like Django
+        # does, so that the connections closed are the ones the view uses.
+        await sync_to_async(signals.request_started.send)(
+            sender=self.__class__, scope=scope
+        )
+        try:
+            return await self.view.get(request)
+        except Exception:  # noqa: BLE001
+            return get_error_response(request, self.path)
+        finally:
+            await sync_to_async(signals.request_finished.send)(sender=self.__class__)
+
+    async def handle_lifespan(
+        self, receive: Callable[[], Awaitable], send: Callable[[dict], Awaitable]
+    ) -> None:
+        while True:
+            message = await receive()
+            if message["type"] == "lifespan.startup":
+                await send({"type": "lifespan.startup.complete"})
+            elif message["type"] == "lifespan.shutdown":
+                await send({"type": "lifespan.shutdown.complete"})
+                return
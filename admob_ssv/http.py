@@ -0,0 +1,137 @@
+import importlib
+import os
+import threading
+from collections.abc import Mapping
+from typing import TYPE_CHECKING, Any
+
+from asgiref.sync import sync_to_async
+
+from admob_ssv.conf import settings
+
+if TYPE_CHECKING:
+    import requests
+
+
+class KeyServerClient:
+    """
+    Pooled HTTP client for fetching the key set from the key server.
+
+    Connections are reused across fetches, requests are bounded by timeouts
+    and retried with backoff. Responses are revalidated using conditional
+    requests, so that an unchanged key set only costs a 304 response.
+
+    `requests` is imported once the first session is created, so processes
+    which take the key set from the cache never pay for importing it.
+    """
+
+    modules = ("requests", "requests.adapters", "urllib3.util.retry")
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._session: requests.Session | None = None
+        self._pid: int | None = None
+        self._responses: dict[str, tuple[dict[str, str], Any]] = {}
+
+    def get_session(self) -> "requests.Session":
+        # Pooled connections must not be shared with forked processes.
+        if self._session is not None and self._pid == os.getpid():
+            return self._session
+
+        with self._lock:
+            if self._session is None or self._pid != os.getpid():
+                self._session = self.create_session()
+                self._pid = os.getpid()
+                self._responses = {}
+
+            return self._session
+
+    def preload(self) -> None:
+        for module in self.modules:
+            importlib.import_module(module)
+
+    def create_session(self) -> "requests.Session":
+        import requests
+        from requests.adapters import HTTPAdapter
+        from urllib3.util.retry import Retry
+
+        retry = Retry(
+            total=settings.keys_server_retries,
+            backoff_factor=settings.keys_server_retry_backoff.total_seconds(),
+            status_forcelist=(500, 502, 503, 504),
+            allowed_methods=frozenset({"GET"}),
+        )
+        session = requests.Session()
+        session.mount("https://", HTTPAdapter(max_retries=retry))
+        session.mount("http://", HTTPAdapter(max_retries=retry))
+        return session
+
+    def get_json(self, url: str) -> Any:
+        session = self.get_session()
+        validators, json_data = self._responses.get(url, ({}, None))
+
+        response = session.get(
+            url,
+            headers=validators,
+            timeout=(
+                settings.keys_server_connect_timeout.total_seconds(),
+                settings.keys_server_read_timeout.total_seconds(),
+            ),
+        )
+
+        if response.status_code == 304 and json_data is not None:
+            return json_data
+
+        response.raise_for_status()
+        json_data = response.json()
+        self.remember_response(url, response.headers, json_data)
+        return json_data
+
+    async def aget_json(self, url: str) -> Any:
+        try:
+            import httpx
+        except ImportError:
+            return await sync_to_async(self.get_json, thread_sensitive=False)(url)
+
+        validators, json_data = self._responses.get(url, ({}, None))
+
+        # Async clients are bound to the event loop they were created in, so
+        # a client is created for each fetch. Fetches are rare enough for the
+        # missing connection reuse not to matter.
+        async with httpx.AsyncClient(
+            transport=httpx.AsyncHTTPTransport(retries=settings.keys_server_retries),
+            timeout=httpx.Timeout(
+                settings.keys_server_read_timeout.total_seconds(),
+                connect=settings.keys_server_connect_timeout.total_seconds(),
+            ),
+        ) as client:
+            response = await client.get(url, headers=validators)
+
+        if response.status_code == 304 and json_data is not None:
+            return json_data
+
+        response.raise_for_status()
+        json_data = response.json()
+        self.remember_response(url, response.headers, json_data)
+        return json_data
+
+    def remember_response(
+        self, url: str, headers: Mapping[str, str], json_data: Any
+    ) -> None:
+        validators = {}
+        if "ETag" in headers:
+            validators["If-None-Match"] = headers["ETag"]
+        if "Last-Modified" in headers:
+            validators["If-Modified-Since"] = headers["Last-Modified"]
+        if validators:
+            self._responses[url] = (validators, json_data)
+
+    def close(self) -> None:
+        with self._lock:
+            if self._session is not None:
+                self._session.close()
+            self._session = None
+            self._pid = None
+            self._responses = {}
+
+
+key_server_client = KeyServerClient()
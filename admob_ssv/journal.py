@@ -0,0 +1,245 @@
+import atexit
+import logging
+import mmap
+import os
+import struct
+import threading
+import time
+import zlib
+from collections.abc import Iterable, Iterator
+from typing import BinaryIO, NamedTuple
+
+from admob_ssv.conf import settings
+
+logger = logging.getLogger(__name__)
+
+# Each record consists of its payload's length and CRC-32, followed by the
+# payload: the receive time, the length of the outcome, the outcome and the
+# raw query string.
+RECORD_HEADER = struct.Struct("<II")
+PAYLOAD_HEADER = struct.Struct("<dB")
+
+SEGMENT_SUFFIX = ".journal"
+
+
+class JournalRecord(NamedTuple):
+    query_string: str
+    received_at: float
+    outcome: str
+
+
+class JournalWriter:
+    """
+    Appends callbacks to segment files in `directory`, which are rotated once
+    they reach `segment_size` bytes.
+
+    Records are buffered in memory and written in blocks of `buffer_size`
+    bytes, as well as when a segment is rotated or the writer is closed. Each
+    process writes its own segments, so that multiple worker processes can
+    share a directory.
+
+    With `max_segments`, the process deletes its oldest segments whenever it
+    starts a segment, so that it keeps at most that many. Segments of other
+    processes are never deleted, since they might still be written to.
+    """
+
+    def __init__(
+        self,
+        directory: str,
+        segment_size: int,
+        buffer_size: int = 64 * 1024,
+        max_segments: int | None = None,
+    ) -> None:
+        self.directory = directory
+        self.segment_size = segment_size
+        self.buffer_size = buffer_size
+        self.max_segments = max_segments
+        self._lock = threading.Lock()
+        self._file: BinaryIO | None = None
+        self._size = 0
+        self._pid: int | None = None
+
+        # Records still buffered when forking would otherwise be written by
+        # both processes.
+        if hasattr(os, "register_at_fork"):
+            os.register_at_fork(before=self.flush)
+
+    def append(self, query_string: str, received_at: float, outcome: str) -> None:
+        encoded_outcome = outcome.encode("ascii")
+        payload = b"".join(
+            (
+                PAYLOAD_HEADER.pack(received_at, len(encoded_outcome)),
+                encoded_outcome,
+                query_string.encode("utf-8"),
+            )
+        )
+        record = RECORD_HEADER.pack(len(payload), zlib.crc32(payload)) + payload
+
+        with self._lock:
+            if self._file is None or self._pid != os.getpid():
+                # Segments inherited from a parent process are left to it.
+                if self._file is not None:
+                    self._file.close()
+                self.open_segment()
+            elif self._size + len(record) > self.segment_size:
+                self._file.close()
+                self.open_segment()
+
+            self._file.write(record)
+            self._size += len(record)
+
+    def open_segment(self) -> None:
+        os.makedirs(self.directory, exist_ok=True)
+
+        # Names sort in the order the segments were started.
+        name = f"{time.time_ns():020d}-{os.getpid()}{SEGMENT_SUFFIX}"
+        path = os.path.join(self.directory, name)
+        self._file = open(path, "xb", buffering=self.buffer_size)  # noqa: SIM115
+        self._size = 0
+
+        if self._pid != os.getpid():
+            atexit.register(self.close)
+        self._pid = os.getpid()
+
+        if self.max_segments is not None:
+            self.delete_old_segments(path)
+
+    def delete_old_segments(self, current_path: str) -> None:
+        suffix = f"-{os.getpid()}{SEGMENT_SUFFIX}"
+        segments = [
+            path
+            for path in get_segments(self.directory)
+            if path.endswith(suffix) and path != current_path
+        ]
+
+        # Segments are deleted oldest first, always keeping the current one.
+        for path in segments[: max(len(segments) - self.max_segments + 1, 0)]:
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                # Deleted in the meantime, e.g. by hand.
+                pass
+
+    def flush(self) -> None:
+        with self._lock:
+            if self._file is not None and self._pid == os.getpid():
+                self._file.flush()
+
+    def close(self) -> None:
+        with self._lock:
+            if self._file is not None and self._pid == os.getpid():
+                self._file.close()
+            self._file = None
+
+
+_journal: JournalWriter | None = None
+_journal_lock = threading.Lock()
+
+
+def get_journal() -> JournalWriter | None:
+    global _journal
+
+    directory = settings.journal_directory
+    if directory is None:
+        return None
+
+    if _journal is not None and _journal.directory == directory:
+        return _journal
+
+    with _journal_lock:
+        if _journal is None or _journal.directory != directory:
+            if _journal is not None:
+                _journal.close()
+            _journal = JournalWriter(
+                directory,
+                settings.journal_segment_size,
+                settings.journal_buffer_size,
+                settings.journal_max_segments,
+            )
+        return _journal
+
+
+def close_journal() -> None:
+    global _journal
+
+    with _journal_lock:
+        if _journal is not None:
+            _journal.close()
+        _journal = None
+
+
+def get_segments(directory: str) -> list[str]:
+    return sorted(
+        os.path.join(directory, name)
+        for name in os.listdir(directory)
+        if name.endswith(SEGMENT_SUFFIX)
+    )
+
+
+def read_segment(path: str) -> Iterator[JournalRecord]:
+    """
+    Reads the records of a segment through a memory map, so that segments of
+    any size can be replayed without reading them into memory up front.
+
+    Reading stops at a truncated or corrupted record, e.g. at the end of a
+    segment whose writer was killed or is still writing to it.
+    """
+    with open(path, "rb") as file:
+        size = os.fstat(file.fileno()).st_size
+        if size == 0:
+            return
+
+        with mmap.mmap(file.fileno(), size, access=mmap.ACCESS_READ) as mapped:
+            offset = 0
+
+            while offset + RECORD_HEADER.size <= size:
+                length, checksum = RECORD_HEADER.unpack_from(mapped, offset)
+                start = offset + RECORD_HEADER.size
+                end = start + length
+
+                if end > size:
+                    logger.warning("Truncated record at %s:%d", path, offset)
+                    return
+
+                payload = mapped[start:end]
+                if zlib.crc32(payload) != checksum:
+                    logger.warning("Corrupted record at %s:%d", path, offset)
+                    return
+
+                received_at, outcome_length = PAYLOAD_HEADER.unpack_from(payload)
+                query_start = PAYLOAD_HEADER.size + outcome_length
+
+                yield JournalRecord(
+                    payload[query_start:].decode("utf-8"),
+                    received_at,
+                    payload[PAYLOAD_HEADER.size : query_start].decode("ascii"),
+                )
+
+                offset = end
+
+
+def read_journal(
+    directory: str,
+    outcomes: Iterable[str] | None = None,
+    since: float | None = None,
+    until: float | None = None,
+) -> Iterator[JournalRecord]:
+    """
+    Replays the records of all segments in `directory`, segment by segment in
+    the order they were started, optionally limited to the given outcomes and
+    to callbacks received within `since` and `until`, as Unix timestamps.
+
+    The query strings of the records can be passed to `verify_callbacks` to
+    verify them again, e.g. after an incident.
+    """
+    outcomes = None if outcomes is None else frozenset(outcomes)
+
+    for path in get_segments(directory):
+        for record in read_segment(path):
+            if outcomes is not None and record.outcome not in outcomes:
+                continue
+            if since is not None and record.received_at < since:
+                continue
+            if until is not None and record.received_at >= until:
+                continue
+            yield record
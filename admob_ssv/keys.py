@@ -0,0 +1,286 @@
+import asyncio
+import hashlib
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Awaitable, Callable, Iterable
+from typing import Any
+
+from django.core.cache import cache
+
+from admob_ssv.conf import settings
+
+logger = logging.getLogger(__name__)
+
+
+class LocalPublicKeyCache:
+    """
+    Process-local tier in front of Django's cache.
+
+    The key set changes rarely, so each process keeps its own copy for a short
+    while instead of fetching it from a possibly remote cache on every request.
+    """
+
+    def __init__(self) -> None:
+        # The key set and its expiry are swapped as a single tuple, so that
+        # concurrent readers never see a key set paired with the wrong expiry.
+        self._entry: tuple[dict[str, str], float] | None = None
+
+    def get(self) -> dict[str, str] | None:
+        entry = self._entry
+        if entry is None or time.monotonic() >= entry[1]:
+            return None
+        return entry[0]
+
+    def set(self, public_keys: dict[str, str]) -> None:
+        timeout = settings.keys_local_cache_timeout.total_seconds()
+        self._entry = (public_keys, time.monotonic() + timeout)
+
+    def clear(self) -> None:
+        self._entry = None
+
+
+class SingleFlight:
+    """
+    Coalesces concurrent calls, so that only one of them is running at a time.
+
+    Callers arriving while a call is in flight wait for it to finish and share
+    its result, or the exception it raised, instead of making the same call
+    again.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._generation = 0
+        self._result: Any = None
+        self._error: BaseException | None = None
+        self.completed_at: float | None = None
+
+    def do(self, func: Callable[[], Any]) -> Any:
+        generation = self._generation
+
+        with self._lock:
+            if self._generation != generation:
+                if self._error is not None:
+                    raise self._error
+                return self._result
+
+            try:
+                self._result = func()
+            except BaseException as error:
+                self._result = None
+                self._error = error
+                self._generation += 1
+                raise
+
+            self._error = None
+            self._generation += 1
+            self.completed_at = time.monotonic()
+            return self._result
+
+    def completed_within(self, seconds: float) -> bool:
+        completed_at = self.completed_at
+        return completed_at is not None and time.monotonic() - completed_at < seconds
+
+    def reset(self) -> None:
+        self.completed_at = None
+
+
+class AsyncSingleFlight:
+    """
+    Coalesces concurrent coroutine calls within an event loop, so that only one
+    of them is running at a time and the others share its result.
+    """
+
+    def __init__(self) -> None:
+        self._tasks: dict[asyncio.AbstractEventLoop, asyncio.Task] = {}
+        self.completed_at: float | None = None
+
+    async def do(self, func: Callable[[], Awaitable[Any]]) -> Any:
+        loop = asyncio.get_running_loop()
+        task = self._tasks.get(loop, None)
+
+        if task is None:
+            task = loop.create_task(self._run(func))
+            self._tasks[loop] = task
+            task.add_done_callback(lambda task: self._tasks.pop(loop, None))
+
+        # Shielded, so that a cancelled caller doesn't cancel the call for
+        # everyone else waiting on it.
+        return await asyncio.shield(task)
+
+    async def _run(self, func: Callable[[], Awaitable[Any]]) -> Any:
+        result = await func()
+        self.completed_at = time.monotonic()
+        return result
+
+    def completed_within(self, seconds: float) -> bool:
+        completed_at = self.completed_at
+        return completed_at is not None and time.monotonic() - completed_at < seconds
+
+    def reset(self) -> None:
+        self.completed_at = None
+
+
+class BackgroundRefresher:
+    """
+    Periodically refreshes the key set from a daemon thread.
+
+    Refreshing ahead of expiry means that requests keep being served from the
+    cached key set and never have to wait for the key server.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._thread: threading.Thread | None = None
+        self._pid: int | None = None
+        self._stopped = threading.Event()
+
+    def start(self, refresh: Callable[[], Any], interval: float) -> None:
+        # Threads don't survive forking, so a thread started before a server
+        # forked its workers has to be started again in each worker.
+        if self._pid == os.getpid() and self._thread is not None:
+            return
+
+        with self._lock:
+            if self._pid == os.getpid() and self._thread is not None:
+                return
+
+            self._stopped = threading.Event()
+            self._thread = threading.Thread(
+                target=self._run,
+                args=(refresh, interval, self._stopped),
+                name="admob-ssv-key-refresh",
+                daemon=True,
+            )
+            self._thread.start()
+            self._pid = os.getpid()
+
+    def stop(self) -> None:
+        with self._lock:
+            self._stopped.set()
+            self._thread = None
+            self._pid = None
+
+    def _run(
+        self, refresh: Callable[[], Any], interval: float, stopped: threading.Event
+    ) -> None:
+        while not stopped.wait(interval):
+            try:
+                refresh()
+            except Exception:
+                logger.exception("Refreshing the Admob SSV public keys failed")
+
+
+class UnknownKeyIdCache:
+    """
+    Process-local negative cache of key_ids which are not part of the key set.
+
+    Callbacks carrying such a key_id can be rejected right away, instead of
+    refreshing the key set for every one of them.
+    """
+
+    max_size = 1024
+
+    def __init__(self) -> None:
+        self._key_ids: OrderedDict[str, float] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __contains__(self, key_id: str) -> bool:
+        expires_at = self._key_ids.get(key_id, None)
+        return expires_at is not None and time.monotonic() < expires_at
+
+    def add(self, key_id: str) -> None:
+        timeout = settings.unknown_key_ids_cache_timeout.total_seconds()
+
+        with self._lock:
+            self._key_ids[key_id] = time.monotonic() + timeout
+            self._key_ids.move_to_end(key_id)
+            while len(self._key_ids) > self.max_size:
+                self._key_ids.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._key_ids.clear()
+
+
+class VerifyingKeyCache:
+    """
+    Process-local LRU cache of parsed verifying keys.
+
+    Parsing a PEM encoded public key is comparatively expensive, so parsed keys
+    are kept around and looked up by the digest of their PEM encoding. The loader
+    is part of the lookup, so that verifier backends never share key objects.
+    """
+
+    def __init__(self) -> None:
+        self._keys: OrderedDict[tuple[Callable, str], Any] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def get(self, public_key: str, loader: Callable[[str], Any]) -> Any:
+        cache_key = (loader, self.get_digest(public_key))
+
+        with self._lock:
+            verifying_key = self._keys.get(cache_key, None)
+            if verifying_key is not None:
+                self._keys.move_to_end(cache_key)
+                return verifying_key
+
+        verifying_key = loader(public_key)
+
+        with self._lock:
+            self._keys[cache_key] = verifying_key
+            while len(self._keys) > max(settings.verifying_keys_cache_size, 0):
+                self._keys.popitem(last=False)
+
+        return verifying_key
+
+    def retain(self, public_keys: Iterable[str]) -> None:
+        # Called whenever the key set is refreshed, so that keys which have
+        # been rotated out don't linger in memory until they get evicted.
+        digests = {self.get_digest(public_key) for public_key in public_keys}
+
+        with self._lock:
+            for cache_key in list(self._keys):
+                if cache_key[1] not in digests:
+                    del self._keys[cache_key]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._keys.clear()
+
+    @staticmethod
+    def get_digest(public_key: str) -> str:
+        return hashlib.sha256(public_key.encode("utf-8")).hexdigest()
+
+
+verifying_keys = VerifyingKeyCache()
+
+
+local_public_keys = LocalPublicKeyCache()
+
+public_keys_refresh = SingleFlight()
+
+public_keys_arefresh = AsyncSingleFlight()
+
+unknown_key_ids = UnknownKeyIdCache()
+
+background_refresher = BackgroundRefresher()
+
+
+def invalidate_public_keys() -> None:
+    """
+    Drops the cached key set, so that it gets fetched again on the next request.
+
+    The shared cache entry is deleted for all processes. Other processes drop
+    their local copy once `ADMOB_SSV_KEYS_LOCAL_CACHE_TIMEOUT` has passed.
+    """
+    cache.delete_many([settings.keys_cache_key, f"{settings.keys_cache_key}.stale"])
+    local_public_keys.clear()
+    unknown_key_ids.clear()
+    verifying_keys.clear()
@@ -0,0 +1,19 @@
+from django.core.management.base import BaseCommand
+
+from admob_ssv.dispatchers import process_outbox
+
+
+class Command(BaseCommand):
+    help = "Dispatches the valid Admob SSV callbacks stored in the outbox."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--limit",
+            type=int,
+            default=None,
+            help="Maximum number of callbacks to dispatch.",
+        )
+
+    def handle(self, *args, **options):
+        processed = process_outbox(limit=options["limit"])
+        self.stdout.write(f"Dispatched {processed} Admob SSV callback(s)")
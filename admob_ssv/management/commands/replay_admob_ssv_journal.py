@@ -0,0 +1,115 @@
+from datetime import datetime
+
+from django.core.management.base import BaseCommand, CommandError
+from django.utils.module_loading import import_string
+
+from admob_ssv.batch import verify_callbacks
+from admob_ssv.deduplication import transaction_ids
+from admob_ssv.dispatchers import get_dispatcher
+from admob_ssv.journal import read_journal
+
+
+class Command(BaseCommand):
+    help = (
+        "Verifies the Admob SSV callbacks recorded in a journal again, and "
+        "optionally sends the valid ones to the valid_admob_ssv receivers again."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("directory", help="Directory of the journal segments.")
+        parser.add_argument(
+            "--outcome",
+            action="append",
+            dest="outcomes",
+            help="Only replays callbacks with this outcome, e.g. valid or error. "
+            "May be given multiple times.",
+        )
+        parser.add_argument(
+            "--since",
+            type=datetime.fromisoformat,
+            help="Only replays callbacks received at or after this ISO 8601 time.",
+        )
+        parser.add_argument(
+            "--until",
+            type=datetime.fromisoformat,
+            help="Only replays callbacks received before this ISO 8601 time.",
+        )
+        parser.add_argument(
+            "--dispatch",
+            action="store_true",
+            help="Sends valid callbacks to the valid_admob_ssv receivers again, "
+            "skipping transaction ids which have been dispatched before. "
+            "Requires --outcome.",
+        )
+        parser.add_argument(
+            "--processes",
+            type=int,
+            default=None,
+            help="Number of verifying processes, defaults to the number of CPUs.",
+        )
+        parser.add_argument(
+            "--chunk-size",
+            type=int,
+            default=1000,
+            help="Number of callbacks handed to the processes at a time.",
+        )
+        parser.add_argument(
+            "--view",
+            default="admob_ssv.views.AdmobSSVView",
+            help="Dotted path of the view whose key fetching logic is used.",
+        )
+
+    def handle(self, *args, **options):
+        # Callbacks journaled as valid have been dispatched already.
+        if options["dispatch"] and not options["outcomes"]:
+            raise CommandError("--dispatch requires --outcome")
+
+        since = options["since"]
+        until = options["until"]
+        records = read_journal(
+            options["directory"],
+            outcomes=options["outcomes"],
+            since=None if since is None else since.timestamp(),
+            until=None if until is None else until.timestamp(),
+        )
+
+        results = verify_callbacks(
+            (record.query_string for record in records),
+            processes=options["processes"],
+            chunk_size=options["chunk_size"],
+            view=import_string(options["view"])(),
+        )
+
+        dispatcher = get_dispatcher()
+        total = invalid = dispatched = skipped = 0
+
+        for result in results:
+            total += 1
+            if not result.is_valid:
+                invalid += 1
+                transaction_id = result.query.get("transaction_id", "")
+                self.stdout.write(f"{result.error}: transaction_id={transaction_id}")
+            elif options["dispatch"]:
+                if self.dispatch(dispatcher, result.query):
+                    dispatched += 1
+                else:
+                    skipped += 1
+
+        self.stdout.write(
+            f"Replayed {total} Admob SSV callback(s), {invalid} of them invalid, "
+            f"{dispatched} dispatched, {skipped} dispatched before"
+        )
+
+    def dispatch(self, dispatcher, query: dict[str, str]) -> bool:
+        # Claimed like the view does, so that rewards aren't granted twice.
+        transaction_id = query.get("transaction_id", None)
+        if transaction_id is not None and not transaction_ids.add(transaction_id):
+            return False
+
+        try:
+            dispatcher.dispatch(query)
+        except Exception:
+            if transaction_id is not None:
+                transaction_ids.discard(transaction_id)
+            raise
+        return True
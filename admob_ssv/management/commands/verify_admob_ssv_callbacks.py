@@ -0,0 +1,75 @@
+import json
+import sys
+
+from django.core.management.base import BaseCommand
+from django.utils.module_loading import import_string
+
+from admob_ssv.batch import verify_callbacks
+
+
+class Command(BaseCommand):
+    help = (
+        "Verifies stored Admob SSV callbacks, given one per line either as a "
+        "query string or as a JSON object of query parameters."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "path",
+            nargs="?",
+            default="-",
+            help="File to read the callbacks from, defaults to stdin.",
+        )
+        parser.add_argument(
+            "--processes",
+            type=int,
+            default=None,
+            help="Number of verifying processes, defaults to the number of CPUs.",
+        )
+        parser.add_argument(
+            "--chunk-size",
+            type=int,
+            default=1000,
+            help="Number of callbacks handed to the processes at a time.",
+        )
+        parser.add_argument(
+            "--view",
+            default="admob_ssv.views.AdmobSSVView",
+            help="Dotted path of the view whose key fetching logic is used.",
+        )
+
+    def handle(self, *args, **options):
+        view_class = import_string(options["view"])
+
+        if options["path"] == "-":
+            self.verify(sys.stdin, view_class, options)
+        else:
+            with open(options["path"]) as file:
+                self.verify(file, view_class, options)
+
+    def verify(self, file, view_class, options):
+        total = invalid = 0
+
+        results = verify_callbacks(
+            (self.parse_line(line) for line in file if line.strip()),
+            processes=options["processes"],
+            chunk_size=options["chunk_size"],
+            view=view_class(),
+        )
+
+        for result in results:
+            total += 1
+            if not result.is_valid:
+                invalid += 1
+                transaction_id = result.query.get("transaction_id", "")
+                self.stdout.write(f"{result.error}: transaction_id={transaction_id}")
+
+        self.stdout.write(
+            f"Verified {total} Admob SSV callback(s), {invalid} of them invalid"
+        )
+
+    def parse_line(self, line: str):
+        line = line.strip()
+        if line.startswith("{"):
+            return json.loads(line)
+        return line.removeprefix("?")
@@ -0,0 +1,21 @@
+from django.core.management.base import BaseCommand
+from django.utils.module_loading import import_string
+
+
+class Command(BaseCommand):
+    help = (
+        "Stores the Admob SSV public keys in the cache, unless they are cached "
+        "already, and parses them."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--view",
+            default="admob_ssv.views.AdmobSSVView",
+            help="Dotted path of the view whose key fetching logic is used.",
+        )
+
+    def handle(self, *args, **options):
+        view_class = import_string(options["view"])
+        public_keys = view_class().warm_public_keys()
+        self.stdout.write(f"Warmed {len(public_keys)} Admob SSV public key(s)")
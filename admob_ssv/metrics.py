@@ -0,0 +1,195 @@
+import bisect
+import functools
+import logging
+import threading
+import time
+from contextlib import AbstractContextManager, nullcontext
+
+from django.utils.module_loading import import_string
+
+from admob_ssv.conf import settings
+
+logger = logging.getLogger(__name__)
+
+
+class Metrics:
+    """
+    Base class of metrics backends.
+
+    The view times each stage of handling a callback, e.g. `get_public_key`,
+    `fetch_public_keys`, `verify_signature` and `handle_valid_ssv`, and counts
+    events, e.g. cache hits and misses, key fetches, unknown key_ids and
+    invalid signatures. The admission controller reports the number of
+    callbacks in flight and its current limit as gauges.
+    """
+
+    def increment(self, name: str) -> None:
+        raise NotImplementedError
+
+    def observe(self, name: str, seconds: float) -> None:
+        raise NotImplementedError
+
+    def gauge(self, name: str, value: float) -> None:
+        pass
+
+    def timer(self, name: str) -> AbstractContextManager:
+        return Timer(self, name)
+
+
+class Timer:
+    __slots__ = ("metrics", "name", "started_at")
+
+    def __init__(self, metrics: Metrics, name: str) -> None:
+        self.metrics = metrics
+        self.name = name
+        self.started_at = 0.0
+
+    def __enter__(self) -> None:
+        self.started_at = time.perf_counter()
+
+    def __exit__(self, *exc_info) -> None:
+        self.metrics.observe(self.name, time.perf_counter() - self.started_at)
+
+
+_null_timer = nullcontext()
+
+
+class NullMetrics(Metrics):
+    """
+    Discards all metrics. Timers don't even read the clock.
+    """
+
+    def increment(self, name: str) -> None:
+        pass
+
+    def observe(self, name: str, seconds: float) -> None:
+        pass
+
+    def gauge(self, name: str, value: float) -> None:
+        pass
+
+    def timer(self, name: str) -> AbstractContextManager:
+        return _null_timer
+
+
+class LoggingMetrics(Metrics):
+    """
+    Logs every event and stage duration at the debug level.
+    """
+
+    def increment(self, name: str) -> None:
+        logger.debug("Admob SSV %s", name)
+
+    def observe(self, name: str, seconds: float) -> None:
+        logger.debug("Admob SSV %s took %.3fms", name, seconds * 1000)
+
+    def gauge(self, name: str, value: float) -> None:
+        logger.debug("Admob SSV %s is %s", name, value)
+
+
+class PrometheusMetrics(Metrics):
+    """
+    Aggregates events into counters and stage durations into histograms, which
+    `render` returns in the Prometheus text exposition format.
+
+    Metrics are aggregated per process. When running multiple worker processes,
+    each of them has to be scraped separately.
+    """
+
+    content_type = "text/plain; version=0.0.4; charset=utf-8"
+
+    buckets = (
+        0.0005,
+        0.001,
+        0.0025,
+        0.005,
+        0.01,
+        0.025,
+        0.05,
+        0.1,
+        0.25,
+        0.5,
+        1.0,
+        2.5,
+        5.0,
+        10.0,
+    )
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._counters: dict[str, int] = {}
+        self._gauges: dict[str, float] = {}
+        # Per stage, the count of each bucket, followed by the overflow count,
+        # and the sum of all durations.
+        self._histograms: dict[str, tuple[list[int], list[float]]] = {}
+
+    def increment(self, name: str) -> None:
+        with self._lock:
+            self._counters[name] = self._counters.get(name, 0) + 1
+
+    def observe(self, name: str, seconds: float) -> None:
+        index = bisect.bisect_left(self.buckets, seconds)
+
+        with self._lock:
+            histogram = self._histograms.get(name, None)
+            if histogram is None:
+                histogram = ([0] * (len(self.buckets) + 1), [0.0])
+                self._histograms[name] = histogram
+
+            histogram[0][index] += 1
+            histogram[1][0] += seconds
+
+    def gauge(self, name: str, value: float) -> None:
+        with self._lock:
+            self._gauges[name] = value
+
+    def render(self) -> str:
+        with self._lock:
+            counters = sorted(self._counters.items())
+            gauges = sorted(self._gauges.items())
+            histograms = sorted(
+                (name, (list(counts), total[0]))
+                for name, (counts, total) in self._histograms.items()
+            )
+
+        lines = ["# TYPE admob_ssv_events_total counter"]
+        for name, value in counters:
+            lines.append(f'admob_ssv_events_total{{event="{name}"}} {value}')
+
+        lines.append("# TYPE admob_ssv_gauge gauge")
+        for name, value in gauges:
+            lines.append(f'admob_ssv_gauge{{name="{name}"}} {value}')
+
+        lines.append("# TYPE admob_ssv_stage_duration_seconds histogram")
+        for name, (counts, total) in histograms:
+            cumulative_count = 0
+            for bucket, count in zip((*self.buckets, "+Inf"), counts):
+                cumulative_count += count
+                lines.append(
+                    "admob_ssv_stage_duration_seconds_bucket"
+                    f'{{stage="{name}",le="{bucket}"}} {cumulative_count}'
+                )
+            lines.append(
+                f'admob_ssv_stage_duration_seconds_sum{{stage="{name}"}} {total}'
+            )
+            lines.append(
+                "admob_ssv_stage_duration_seconds_count"
+                f'{{stage="{name}"}} {cumulative_count}'
+            )
+
+        return "\n".join(lines) + "\n"
+
+    def clear(self) -> None:
+        with self._lock:
+            self._counters.clear()
+            self._gauges.clear()
+            self._histograms.clear()
+
+
+@functools.cache
+def load_metrics(backend: str) -> Metrics:
+    return import_string(backend)()
+
+
+def get_metrics() -> Metrics:
+    return load_metrics(settings.metrics_backend)
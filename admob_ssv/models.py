@@ -0,0 +1,22 @@
+from django.db import models
+from django.utils import timezone
+
+
+class OutboxEntry(models.Model):
+    """
+    Verified callback waiting to be dispatched by the `DatabaseOutboxDispatcher`.
+    """
+
+    query = models.JSONField()
+
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    attempts = models.PositiveIntegerField(default=0)
+
+    available_at = models.DateTimeField(default=timezone.now, db_index=True)
+
+    class Meta:
+        verbose_name_plural = "outbox entries"
+
+    def __str__(self):
+        return f"Outbox entry #{self.pk}"
@@ -0,0 +1,221 @@
+import atexit
+import logging
+import os
+import threading
+from collections.abc import Callable
+from concurrent.futures import Future
+from datetime import timedelta
+
+from django.db import close_old_connections, connections, models, router, transaction
+
+from admob_ssv.callbacks import SSVCallback
+
+logger = logging.getLogger(__name__)
+
+
+class BulkCreateReceiver:
+    """
+    `valid_admob_ssv` receiver which stores verified callbacks in batches,
+    instead of inserting a row per callback.
+
+    `build` turns each callback into an unsaved instance of `model`. Instances
+    are buffered in memory and inserted using `bulk_create` once `batch_size`
+    of them are pending, or after `flush_interval` at the latest, by a
+    background thread. Rows conflicting with existing ones, e.g. those of
+    callbacks retried by Admob if `transaction_id` is unique, are skipped.
+
+    If a batch can't be inserted, its rows are inserted one by one, and rows
+    that fail while others succeed are logged and dropped, so that a single
+    row the database rejects doesn't hold up all others. If all of them fail,
+    e.g. while the database is unavailable, they are kept for the next flush.
+
+    Buffered callbacks are lost if the process crashes. Pass `durable=True` to
+    insert them before the response is returned. Callbacks of concurrent
+    requests are still inserted together, but each request fails if its own
+    row can't be inserted, so that Admob retries the callback, and the row is
+    dropped. Within a transaction, e.g. with `ATOMIC_REQUESTS`, each callback
+    is inserted on its own instead, so that it's committed or rolled back
+    along with the request it belongs to. Since a retried callback might have
+    been stored already, durable mode requires a unique `transaction_id`.
+
+    ```python
+    store_verifications = BulkCreateReceiver(Verification, build_verification)
+    valid_admob_ssv.connect(store_verifications, weak=False)
+    ```
+    """
+
+    def __init__(
+        self,
+        model: type[models.Model],
+        build: Callable[[SSVCallback], models.Model],
+        batch_size: int = 100,
+        flush_interval: timedelta = timedelta(seconds=1),
+        durable: bool = False,
+    ) -> None:
+        self.model = model
+        self.build = build
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.durable = durable
+
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        # Instances are paired with the future of the durable request waiting
+        # for them to be inserted.
+        self._pending: list[tuple[models.Model, Future | None]] = []
+        self._pid: int | None = None
+        self._thread: threading.Thread | None = None
+        self._flush_requested = threading.Event()
+        self._stopped = threading.Event()
+
+        if not durable:
+            atexit.register(self.close)
+
+    def __call__(self, sender, callback: SSVCallback, **kwargs) -> None:
+        instance = self.build(callback)
+
+        if self.durable and self.in_transaction():
+            self.insert([instance])
+            return
+
+        future = Future() if self.durable else None
+
+        with self._lock:
+            # Instances buffered before forking belong to the parent process.
+            if self._pid != os.getpid():
+                self._pending = []
+                self._thread = None
+                self._pid = os.getpid()
+
+            self._pending.append((instance, future))
+            is_full = len(self._pending) >= self.batch_size
+
+            if not self.durable and self._thread is None:
+                self._stopped = threading.Event()
+                self._thread = threading.Thread(
+                    target=self._run,
+                    args=(self._stopped,),
+                    name="admob-ssv-bulk-create",
+                    daemon=True,
+                )
+                self._thread.start()
+
+        if self.durable:
+            # The row might have been inserted by the flush of a concurrent
+            # request, whose outcome is waited for.
+            self.flush()
+            future.result()
+        elif is_full:
+            self._flush_requested.set()
+
+    def in_transaction(self) -> bool:
+        using = router.db_for_write(self.model)
+        return transaction.get_connection(using).in_atomic_block
+
+    def insert(self, instances: list[models.Model]) -> None:
+        # Within a savepoint, so that a failed insert doesn't break an
+        # enclosing transaction.
+        with transaction.atomic(using=router.db_for_write(self.model)):
+            self.model._default_manager.bulk_create(
+                instances, batch_size=self.batch_size, ignore_conflicts=True
+            )
+
+    def flush(self) -> int:
+        """
+        Inserts all pending instances and returns the number of inserted ones.
+        """
+        with self._flush_lock:
+            with self._lock:
+                pending, self._pending = self._pending, []
+
+            if not pending:
+                return 0
+
+            instances = [instance for instance, _ in pending]
+
+            try:
+                self.insert(instances)
+            except Exception as error:  # noqa: BLE001
+                if len(instances) == 1:
+                    errors = [error]
+                else:
+                    errors = self.insert_one_by_one(instances)
+            else:
+                errors = [None] * len(instances)
+
+            if self.durable:
+                # Failed rows are dropped, as their requests fail and get retried.
+                for (_, future), error in zip(pending, errors, strict=True):
+                    if error is None:
+                        future.set_result(None)
+                    else:
+                        future.set_exception(error)
+            elif all(error is not None for error in errors):
+                # Nothing could be inserted, so the rows are likely fine and the
+                # database isn't.
+                self.requeue(pending)
+                raise errors[-1]
+            else:
+                for instance, error in zip(instances, errors, strict=True):
+                    if error is not None:
+                        logger.error(
+                            "Dropping Admob SSV callback that can't be stored: %r",
+                            instance,
+                            exc_info=error,
+                        )
+
+            return errors.count(None)
+
+    def insert_one_by_one(
+        self, instances: list[models.Model]
+    ) -> list[Exception | None]:
+        errors: list[Exception | None] = []
+
+        for instance in instances:
+            try:
+                self.insert([instance])
+            except Exception as error:  # noqa: BLE001
+                errors.append(error)
+            else:
+                errors.append(None)
+
+        return errors
+
+    def requeue(self, pending: list[tuple[models.Model, Future | None]]) -> None:
+        # Put the instances back, so that they are retried with the next flush.
+        with self._lock:
+            self._pending[:0] = pending
+
+    def close(self) -> None:
+        """
+        Stops the background thread and inserts all pending instances.
+        """
+        with self._lock:
+            self._stopped.set()
+            self._flush_requested.set()
+            self._thread = None
+
+        try:
+            self.flush()
+        except Exception:
+            logger.exception("Storing Admob SSV callbacks failed")
+
+    def _run(self, stopped: threading.Event) -> None:
+        interval = self.flush_interval.total_seconds()
+
+        try:
+            while not stopped.is_set():
+                self._flush_requested.wait(interval)
+                self._flush_requested.clear()
+
+                # The thread outlives requests, so its database connection is
+                # recycled the way Django does around each request.
+                close_old_connections()
+                try:
+                    self.flush()
+                except Exception:
+                    logger.exception("Storing Admob SSV callbacks failed")
+                finally:
+                    close_old_connections()
+        finally:
+            connections.close_all()
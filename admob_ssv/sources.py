@@ -0,0 +1,153 @@
+import functools
+import json
+import logging
+import os
+import threading
+from collections.abc import Sequence
+from typing import Any
+
+from asgiref.sync import sync_to_async
+from django.utils.module_loading import import_string
+
+from admob_ssv.conf import settings
+from admob_ssv.http import key_server_client
+
+logger = logging.getLogger(__name__)
+
+
+def parse_public_keys(json_data: dict[str, Any]) -> dict[str, str]:
+    return {str(key["keyId"]): key["pem"] for key in json_data["keys"]}
+
+
+class KeySource:
+    """
+    Base class of key sources, which provide the key set in the format of
+    `{key_id: pem}`. The view caches the key set, so sources are only asked
+    for it when the cached key set has expired or lacks a key_id.
+    """
+
+    def get_public_keys(self) -> dict[str, str]:
+        raise NotImplementedError
+
+    def preload(self) -> None:
+        pass
+
+    async def aget_public_keys(self) -> dict[str, str]:
+        return await sync_to_async(self.get_public_keys)()
+
+
+class HttpKeySource(KeySource):
+    """
+    Fetches the key set from `ADMOB_SSV_KEYS_SERVER_URL`.
+    """
+
+    def get_public_keys(self) -> dict[str, str]:
+        return parse_public_keys(key_server_client.get_json(settings.keys_server_url))
+
+    async def aget_public_keys(self) -> dict[str, str]:
+        return parse_public_keys(
+            await key_server_client.aget_json(settings.keys_server_url)
+        )
+
+    def preload(self) -> None:
+        key_server_client.preload()
+
+
+class FileKeySource(KeySource):
+    """
+    Reads the key set from `ADMOB_SSV_KEYS_FILE`, a JSON file in the format of
+    the key server's response, e.g. kept up to date by a sidecar.
+
+    The file is only parsed again once it has been modified or replaced.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        # The file's identity and the key set parsed from it are swapped as a
+        # single tuple, so that readers never see them mismatched.
+        self._entry: tuple[tuple, dict[str, str]] | None = None
+
+    def get_public_keys(self) -> dict[str, str]:
+        path = settings.keys_file
+        if path is None:
+            raise ValueError("ADMOB_SSV_KEYS_FILE is not set")
+
+        with self._lock:
+            with open(path, "rb") as file:
+                stat = os.fstat(file.fileno())
+                identity = (path, stat.st_ino, stat.st_size, stat.st_mtime_ns)
+
+                entry = self._entry
+                if entry is not None and entry[0] == identity:
+                    return entry[1]
+
+                public_keys = self.parse(file.read())
+
+            self._entry = (identity, public_keys)
+            return public_keys
+
+    @staticmethod
+    def parse(data: bytes) -> dict[str, str]:
+        # Each key object is reduced to its key_id and pem as soon as it has
+        # been decoded, so that other fields, e.g. the base64 encoded key,
+        # are never kept around.
+        def reduce(json_object: dict[str, Any]) -> Any:
+            if "keyId" in json_object and "pem" in json_object:
+                return str(json_object["keyId"]), json_object["pem"]
+            if "keys" in json_object:
+                return dict(json_object["keys"])
+            return json_object
+
+        public_keys = json.loads(data, object_hook=reduce)
+        if not isinstance(public_keys, dict):
+            raise TypeError("The keys file lacks a list of keys")
+        return public_keys
+
+
+class CompositeKeySource(KeySource):
+    """
+    Asks each of its sources in order, until one of them provides the key set.
+    """
+
+    def __init__(self, sources: Sequence[KeySource]) -> None:
+        self.sources = sources
+
+    def get_public_keys(self) -> dict[str, str]:
+        for source in self.sources[:-1]:
+            try:
+                return source.get_public_keys()
+            except Exception:
+                logger.exception(
+                    "Getting the Admob SSV public keys from %s failed",
+                    type(source).__name__,
+                )
+
+        return self.sources[-1].get_public_keys()
+
+    async def aget_public_keys(self) -> dict[str, str]:
+        for source in self.sources[:-1]:
+            try:
+                return await source.aget_public_keys()
+            except Exception:
+                logger.exception(
+                    "Getting the Admob SSV public keys from %s failed",
+                    type(source).__name__,
+                )
+
+        return await self.sources[-1].aget_public_keys()
+
+    def preload(self) -> None:
+        for source in self.sources:
+            source.preload()
+
+
+@functools.cache
+def load_key_source(backends: tuple[str, ...]) -> KeySource:
+    sources = [import_string(backend)() for backend in backends]
+    if len(sources) == 1:
+        return sources[0]
+    return CompositeKeySource(sources)
+
+
+def get_key_source() -> KeySource:
+    return load_key_source(tuple(settings.keys_sources))
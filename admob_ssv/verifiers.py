@@ -0,0 +1,187 @@
+import functools
+import hashlib
+import importlib
+from collections.abc import Iterable
+from typing import Any
+
+from django.utils.module_loading import import_string
+
+from admob_ssv.conf import settings
+
+
+class Verifier:
+    """
+    Base class of signature verification backends.
+
+    Backends parse PEM encoded public keys into backend specific key objects
+    and verify DER encoded ECDSA P-256 SHA-256 signatures with them. Parsed
+    keys are cached by the view, so `load_key` is only called once per key.
+
+    Backends import their library lazily. `preload` imports the `modules`
+    they use ahead of the first callback.
+    """
+
+    modules: tuple[str, ...] = ()
+
+    def preload(self) -> None:
+        for module in self.modules:
+            importlib.import_module(module)
+
+    def load_key(self, public_key: str) -> Any:
+        raise NotImplementedError
+
+    def verify(self, verifying_key: Any, signature: bytes, content: bytes) -> bool:
+        raise NotImplementedError
+
+
+class EcdsaVerifier(Verifier):
+    """
+    Verifies signatures using the pure Python `ecdsa` package.
+
+    Loaded keys come with precomputed multiplication tables, which take about
+    as long as a few verifications to build and make every verification more
+    than twice as fast. They take some tens of kilobytes per key, and are
+    bounded by `ADMOB_SSV_VERIFYING_KEYS_CACHE_SIZE` like the keys themselves.
+    Set `precompute` to `False` on a subclass to skip building them.
+    """
+
+    modules = ("ecdsa", "ecdsa.der", "ecdsa.ellipticcurve", "ecdsa.util")
+
+    precompute = True
+
+    def load_key(self, public_key: str) -> Any:
+        from ecdsa import VerifyingKey
+        from ecdsa.ellipticcurve import PointJacobi
+
+        verifying_key = VerifyingKey.from_pem(public_key)
+
+        if self.precompute:
+            # VerifyingKey.precompute can't be used, because points of keys
+            # loaded from PEM lack the curve order that the tables are built
+            # from. Tables are only built for points marked as generators.
+            point = verifying_key.pubkey.point
+            verifying_key.pubkey.point = PointJacobi(
+                point.curve(),
+                point.x(),
+                point.y(),
+                1,
+                verifying_key.curve.order,
+                generator=True,
+            )
+            # Tables are built on the first multiplication, so do it now.
+            verifying_key.pubkey.point * 2
+
+        return verifying_key
+
+    def verify(self, verifying_key: Any, signature: bytes, content: bytes) -> bool:
+        from ecdsa import BadSignatureError
+        from ecdsa.der import UnexpectedDER
+        from ecdsa.util import sigdecode_der
+
+        try:
+            return verifying_key.verify(
+                signature,
+                content,
+                hashfunc=hashlib.sha256,
+                sigdecode=sigdecode_der,
+            )
+        except (BadSignatureError, UnexpectedDER):
+            return False
+
+
+class CryptographyVerifier(Verifier):
+    """
+    Verifies signatures using the OpenSSL backed `cryptography` package,
+    which is considerably faster than the pure Python `ecdsa` package.
+    """
+
+    modules = (
+        "cryptography.exceptions",
+        "cryptography.hazmat.primitives.asymmetric.ec",
+        "cryptography.hazmat.primitives.hashes",
+        "cryptography.hazmat.primitives.serialization",
+    )
+
+    def load_key(self, public_key: str) -> Any:
+        from cryptography.hazmat.primitives.serialization import load_pem_public_key
+
+        return load_pem_public_key(public_key.encode("utf-8"))
+
+    def verify(self, verifying_key: Any, signature: bytes, content: bytes) -> bool:
+        from cryptography.exceptions import InvalidSignature
+        from cryptography.hazmat.primitives import hashes
+        from cryptography.hazmat.primitives.asymmetric import ec
+
+        try:
+            verifying_key.verify(signature, content, ec.ECDSA(hashes.SHA256()))
+        except InvalidSignature:
+            return False
+
+        return True
+
+
+def is_der_signature(signature: bytes) -> bool:
+    """
+    Checks that the signature is a DER encoded ECDSA P-256 signature, i.e. a
+    sequence of two positive, minimally encoded integers of at most 33 bytes,
+    without doing any cryptography.
+    """
+    if not 8 <= len(signature) <= 72:
+        return False
+
+    if signature[0] != 0x30 or signature[1] != len(signature) - 2:
+        return False
+
+    offset = 2
+
+    for _ in range(2):
+        if offset + 2 > len(signature) or signature[offset] != 0x02:
+            return False
+
+        length = signature[offset + 1]
+        integer = signature[offset + 2 : offset + 2 + length]
+
+        if not 1 <= length <= 33 or len(integer) != length:
+            return False
+
+        # Negative, or padded with a zero byte that isn't needed.
+        if integer[0] & 0x80 or (
+            length > 1 and integer[0] == 0 and not integer[1] & 0x80
+        ):
+            return False
+
+        offset += 2 + length
+
+    return offset == len(signature)
+
+
+@functools.cache
+def load_verifier(backend: str) -> Verifier:
+    return import_string(backend)()
+
+
+def get_verifier() -> Verifier:
+    return load_verifier(settings.verifier_backend)
+
+
+# The functions below run in worker processes, which don't necessarily have
+# Django set up, so the verifier backend is passed in instead of being read
+# from settings.
+
+
+@functools.lru_cache(maxsize=16)
+def load_key(backend: str, public_key: str) -> Any:
+    # Keys are kept, so that each worker process parses them once.
+    return load_verifier(backend).load_key(public_key)
+
+
+def warm_up(backend: str, public_keys: Iterable[str]) -> None:
+    verifier = load_verifier(backend)
+    verifier.preload()
+    for public_key in public_keys:
+        load_key(backend, public_key)
+
+
+def verify(backend: str, public_key: str, signature: bytes, content: bytes) -> bool:
+    verifying_key = load_key(backend, public_key)
+    return load_verifier(backend).verify(verifying_key, signature, content)
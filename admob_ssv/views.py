@@ -1,43 +1,231 @@
+import asyncio
 import base64
-import hashlib
+import logging
 import math
+import multiprocessing
+import os
+import threading
+import time
 import urllib.parse
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
 
-import requests
 from django.core.cache import cache
 from django.http import HttpRequest, HttpResponse, HttpResponseBadRequest
 from django.views import View
 
+from admob_ssv.admission import admission_controller
 from admob_ssv.conf import settings
-from admob_ssv.signals import valid_admob_ssv
+from admob_ssv.deduplication import transaction_ids
+from admob_ssv.dispatchers import get_dispatcher
+from admob_ssv.journal import get_journal
+from admob_ssv.keys import (
+    background_refresher,
+    local_public_keys,
+    public_keys_arefresh,
+    public_keys_refresh,
+    unknown_key_ids,
+    verifying_keys,
+)
+from admob_ssv.metrics import get_metrics
+from admob_ssv.sources import get_key_source
+from admob_ssv.verifiers import get_verifier, is_der_signature, verify, warm_up
+
+logger = logging.getLogger(__name__)
+
+_verification_executor: ThreadPoolExecutor | None = None
+_verification_executor_pid: int | None = None
+_verification_executor_lock = threading.Lock()
+
+
+def get_verification_executor() -> ThreadPoolExecutor:
+    global _verification_executor, _verification_executor_pid
+
+    with _verification_executor_lock:
+        if _verification_executor is None or _verification_executor_pid != os.getpid():
+            _verification_executor = ThreadPoolExecutor(
+                max_workers=settings.async_verification_threads,
+                thread_name_prefix="admob-ssv-verify",
+            )
+            _verification_executor_pid = os.getpid()
+
+        return _verification_executor
+
+
+_verification_process_pool: ProcessPoolExecutor | None = None
+_verification_process_pool_pid: int | None = None
+_verification_process_pool_slots: threading.BoundedSemaphore | None = None
+_verification_process_pool_lock = threading.Lock()
+
+
+def get_verification_process_pool() -> tuple[
+    ProcessPoolExecutor, threading.BoundedSemaphore
+]:
+    global _verification_process_pool, _verification_process_pool_pid
+    global _verification_process_pool_slots
+
+    with _verification_process_pool_lock:
+        if (
+            _verification_process_pool is None
+            or _verification_process_pool_pid != os.getpid()
+        ):
+            # Worker processes are spawned rather than forked, because forking
+            # a process running threads, like most servers do, isn't safe.
+            # They start out with the current key set already parsed.
+            _verification_process_pool = ProcessPoolExecutor(
+                max_workers=settings.verification_processes,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=warm_up,
+                initargs=(
+                    settings.verifier_backend,
+                    tuple((local_public_keys.get() or {}).values()),
+                ),
+            )
+            _verification_process_pool_pid = os.getpid()
+            _verification_process_pool_slots = threading.BoundedSemaphore(
+                settings.verification_queue_size
+            )
+
+        return _verification_process_pool, _verification_process_pool_slots
+
+
+def shutdown_verification_process_pool() -> None:
+    global _verification_process_pool, _verification_process_pool_pid
+
+    with _verification_process_pool_lock:
+        if (
+            _verification_process_pool is not None
+            and _verification_process_pool_pid == os.getpid()
+        ):
+            _verification_process_pool.shutdown(wait=False, cancel_futures=True)
+        _verification_process_pool = None
+        _verification_process_pool_pid = None
 
 
 class AdmobSSVView(View):
     SIGNATURE_PARAM_NAME = "signature"
     KEY_ID_PARAM_NAME = "key_id"
+    TRANSACTION_ID_PARAM_NAME = "transaction_id"
 
     def get(self, request: HttpRequest) -> HttpResponse:
-        if self.SIGNATURE_PARAM_NAME not in request.GET:
-            return HttpResponseBadRequest("Missing signature")
+        received_at = time.time()
+        metrics = get_metrics()
 
-        if self.KEY_ID_PARAM_NAME not in request.GET:
-            return HttpResponseBadRequest("Missing key_id")
+        # Malformed callbacks are rejected before they cause any I/O.
+        error = self.validate_request(request)
+        if error is not None:
+            metrics.increment("malformed_request")
+            self.journal_callback(request, received_at, "malformed_request")
+            return HttpResponseBadRequest(error)
+
+        # Callbacks retried by Admob have been handled before.
+        transaction_id = request.GET.get(self.TRANSACTION_ID_PARAM_NAME, None)
+        if transaction_id is not None and transaction_ids.contains(transaction_id):
+            metrics.increment("duplicate_transaction_id")
+            self.journal_callback(request, received_at, "duplicate_transaction_id")
+            return HttpResponse()
+
+        # Callbacks beyond the admission limit are turned away right away, and
+        # retried by Admob later.
+        if not admission_controller.acquire():
+            metrics.increment("overloaded")
+            self.journal_callback(request, received_at, "overloaded")
+            return self.get_overloaded_response()
+
+        started_at = time.perf_counter()
+        try:
+            return self.verify_ssv(request, transaction_id, received_at)
+        except Exception:
+            self.journal_callback(request, received_at, "error")
+            raise
+        finally:
+            admission_controller.release(time.perf_counter() - started_at)
+
+    def verify_ssv(
+        self, request: HttpRequest, transaction_id: str | None, received_at: float
+    ) -> HttpResponse:
+        metrics = get_metrics()
 
         key_id = request.GET[self.KEY_ID_PARAM_NAME]
-        public_key = self.get_public_key(key_id)
+        with metrics.timer("get_public_key"):
+            public_key = self.get_public_key(key_id)
 
         if public_key is None:
+            metrics.increment("unknown_key_id")
+            self.journal_callback(request, received_at, "unknown_key_id")
             return HttpResponseBadRequest("Unknown key_id")
 
         signature = self.get_signature(request)
-        content = self.get_unverified_content(request)
+        with metrics.timer("get_unverified_content"):
+            content = self.get_unverified_content(request)
 
-        if self.verify_signature(public_key, signature, content):
-            self.handle_valid_ssv(request)
+        with metrics.timer("verify_signature"):
+            is_valid = self.verify_signature(public_key, signature, content)
+
+        if is_valid:
+            with metrics.timer("handle_valid_ssv"):
+                self.handle_verified_ssv(request, transaction_id)
+            self.journal_callback(request, received_at, "valid")
             return HttpResponse()
 
+        metrics.increment("invalid_signature")
+        self.journal_callback(request, received_at, "invalid_signature")
         return HttpResponseBadRequest("Invalid signature")
 
+    def validate_request(self, request: HttpRequest) -> str | None:
+        query_string = request.META.get("QUERY_STRING", "")
+
+        if len(query_string) > settings.max_query_length:
+            return "Query string too long"
+
+        if query_string.count("&") >= settings.max_query_params:
+            return "Too many query parameters"
+
+        if self.SIGNATURE_PARAM_NAME not in request.GET:
+            return "Missing signature"
+
+        if self.KEY_ID_PARAM_NAME not in request.GET:
+            return "Missing key_id"
+
+        key_id = request.GET[self.KEY_ID_PARAM_NAME]
+        if not (key_id.isascii() and key_id.isdigit()):
+            return "Invalid key_id"
+
+        try:
+            signature = self.get_signature(request)
+        except ValueError:
+            # Raised for non-ASCII signatures, as well as for malformed base64,
+            # whose binascii.Error is a ValueError.
+            return "Invalid signature"
+
+        if not is_der_signature(signature):
+            return "Invalid signature"
+
+        return None
+
+    def journal_callback(
+        self, request: HttpRequest, received_at: float, outcome: str
+    ) -> None:
+        journal = get_journal()
+        if journal is None:
+            return
+
+        # Callbacks rejected for their length are journaled only up to the
+        # limit, so that oversized requests can't fill up the disk.
+        query_string = request.META.get("QUERY_STRING", "")[: settings.max_query_length]
+
+        # The journal is an audit trail, which must never fail a callback.
+        try:
+            journal.append(query_string, received_at, outcome)
+        except Exception:
+            logger.exception("Journaling Admob SSV callback failed")
+
+    def get_overloaded_response(self) -> HttpResponse:
+        retry_after = math.ceil(settings.retry_after.total_seconds())
+        return HttpResponse(
+            "Overloaded", status=503, headers={"Retry-After": str(retry_after)}
+        )
+
     def get_signature(self, request: HttpRequest) -> bytes:
         encoded_signature = request.GET[self.SIGNATURE_PARAM_NAME]
 
@@ -52,11 +240,49 @@ class AdmobSSVView(View):
         # parameters of rewarded video SSV callbacks are always signature and
         # key_id, in that order. The remaining query parameters are sent in
         # alphabetical order and specify the content to be verified.
-        # However, middleware might interfere with the order of query parameters.
-        # To ensure that the content can still be verified, we reorder the query
-        # parameters alphabetically.
+        # In that common case, the content is everything before the signature.
         query_string = request.META["QUERY_STRING"]
 
+        content, separator, trailer = query_string.partition(
+            f"&{self.SIGNATURE_PARAM_NAME}="
+        )
+
+        if (
+            separator
+            and trailer.count("&") == 1
+            and trailer.partition("&")[2].startswith(f"{self.KEY_ID_PARAM_NAME}=")
+            and self.is_canonical_content(content)
+        ):
+            return content.encode("utf-8")
+
+        return self.get_sorted_unverified_content(query_string)
+
+    def is_canonical_content(self, content: str) -> bool:
+        # Content that needs no decoding, has no blank values and whose
+        # parameters are strictly sorted, is already in its canonical form.
+        # Raw spaces are encoded as "+" by the canonicalization.
+        if "%" in content or " " in content:
+            return False
+
+        previous_name = ""
+
+        for field in content.split("&"):
+            name, _, value = field.partition("=")
+
+            if not value or "+" in name or name <= previous_name:
+                return False
+
+            if name in (self.SIGNATURE_PARAM_NAME, self.KEY_ID_PARAM_NAME):
+                return False
+
+            previous_name = name
+
+        return True
+
+    def get_sorted_unverified_content(self, query_string: str) -> bytes:
+        # Middleware might interfere with the order of query parameters.
+        # To ensure that the content can still be verified, we reorder the query
+        # parameters alphabetically.
         query_data = urllib.parse.parse_qs(query_string)
         query_data.pop(self.SIGNATURE_PARAM_NAME, None)
         query_data.pop(self.KEY_ID_PARAM_NAME, None)
@@ -66,43 +292,441 @@ class AdmobSSVView(View):
         return urllib.parse.unquote(sorted_query_string).encode("utf-8")
 
     def get_public_key(self, key_id: str) -> str | None:
+        background_refresh_interval = settings.keys_background_refresh_interval
+        if background_refresh_interval is not None:
+            background_refresher.start(
+                type(self)().revalidate_public_keys,
+                background_refresh_interval.total_seconds(),
+            )
+
+        metrics = get_metrics()
+
+        if key_id in unknown_key_ids:
+            metrics.increment("unknown_key_ids.hit")
+            return None
+
+        local_public_key = (local_public_keys.get() or {}).get(key_id, None)
+
+        if local_public_key is not None:
+            metrics.increment("local_public_keys.hit")
+            return local_public_key
+
+        metrics.increment("local_public_keys.miss")
+
         cached_public_keys = cache.get(settings.keys_cache_key, default={})
         cached_public_key = cached_public_keys.get(key_id, None)
 
         if cached_public_key is not None:
+            metrics.increment("public_keys.hit")
+            local_public_keys.set(cached_public_keys)
             return cached_public_key
 
-        fetched_public_keys = self.fetch_public_keys()
+        metrics.increment("public_keys.miss")
+
+        # The cached key set lacks the key_id. Unless the keys have just been
+        # rotated, the key_id is bogus, so the key set is refreshed at most
+        # once per interval to not let callbacks trigger arbitrary fetches.
+        refresh_interval = settings.keys_refresh_interval.total_seconds()
+        # Without a refresh, the key_id isn't known to be bogus yet, so it isn't
+        # remembered as unknown.
+        if cached_public_keys and public_keys_refresh.completed_within(
+            refresh_interval
+        ):
+            return None
+
+        try:
+            refreshed_public_keys = public_keys_refresh.do(self.refresh_public_keys)
+        except Exception:
+            # Keep serving the previous key set for a grace period while the
+            # key server is unreachable.
+            stale_public_keys = self.get_stale_public_keys()
+            if stale_public_keys is None:
+                raise
+            metrics.increment("stale_public_keys.hit")
+            logger.exception("Refreshing the Admob SSV public keys failed")
+            return stale_public_keys.get(key_id, None)
+
+        refreshed_public_key = refreshed_public_keys.get(key_id, None)
+
+        if refreshed_public_key is None:
+            unknown_key_ids.add(key_id)
+
+        return refreshed_public_key
+
+    def get_stale_public_keys(self) -> dict[str, str] | None:
+        stale_entry = cache.get(f"{settings.keys_cache_key}.stale")
+
+        if stale_entry is None:
+            return None
+
+        stale_public_keys, _fetched_at = stale_entry
+        local_public_keys.set(stale_public_keys)
+        return stale_public_keys
+
+    def revalidate_public_keys(self) -> dict[str, str]:
+        # Skip the refresh if another process has already refreshed the key
+        # set within the current interval.
+        stale_entry = cache.get(f"{settings.keys_cache_key}.stale")
+        refresh_interval = settings.keys_background_refresh_interval
+
+        if stale_entry is not None and refresh_interval is not None:
+            stale_public_keys, fetched_at = stale_entry
+            if time.time() - fetched_at < refresh_interval.total_seconds():
+                return stale_public_keys
+
+        return public_keys_refresh.do(self.refresh_public_keys)
+
+    def refresh_public_keys(self) -> dict[str, str]:
+        if settings.keys_fetch_lock_timeout is None:
+            return self.store_public_keys(self.fetch_public_keys())
+
+        # Only one process at a time fetches the keys, the others wait for the
+        # fetched keys to show up in the shared cache.
+        lock_key = f"{settings.keys_cache_key}.lock"
+        lock_timeout = settings.keys_fetch_lock_timeout.total_seconds()
+
+        if cache.add(lock_key, True, math.ceil(lock_timeout)):
+            try:
+                return self.store_public_keys(self.fetch_public_keys())
+            finally:
+                cache.delete(lock_key)
+
+        deadline = time.monotonic() + lock_timeout
+        while cache.get(lock_key) is not None and time.monotonic() < deadline:
+            time.sleep(0.05)
+
+        cached_public_keys = cache.get(settings.keys_cache_key)
+
+        if cached_public_keys is not None:
+            local_public_keys.set(cached_public_keys)
+            return cached_public_keys
+
+        return self.store_public_keys(self.fetch_public_keys())
+
+    def store_public_keys(self, public_keys: dict[str, str]) -> dict[str, str]:
         cache.set(
             settings.keys_cache_key,
-            fetched_public_keys,
+            public_keys,
             math.floor(settings.keys_cache_timeout.total_seconds()),
         )
-        return fetched_public_keys.get(key_id, None)
+        cache.set(
+            f"{settings.keys_cache_key}.stale",
+            (public_keys, time.time()),
+            math.floor(
+                (
+                    settings.keys_cache_timeout + settings.keys_stale_timeout
+                ).total_seconds()
+            ),
+        )
+        local_public_keys.set(public_keys)
+        unknown_key_ids.clear()
+        verifying_keys.retain(public_keys.values())
+        return public_keys
 
     def fetch_public_keys(self) -> dict[str, str]:
-        response = requests.get(settings.keys_server_url)
-        response.raise_for_status()
-        json_data = response.json()
-        return {str(key["keyId"]): key["pem"] for key in json_data["keys"]}
+        metrics = get_metrics()
+        metrics.increment("public_keys.fetch")
+
+        with metrics.timer("fetch_public_keys"):
+            return get_key_source().get_public_keys()
+
+    def warm_public_keys(self) -> dict[str, str]:
+        """
+        Loads the key set into this process and parses its keys ahead of the
+        first callback. The key set is only fetched if the shared cache lacks
+        it, so that restarting many processes at once doesn't flood the key
+        server.
+        """
+        public_keys = cache.get(settings.keys_cache_key)
+
+        if public_keys is None:
+            public_keys = public_keys_refresh.do(self.refresh_public_keys)
+        else:
+            local_public_keys.set(public_keys)
+
+        verifier = get_verifier()
+        for public_key in public_keys.values():
+            verifying_keys.get(public_key, verifier.load_key)
+
+        return public_keys
 
     def verify_signature(
         self, public_key: str, signature: bytes, content: bytes
     ) -> bool:
-        from ecdsa import BadSignatureError, VerifyingKey
-        from ecdsa.util import sigdecode_der
+        if settings.verification_processes is not None:
+            return self.verify_signature_in_process_pool(public_key, signature, content)
 
-        verifying_key = VerifyingKey.from_pem(public_key)
+        verifier = get_verifier()
+        verifying_key = verifying_keys.get(public_key, verifier.load_key)
+        return verifier.verify(verifying_key, signature, content)
 
-        try:
-            return verifying_key.verify(
-                signature,
-                content,
-                hashfunc=hashlib.sha256,
-                sigdecode=sigdecode_der,
+    def verify_signature_in_process_pool(
+        self, public_key: str, signature: bytes, content: bytes
+    ) -> bool:
+        # Pure Python verification holds the GIL, so threads of a server
+        # process can't verify in parallel, while worker processes can.
+        executor, slots = get_verification_process_pool()
+
+        # Requests wait for a free slot, so that the number of pending
+        # verifications stays bounded while the workers are saturated.
+        with slots:
+            future = executor.submit(
+                verify, settings.verifier_backend, public_key, signature, content
             )
-        except BadSignatureError:
-            return False
+
+            try:
+                return future.result()
+            except BrokenProcessPool:
+                # A worker died, the pool gets replaced for the next request.
+                shutdown_verification_process_pool()
+                raise
+
+    def handle_verified_ssv(
+        self, request: HttpRequest, transaction_id: str | None
+    ) -> None:
+        if transaction_id is None:
+            self.handle_valid_ssv(request)
+            return
+
+        # Concurrent deliveries of the same callback race for the transaction_id.
+        if not transaction_ids.add(transaction_id):
+            return
+
+        try:
+            self.handle_valid_ssv(request)
+        except Exception:
+            # Let Admob's retry of this callback through again.
+            transaction_ids.discard(transaction_id)
+            raise
 
     def handle_valid_ssv(self, request: HttpRequest) -> None:
-        valid_admob_ssv.send(sender=None, query=request.GET.dict())
+        get_dispatcher().dispatch(request.GET.dict())
+
+
+class AsyncAdmobSSVView(AdmobSSVView):
+    """
+    Variant of `AdmobSSVView` for ASGI deployments.
+
+    Cache lookups and key fetches don't block, signature verification runs in
+    a bounded thread pool and `valid_admob_ssv` receivers are called using
+    `asend`, so that async receivers don't need to be wrapped.
+    """
+
+    async def get(self, request: HttpRequest) -> HttpResponse:
+        received_at = time.time()
+        metrics = get_metrics()
+
+        # Malformed callbacks are rejected before they cause any I/O.
+        error = self.validate_request(request)
+        if error is not None:
+            metrics.increment("malformed_request")
+            self.journal_callback(request, received_at, "malformed_request")
+            return HttpResponseBadRequest(error)
+
+        # Callbacks retried by Admob have been handled before.
+        transaction_id = request.GET.get(self.TRANSACTION_ID_PARAM_NAME, None)
+        if transaction_id is not None and await transaction_ids.acontains(
+            transaction_id
+        ):
+            metrics.increment("duplicate_transaction_id")
+            self.journal_callback(request, received_at, "duplicate_transaction_id")
+            return HttpResponse()
+
+        # Callbacks beyond the admission limit are turned away right away, and
+        # retried by Admob later.
+        if not await admission_controller.aacquire():
+            metrics.increment("overloaded")
+            self.journal_callback(request, received_at, "overloaded")
+            return self.get_overloaded_response()
+
+        started_at = time.perf_counter()
+        try:
+            return await self.averify_ssv(request, transaction_id, received_at)
+        except Exception:
+            self.journal_callback(request, received_at, "error")
+            raise
+        finally:
+            await admission_controller.arelease(time.perf_counter() - started_at)
+
+    async def averify_ssv(
+        self, request: HttpRequest, transaction_id: str | None, received_at: float
+    ) -> HttpResponse:
+        metrics = get_metrics()
+
+        key_id = request.GET[self.KEY_ID_PARAM_NAME]
+        with metrics.timer("get_public_key"):
+            public_key = await self.aget_public_key(key_id)
+
+        if public_key is None:
+            metrics.increment("unknown_key_id")
+            self.journal_callback(request, received_at, "unknown_key_id")
+            return HttpResponseBadRequest("Unknown key_id")
+
+        signature = self.get_signature(request)
+        with metrics.timer("get_unverified_content"):
+            content = self.get_unverified_content(request)
+
+        with metrics.timer("verify_signature"):
+            is_valid = await self.averify_signature(public_key, signature, content)
+
+        if is_valid:
+            with metrics.timer("handle_valid_ssv"):
+                await self.ahandle_verified_ssv(request, transaction_id)
+            self.journal_callback(request, received_at, "valid")
+            return HttpResponse()
+
+        metrics.increment("invalid_signature")
+        self.journal_callback(request, received_at, "invalid_signature")
+        return HttpResponseBadRequest("Invalid signature")
+
+    async def aget_public_key(self, key_id: str) -> str | None:
+        background_refresh_interval = settings.keys_background_refresh_interval
+        if background_refresh_interval is not None:
+            background_refresher.start(
+                type(self)().revalidate_public_keys,
+                background_refresh_interval.total_seconds(),
+            )
+
+        metrics = get_metrics()
+
+        if key_id in unknown_key_ids:
+            metrics.increment("unknown_key_ids.hit")
+            return None
+
+        local_public_key = (local_public_keys.get() or {}).get(key_id, None)
+
+        if local_public_key is not None:
+            metrics.increment("local_public_keys.hit")
+            return local_public_key
+
+        metrics.increment("local_public_keys.miss")
+
+        cached_public_keys = await cache.aget(settings.keys_cache_key, default={})
+        cached_public_key = cached_public_keys.get(key_id, None)
+
+        if cached_public_key is not None:
+            metrics.increment("public_keys.hit")
+            local_public_keys.set(cached_public_keys)
+            return cached_public_key
+
+        metrics.increment("public_keys.miss")
+
+        refresh_interval = settings.keys_refresh_interval.total_seconds()
+        # Without a refresh, the key_id isn't known to be bogus yet, so it isn't
+        # remembered as unknown.
+        if cached_public_keys and public_keys_arefresh.completed_within(
+            refresh_interval
+        ):
+            return None
+
+        try:
+            refreshed_public_keys = await public_keys_arefresh.do(
+                self.arefresh_public_keys
+            )
+        except Exception:
+            stale_public_keys = await self.aget_stale_public_keys()
+            if stale_public_keys is None:
+                raise
+            metrics.increment("stale_public_keys.hit")
+            logger.exception("Refreshing the Admob SSV public keys failed")
+            return stale_public_keys.get(key_id, None)
+
+        refreshed_public_key = refreshed_public_keys.get(key_id, None)
+
+        if refreshed_public_key is None:
+            unknown_key_ids.add(key_id)
+
+        return refreshed_public_key
+
+    async def aget_stale_public_keys(self) -> dict[str, str] | None:
+        stale_entry = await cache.aget(f"{settings.keys_cache_key}.stale")
+
+        if stale_entry is None:
+            return None
+
+        stale_public_keys, _fetched_at = stale_entry
+        local_public_keys.set(stale_public_keys)
+        return stale_public_keys
+
+    async def arefresh_public_keys(self) -> dict[str, str]:
+        if settings.keys_fetch_lock_timeout is None:
+            return await self.astore_public_keys(await self.afetch_public_keys())
+
+        lock_key = f"{settings.keys_cache_key}.lock"
+        lock_timeout = settings.keys_fetch_lock_timeout.total_seconds()
+
+        if await cache.aadd(lock_key, True, math.ceil(lock_timeout)):
+            try:
+                return await self.astore_public_keys(await self.afetch_public_keys())
+            finally:
+                await cache.adelete(lock_key)
+
+        deadline = time.monotonic() + lock_timeout
+        while await cache.aget(lock_key) is not None and time.monotonic() < deadline:
+            await asyncio.sleep(0.05)
+
+        cached_public_keys = await cache.aget(settings.keys_cache_key)
+
+        if cached_public_keys is not None:
+            local_public_keys.set(cached_public_keys)
+            return cached_public_keys
+
+        return await self.astore_public_keys(await self.afetch_public_keys())
+
+    async def astore_public_keys(self, public_keys: dict[str, str]) -> dict[str, str]:
+        await cache.aset(
+            settings.keys_cache_key,
+            public_keys,
+            math.floor(settings.keys_cache_timeout.total_seconds()),
+        )
+        await cache.aset(
+            f"{settings.keys_cache_key}.stale",
+            (public_keys, time.time()),
+            math.floor(
+                (
+                    settings.keys_cache_timeout + settings.keys_stale_timeout
+                ).total_seconds()
+            ),
+        )
+        local_public_keys.set(public_keys)
+        unknown_key_ids.clear()
+        verifying_keys.retain(public_keys.values())
+        return public_keys
+
+    async def afetch_public_keys(self) -> dict[str, str]:
+        metrics = get_metrics()
+        metrics.increment("public_keys.fetch")
+
+        with metrics.timer("fetch_public_keys"):
+            return await get_key_source().aget_public_keys()
+
+    async def averify_signature(
+        self, public_key: str, signature: bytes, content: bytes
+    ) -> bool:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            get_verification_executor(),
+            self.verify_signature,
+            public_key,
+            signature,
+            content,
+        )
+
+    async def ahandle_verified_ssv(
+        self, request: HttpRequest, transaction_id: str | None
+    ) -> None:
+        if transaction_id is None:
+            await self.ahandle_valid_ssv(request)
+            return
+
+        if not await transaction_ids.aadd(transaction_id):
+            return
+
+        try:
+            await self.ahandle_valid_ssv(request)
+        except Exception:
+            await transaction_ids.adiscard(transaction_id)
+            raise
+
+    async def ahandle_valid_ssv(self, request: HttpRequest) -> None:
+        await get_dispatcher().adispatch(request.GET.dict())
@@ -0,0 +1,60 @@
+"""
+Microbenchmark of the extraction of the signed content from callback query
+strings, in the order sent by Admob and reordered by middleware.
+
+Run it from the repository root using `python -m benchmarks.canonicalization`.
+"""
+
+import urllib.parse
+
+from django.test import RequestFactory
+
+from admob_ssv.views import AdmobSSVView
+from benchmarks.common import (
+    ORDERED_QUERY_STRING,
+    REORDERED_QUERY_STRING,
+    dump_results,
+    measure,
+)
+
+
+def reference_unverified_content(query_string: str) -> bytes:
+    query_data = urllib.parse.parse_qs(query_string)
+    query_data.pop("signature", None)
+    query_data.pop("key_id", None)
+
+    sorted_query_data = sorted(query_data.items())
+    sorted_query_string = urllib.parse.urlencode(sorted_query_data, doseq=True)
+    return urllib.parse.unquote(sorted_query_string).encode("utf-8")
+
+
+def main(number: int = 20000, repeat: int = 5) -> dict:
+    view = AdmobSSVView()
+    request_factory = RequestFactory()
+    results = {}
+
+    for name, query_string in [
+        ("ordered", ORDERED_QUERY_STRING),
+        ("reordered", REORDERED_QUERY_STRING),
+    ]:
+        request = request_factory.get("/admob-ssv/")
+        request.META["QUERY_STRING"] = query_string
+
+        results[f"{name}.reference"] = measure(
+            lambda query_string=query_string: reference_unverified_content(
+                query_string
+            ),
+            number,
+            repeat,
+        )
+        results[f"{name}.get_unverified_content"] = measure(
+            lambda request=request: view.get_unverified_content(request),
+            number,
+            repeat,
+        )
+
+    return results
+
+
+if __name__ == "__main__":
+    dump_results(main(), None)
@@ -0,0 +1,83 @@
+import json
+import os
+import platform
+import threading
+import timeit
+from collections.abc import Callable
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "tests.project.project.settings")
+
+import django
+
+django.setup()
+
+from tests.test_views import PUBLIC_KEY_PEM
+
+KEY_ID = "3335741209"
+
+SIGNATURE = "MEQCIAhKY5P-aBmjU0iqxtjq2JPzeNKnQ92ZbSPC33Sp4ByeAiBArqhg9_uafB1LCBYVIXWNOW8vVVlocLc81ptROfE44Q"
+
+ORDERED_QUERY_STRING = (
+    "ad_network=5450213213286189855&ad_unit=1234567890&custom_data=customdata42"
+    "&reward_amount=1&reward_item=Reward&timestamp=1683852940453"
+    f"&transaction_id=123456789&user_id=userid42&signature={SIGNATURE}"
+    f"&key_id={KEY_ID}"
+)
+
+REORDERED_QUERY_STRING = "&".join(sorted(ORDERED_QUERY_STRING.split("&")))
+
+
+def measure(func: Callable[[], object], number: int, repeat: int) -> dict[str, float]:
+    best = min(timeit.repeat(func, number=number, repeat=repeat)) / number
+    return {"seconds_per_call": best, "calls_per_second": 1 / best}
+
+
+def get_environment() -> dict[str, str]:
+    return {
+        "python": platform.python_version(),
+        "implementation": platform.python_implementation(),
+        "django": django.get_version(),
+        "machine": platform.machine(),
+    }
+
+
+def dump_results(results: dict, path: str | None) -> None:
+    data = json.dumps({"environment": get_environment(), "results": results}, indent=2)
+
+    if path is None:
+        print(data)
+    else:
+        with open(path, "w") as file:
+            file.write(data + "\n")
+
+
+class KeyServer:
+    """
+    Local stand-in for the Admob key server, serving the test key set.
+    """
+
+    def __init__(self) -> None:
+        body = json.dumps({"keys": [{"keyId": int(KEY_ID), "pem": PUBLIC_KEY_PEM}]})
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                self.send_response(200)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body.encode("utf-8"))
+
+            def log_message(self, format, *args):
+                pass
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.url = f"http://127.0.0.1:{self.server.server_port}/keys.json"
+
+    def __enter__(self):
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.server.shutdown()
+        self.server.server_close()
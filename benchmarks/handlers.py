@@ -0,0 +1,144 @@
+"""
+Benchmark of the requests per second handled through the Django project's
+WSGI and ASGI applications, compared to the standalone handlers, which skip
+Django's middleware, URL resolver and request parsing.
+
+Requests are passed to the applications in process, so that no time is spent
+on the network or in a server. Receivers of `valid_admob_ssv` aren't
+connected and public keys are cached up front.
+
+Run it from the repository root using `python -m benchmarks.handlers`.
+"""
+
+import asyncio
+import io
+import time
+
+from django.core.asgi import get_asgi_application
+from django.core.wsgi import get_wsgi_application
+
+from admob_ssv.handlers import AdmobSSVASGIHandler, AdmobSSVWSGIHandler
+from admob_ssv.keys import local_public_keys
+from admob_ssv.signals import valid_admob_ssv
+from benchmarks.common import (
+    KEY_ID,
+    ORDERED_QUERY_STRING,
+    PUBLIC_KEY_PEM,
+    dump_results,
+    measure,
+)
+from tests.project.verifications.signals import store_verification
+
+
+def get_environ(path: str) -> dict:
+    return {
+        "REQUEST_METHOD": "GET",
+        "PATH_INFO": path,
+        "QUERY_STRING": ORDERED_QUERY_STRING,
+        "SERVER_NAME": "testserver",
+        "SERVER_PORT": "80",
+        "SERVER_PROTOCOL": "HTTP/1.1",
+        "wsgi.input": io.BytesIO(),
+        "wsgi.url_scheme": "http",
+    }
+
+
+def measure_wsgi(application, path: str, number: int, repeat: int) -> dict:
+    def start_response(status, headers):
+        assert status == "200 OK", status
+
+    def get():
+        b"".join(application(get_environ(path), start_response))
+
+    get()
+    return measure(get, number, repeat)
+
+
+def measure_asgi(application, path: str, number: int, repeat: int) -> dict:
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": "GET",
+        "scheme": "http",
+        "path": path,
+        "raw_path": path.encode("ascii"),
+        "query_string": ORDERED_QUERY_STRING.encode("ascii"),
+        "root_path": "",
+        "headers": [(b"host", b"testserver")],
+        "server": ("testserver", 80),
+    }
+
+    async def send(message):
+        if message["type"] == "http.response.start":
+            assert message["status"] == 200, message
+
+    async def get_many(count):
+        disconnected = asyncio.Event()
+
+        for _ in range(count):
+            messages = [{"type": "http.request", "body": b"", "more_body": False}]
+
+            # After the request body, Django waits for the client to disconnect.
+            async def receive(messages=messages):
+                if messages:
+                    return messages.pop()
+                await disconnected.wait()
+
+            await application(dict(scope), receive, send)
+
+    async def run():
+        await get_many(1)
+
+        best = None
+        for _ in range(repeat):
+            started_at = time.perf_counter()
+            await get_many(number)
+            elapsed = (time.perf_counter() - started_at) / number
+            best = elapsed if best is None else min(best, elapsed)
+
+        return {"seconds_per_call": best, "calls_per_second": 1 / best}
+
+    return asyncio.run(run())
+
+
+def main(number: int = 500, repeat: int = 5) -> dict:
+    local_public_keys.set({KEY_ID: PUBLIC_KEY_PEM})
+    results = {}
+
+    # Receivers aren't part of the measured request path.
+    valid_admob_ssv.disconnect(store_verification)
+
+    try:
+        wsgi_application = get_wsgi_application()
+        results["wsgi.django"] = measure_wsgi(
+            wsgi_application, "/admob-ssv/", number, repeat
+        )
+        results["wsgi.standalone"] = measure_wsgi(
+            AdmobSSVWSGIHandler(wsgi_application), "/admob-ssv/", number, repeat
+        )
+
+        asgi_application = get_asgi_application()
+        results["asgi.django"] = measure_asgi(
+            asgi_application, "/admob-ssv-async/", number, repeat
+        )
+        results["asgi.standalone"] = measure_asgi(
+            AdmobSSVASGIHandler(asgi_application, path="/admob-ssv-async/"),
+            "/admob-ssv-async/",
+            number,
+            repeat,
+        )
+    finally:
+        valid_admob_ssv.connect(store_verification)
+
+    for interface in ("wsgi", "asgi"):
+        results[f"{interface}.speedup"] = (
+            results[f"{interface}.standalone"]["calls_per_second"]
+            / results[f"{interface}.django"]["calls_per_second"]
+        )
+
+    return results
+
+
+if __name__ == "__main__":
+    dump_results(main(), None)
@@ -0,0 +1,59 @@
+"""
+Microbenchmark of ECDSA signature verification with and without precomputed
+multiplication tables for the public key, including the cost of building them.
+
+Run it from the repository root using `python -m benchmarks.precompute`.
+"""
+
+import base64
+
+from admob_ssv.verifiers import EcdsaVerifier
+from benchmarks.common import (
+    ORDERED_QUERY_STRING,
+    PUBLIC_KEY_PEM,
+    SIGNATURE,
+    dump_results,
+    measure,
+)
+
+
+class PlainEcdsaVerifier(EcdsaVerifier):
+    precompute = False
+
+
+def main(number: int = 200, repeat: int = 5) -> dict:
+    content = ORDERED_QUERY_STRING.partition("&signature=")[0].encode("utf-8")
+    signature = base64.urlsafe_b64decode(SIGNATURE + "===")
+    results = {}
+
+    for name, verifier in [
+        ("plain", PlainEcdsaVerifier()),
+        ("precomputed", EcdsaVerifier()),
+    ]:
+        results[f"{name}.load_key"] = measure(
+            lambda verifier=verifier: verifier.load_key(PUBLIC_KEY_PEM),
+            max(number // 10, 1),
+            repeat,
+        )
+
+        verifying_key = verifier.load_key(PUBLIC_KEY_PEM)
+        assert verifier.verify(verifying_key, signature, content)
+
+        results[f"{name}.verify"] = measure(
+            lambda verifier=verifier, verifying_key=verifying_key: verifier.verify(
+                verifying_key, signature, content
+            ),
+            number,
+            repeat,
+        )
+
+    results["speedup"] = (
+        results["plain.verify"]["seconds_per_call"]
+        / results["precomputed.verify"]["seconds_per_call"]
+    )
+
+    return results
+
+
+if __name__ == "__main__":
+    dump_results(main(), None)
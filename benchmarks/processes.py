@@ -0,0 +1,71 @@
+"""
+Benchmark of the signature verification throughput of concurrent threads,
+verifying either in the threads themselves or in a pool of worker processes.
+
+Pure Python verification holds the GIL, so only the worker processes scale
+with the number of cores.
+
+Run it from the repository root using `python -m benchmarks.processes`.
+"""
+
+import base64
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from django.test import override_settings
+
+from admob_ssv.keys import local_public_keys
+from admob_ssv.views import AdmobSSVView, shutdown_verification_process_pool
+from benchmarks.common import (
+    KEY_ID,
+    ORDERED_QUERY_STRING,
+    PUBLIC_KEY_PEM,
+    SIGNATURE,
+    dump_results,
+)
+
+
+def measure_throughput(workers: int, number: int) -> dict[str, float]:
+    view = AdmobSSVView()
+    content = ORDERED_QUERY_STRING.partition("&signature=")[0].encode("utf-8")
+    signature = base64.urlsafe_b64decode(SIGNATURE + "===")
+
+    def verify_signature(_):
+        assert view.verify_signature(PUBLIC_KEY_PEM, signature, content)
+
+    # Excludes warming up keys and starting worker processes.
+    verify_signature(None)
+
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        started_at = time.perf_counter()
+        list(executor.map(verify_signature, range(number)))
+        elapsed = time.perf_counter() - started_at
+
+    return {"seconds_per_call": elapsed / number, "calls_per_second": number / elapsed}
+
+
+def main(number: int = 200, max_workers: int | None = None) -> dict:
+    max_workers = max_workers or os.cpu_count() or 1
+    local_public_keys.set({KEY_ID: PUBLIC_KEY_PEM})
+    results = {}
+
+    workers = 1
+    while True:
+        results[f"threads.{workers}"] = measure_throughput(workers, number)
+
+        with override_settings(ADMOB_SSV_VERIFICATION_PROCESSES=workers):
+            try:
+                results[f"processes.{workers}"] = measure_throughput(workers, number)
+            finally:
+                shutdown_verification_process_pool()
+
+        if workers >= max_workers:
+            break
+        workers = min(workers * 2, max_workers)
+
+    return results
+
+
+if __name__ == "__main__":
+    dump_results(main(), None)
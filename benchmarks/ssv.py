@@ -0,0 +1,192 @@
+"""
+Benchmarks each stage of the `AdmobSSVView` request path on its own, as well
+as end to end, with warm and cold caches and under concurrent load.
+
+Run it from the repository root using `python -m benchmarks.ssv`. Results are
+written as JSON. Passing `--baseline` compares them against the results of a
+previous run and fails if any stage got slower than `--max-slowdown` allows.
+"""
+
+import argparse
+import json
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from importlib.util import find_spec
+
+from django.test import Client, RequestFactory, override_settings
+
+from admob_ssv.keys import invalidate_public_keys, local_public_keys, verifying_keys
+from admob_ssv.signals import valid_admob_ssv
+from admob_ssv.views import AdmobSSVView
+from benchmarks import canonicalization
+from benchmarks.common import (
+    KEY_ID,
+    ORDERED_QUERY_STRING,
+    PUBLIC_KEY_PEM,
+    KeyServer,
+    dump_results,
+    measure,
+)
+from tests.project.verifications.signals import store_verification
+
+VERIFIER_BACKENDS = {
+    "ecdsa": "admob_ssv.verifiers.EcdsaVerifier",
+    "cryptography": "admob_ssv.verifiers.CryptographyVerifier",
+}
+
+
+def benchmark_stages(number: int, repeat: int) -> dict:
+    view = AdmobSSVView()
+    request = RequestFactory().get("/admob-ssv/")
+    request.META["QUERY_STRING"] = ORDERED_QUERY_STRING
+    signature = view.get_signature(request)
+    content = view.get_unverified_content(request)
+    results = {}
+
+    results["get_signature"] = measure(
+        lambda: view.get_signature(request), number, repeat
+    )
+
+    for name, result in canonicalization.main(number, repeat).items():
+        results[f"get_unverified_content.{name}"] = result
+
+    view.get_public_key(KEY_ID)
+    results["get_public_key.local"] = measure(
+        lambda: view.get_public_key(KEY_ID), number, repeat
+    )
+
+    def get_public_key_from_shared_cache():
+        local_public_keys.clear()
+        view.get_public_key(KEY_ID)
+
+    results["get_public_key.shared"] = measure(
+        get_public_key_from_shared_cache, number, repeat
+    )
+
+    def get_public_key_from_key_server():
+        invalidate_public_keys()
+        view.get_public_key(KEY_ID)
+
+    results["get_public_key.cold"] = measure(
+        get_public_key_from_key_server, max(number // 100, 1), repeat
+    )
+
+    for name, backend in VERIFIER_BACKENDS.items():
+        if name == "cryptography" and find_spec("cryptography") is None:
+            continue
+
+        with override_settings(ADMOB_SSV_VERIFIER_BACKEND=backend):
+            view.verify_signature(PUBLIC_KEY_PEM, signature, content)
+            results[f"verify_signature.{name}.warm"] = measure(
+                lambda: view.verify_signature(PUBLIC_KEY_PEM, signature, content),
+                max(number // 10, 1),
+                repeat,
+            )
+
+            def verify_signature_with_unparsed_key():
+                verifying_keys.clear()
+                view.verify_signature(PUBLIC_KEY_PEM, signature, content)
+
+            results[f"verify_signature.{name}.cold"] = measure(
+                verify_signature_with_unparsed_key, max(number // 10, 1), repeat
+            )
+
+    return results
+
+
+def benchmark_end_to_end(number: int, repeat: int, threads: int) -> dict:
+    client = Client()
+    path = f"/admob-ssv/?{ORDERED_QUERY_STRING}"
+    results = {}
+
+    def get():
+        response = client.get(path)
+        assert response.status_code == 200, response.content
+
+    get()
+    results["end_to_end.warm"] = measure(get, max(number // 10, 1), repeat)
+
+    def get_with_cold_caches():
+        invalidate_public_keys()
+        get()
+
+    results["end_to_end.cold"] = measure(
+        get_with_cold_caches, max(number // 100, 1), repeat
+    )
+
+    requests = max(number // 10, 1) * threads
+
+    def get_concurrently():
+        with ThreadPoolExecutor(max_workers=threads) as executor:
+            for future in [
+                executor.submit(Client().get, path) for _ in range(requests)
+            ]:
+                assert future.result().status_code == 200
+
+    started_at = time.perf_counter()
+    get_concurrently()
+    elapsed = time.perf_counter() - started_at
+    results[f"end_to_end.concurrent.{threads}"] = {
+        "seconds_per_call": elapsed / requests,
+        "calls_per_second": requests / elapsed,
+    }
+
+    return results
+
+
+def compare(results: dict, baseline: dict, max_slowdown: float) -> list[str]:
+    regressions = []
+
+    for name, result in results.items():
+        if name not in baseline:
+            continue
+
+        slowdown = result["seconds_per_call"] / baseline[name]["seconds_per_call"]
+        if slowdown > max_slowdown:
+            regressions.append(f"{name} is {slowdown:.2f}x slower than the baseline")
+
+    return regressions
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--number", type=int, default=2000)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--threads", type=int, default=8)
+    parser.add_argument("--output", help="Path to write the results to.")
+    parser.add_argument("--baseline", help="Path to the results of a previous run.")
+    parser.add_argument("--max-slowdown", type=float, default=1.25)
+    args = parser.parse_args(argv)
+
+    # Receivers aren't part of the measured request path.
+    valid_admob_ssv.disconnect(store_verification)
+
+    try:
+        with (
+            KeyServer() as key_server,
+            override_settings(ADMOB_SSV_KEYS_SERVER_URL=key_server.url),
+        ):
+            invalidate_public_keys()
+            results = benchmark_stages(args.number, args.repeat)
+            results.update(benchmark_end_to_end(args.number, args.repeat, args.threads))
+    finally:
+        valid_admob_ssv.connect(store_verification)
+
+    dump_results(results, args.output)
+
+    if args.baseline is None:
+        return 0
+
+    with open(args.baseline) as file:
+        baseline = json.load(file)["results"]
+
+    regressions = compare(results, baseline, args.max_slowdown)
+    for regression in regressions:
+        print(regression, file=sys.stderr)
+
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
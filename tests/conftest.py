@@ -0,0 +1,46 @@
+import pytest
+from django.core.cache import cache
+
+from admob_ssv.admission import admission_controller
+from admob_ssv.deduplication import transaction_ids
+from admob_ssv.http import key_server_client
+from admob_ssv.keys import (
+    local_public_keys,
+    public_keys_arefresh,
+    public_keys_refresh,
+    unknown_key_ids,
+    verifying_keys,
+)
+
+from .test_views import PUBLIC_KEY_PEM
+
+# Callback signed by Admob's test key, carrying Admob's test transaction_id.
+VALID_CALLBACK = {
+    "ad_network": 5450213213286189855,
+    "ad_unit": 1234567890,
+    "custom_data": "customdata42",
+    "reward_amount": 1,
+    "reward_item": "Reward",
+    "timestamp": 1683852940453,
+    "transaction_id": 123456789,
+    "user_id": "userid42",
+    "signature": "MEQCIAhKY5P-aBmjU0iqxtjq2JPzeNKnQ92ZbSPC33Sp4ByeAiBArqhg9_uafB1LCBYVIXWNOW8vVVlocLc81ptROfE44Q",
+    "key_id": 3335741209,
+}
+
+
+@pytest.fixture(autouse=True)
+def clear_local_key_caches():
+    local_public_keys.clear()
+    public_keys_refresh.reset()
+    public_keys_arefresh.reset()
+    unknown_key_ids.clear()
+    verifying_keys.clear()
+    key_server_client.close()
+    transaction_ids.clear()
+    admission_controller.reset()
+
+
+@pytest.fixture
+def cached_public_keys():
+    cache.set("admob_ssv.public_keys", {"3335741209": PUBLIC_KEY_PEM}, 60)
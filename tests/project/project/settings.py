@@ -21,6 +21,7 @@ INSTALLED_APPS = [
     "django.contrib.messages",
     "django.contrib.sessions",
     "django.contrib.staticfiles",
+    "admob_ssv",
     "tests.project.verifications",
 ]
 
@@ -48,5 +49,23 @@ STATIC_URL = "static/"
 
 # Optional advanced settings
 ADMOB_SSV_KEYS_SERVER_URL = "https://www.gstatic.com/admob/reward/verifier-keys.json"
+ADMOB_SSV_KEYS_SERVER_CONNECT_TIMEOUT = timedelta(seconds=3)
+ADMOB_SSV_KEYS_SERVER_READ_TIMEOUT = timedelta(seconds=10)
+ADMOB_SSV_KEYS_SERVER_RETRIES = 2
+ADMOB_SSV_KEYS_SERVER_RETRY_BACKOFF = timedelta(milliseconds=500)
 ADMOB_SSV_KEYS_CACHE_TIMEOUT = timedelta(days=1)
 ADMOB_SSV_KEYS_CACHE_KEY = "admob_ssv.public_keys"
+ADMOB_SSV_KEYS_LOCAL_CACHE_TIMEOUT = timedelta(minutes=1)
+ADMOB_SSV_KEYS_FETCH_LOCK_TIMEOUT = None
+ADMOB_SSV_KEYS_REFRESH_INTERVAL = timedelta(minutes=1)
+ADMOB_SSV_UNKNOWN_KEY_IDS_CACHE_TIMEOUT = timedelta(minutes=10)
+ADMOB_SSV_KEYS_STALE_TIMEOUT = timedelta(days=1)
+ADMOB_SSV_KEYS_BACKGROUND_REFRESH_INTERVAL = None
+ADMOB_SSV_TRANSACTION_IDS_CACHE_TIMEOUT = None
+ADMOB_SSV_TRANSACTION_IDS_ALLOW_LIST = ("123456789",)
+ADMOB_SSV_DISPATCHER_BACKEND = "admob_ssv.dispatchers.SyncDispatcher"
+ADMOB_SSV_DISPATCHER_THREADS = 4
+ADMOB_SSV_DISPATCHER_TASK = None
+ADMOB_SSV_ASYNC_VERIFICATION_THREADS = 4
+ADMOB_SSV_VERIFYING_KEYS_CACHE_SIZE = 16
+ADMOB_SSV_VERIFIER_BACKEND = "admob_ssv.verifiers.EcdsaVerifier"
@@ -0,0 +1,196 @@
+from datetime import timedelta
+from unittest import mock
+
+import pytest
+from asgiref.sync import async_to_sync
+from django.core.cache import cache
+
+from admob_ssv.admission import AdmissionController, admission_controller
+from admob_ssv.metrics import get_metrics
+from admob_ssv.views import AdmobSSVView, AsyncAdmobSSVView
+
+from .conftest import VALID_CALLBACK
+from .test_views import PUBLIC_KEY_PEM, mock_admob_ssv_keys_server  # noqa: F401
+
+
+@pytest.fixture(autouse=True)
+def clear_fleet_in_flight():
+    cache.delete("admob_ssv.in_flight")
+    yield
+    cache.delete("admob_ssv.in_flight")
+
+
+def test_acquire_without_limits():
+    controller = AdmissionController()
+
+    assert controller.limit is None
+    assert all(controller.acquire() for _ in range(100))
+    assert controller.in_flight == 100
+
+
+def test_acquire_caps_in_flight(settings):
+    settings.ADMOB_SSV_MAX_IN_FLIGHT = 2
+    controller = AdmissionController()
+
+    assert controller.acquire()
+    assert controller.acquire()
+    assert not controller.acquire()
+
+    controller.release(0.001)
+    assert controller.in_flight == 1
+    assert controller.acquire()
+
+
+def test_acquire_caps_fleet_in_flight(settings):
+    settings.ADMOB_SSV_FLEET_MAX_IN_FLIGHT = 2
+    other_process = AdmissionController()
+    controller = AdmissionController()
+
+    assert other_process.acquire()
+    assert controller.acquire()
+    assert not controller.acquire()
+    assert controller.in_flight == 1
+    assert cache.get("admob_ssv.in_flight") == 2
+
+    other_process.release(0.001)
+    assert controller.acquire()
+
+
+def test_acquire_recovers_from_expired_fleet_in_flight(settings):
+    settings.ADMOB_SSV_FLEET_MAX_IN_FLIGHT = 1
+    controller = AdmissionController()
+
+    assert controller.acquire()
+    cache.delete("admob_ssv.in_flight")
+    controller.release(0.001)
+
+    assert controller.acquire()
+    assert cache.get("admob_ssv.in_flight") == 1
+
+
+def test_aacquire_caps_fleet_in_flight(settings):
+    settings.ADMOB_SSV_FLEET_MAX_IN_FLIGHT = 1
+    controller = AdmissionController()
+
+    assert async_to_sync(controller.aacquire)()
+    assert not async_to_sync(controller.aacquire)()
+
+    async_to_sync(controller.arelease)(0.001)
+    assert cache.get("admob_ssv.in_flight") == 0
+    assert controller.in_flight == 0
+
+
+def test_adaptive_limit(settings):
+    settings.ADMOB_SSV_MAX_IN_FLIGHT = 10
+    settings.ADMOB_SSV_ADMISSION_TARGET_LATENCY = timedelta(milliseconds=100)
+    controller = AdmissionController()
+
+    for _ in range(10):
+        assert controller.acquire()
+        controller.release(1.0)
+
+    assert controller.limit == 3
+
+    for _ in range(10):
+        assert controller.acquire()
+        controller.release(0.01)
+
+    assert controller.limit == 5
+
+    for _ in range(100):
+        assert controller.acquire()
+        controller.release(0.01)
+
+    assert controller.limit == 10
+
+
+def test_adaptive_limit_never_drops_below_one(settings):
+    settings.ADMOB_SSV_MAX_IN_FLIGHT = 4
+    settings.ADMOB_SSV_ADMISSION_TARGET_LATENCY = timedelta(milliseconds=100)
+    controller = AdmissionController()
+
+    for _ in range(100):
+        assert controller.acquire()
+        controller.release(1.0)
+
+    assert controller.limit == 1
+
+
+def test_acquire_reports_in_flight(settings):
+    settings.ADMOB_SSV_METRICS_BACKEND = "admob_ssv.metrics.PrometheusMetrics"
+    settings.ADMOB_SSV_MAX_IN_FLIGHT = 4
+    settings.ADMOB_SSV_ADMISSION_TARGET_LATENCY = timedelta(milliseconds=100)
+    metrics = get_metrics()
+    metrics.clear()
+    controller = AdmissionController()
+
+    controller.acquire()
+    controller.acquire()
+    assert 'admob_ssv_gauge{name="in_flight"} 2' in metrics.render().splitlines()
+
+    controller.release(1.0)
+    lines = metrics.render().splitlines()
+    assert 'admob_ssv_gauge{name="in_flight"} 1' in lines
+    assert 'admob_ssv_gauge{name="in_flight_limit"} 3' in lines
+    metrics.clear()
+
+
+def test_get_turns_away_callbacks_beyond_limit(client, settings):
+    settings.ADMOB_SSV_MAX_IN_FLIGHT = 1
+    settings.ADMOB_SSV_RETRY_AFTER = timedelta(seconds=1.5)
+    admission_controller.acquire()
+
+    with mock.patch.object(AdmobSSVView, "get_public_key") as get_public_key:
+        response = client.get("/admob-ssv/", VALID_CALLBACK)
+
+    assert response.status_code == 503
+    assert response["Retry-After"] == "2"
+    assert response.content == b"Overloaded"
+    assert not get_public_key.called
+
+
+def test_get_releases_slot_when_verification_fails(client, settings):
+    settings.ADMOB_SSV_MAX_IN_FLIGHT = 1
+
+    with (
+        mock.patch.object(AdmobSSVView, "get_public_key", side_effect=ConnectionError),
+        pytest.raises(ConnectionError),
+    ):
+        client.get("/admob-ssv/", VALID_CALLBACK)
+
+    assert admission_controller.in_flight == 0
+
+
+@pytest.mark.django_db
+def test_get_within_limit(client, settings):
+    settings.ADMOB_SSV_MAX_IN_FLIGHT = 1
+    settings.ADMOB_SSV_FLEET_MAX_IN_FLIGHT = 1
+
+    response = client.get("/admob-ssv/", VALID_CALLBACK)
+
+    assert response.status_code == 200
+    assert admission_controller.in_flight == 0
+    assert cache.get("admob_ssv.in_flight") == 0
+
+
+def test_async_get_turns_away_callbacks_beyond_limit(async_client, settings):
+    settings.ADMOB_SSV_FLEET_MAX_IN_FLIGHT = 1
+    cache.set("admob_ssv.in_flight", 1, 60)
+
+    with mock.patch.object(AsyncAdmobSSVView, "aget_public_key") as aget_public_key:
+        response = async_to_sync(async_client.get)("/admob-ssv-async/", VALID_CALLBACK)
+
+    assert response.status_code == 503
+    assert response["Retry-After"] == "30"
+    assert not aget_public_key.called
+    assert admission_controller.in_flight == 0
+
+
+@pytest.mark.django_db
+def test_async_get_within_limit(async_client, settings, cached_public_keys):
+    settings.ADMOB_SSV_MAX_IN_FLIGHT = 1
+
+    response = async_to_sync(async_client.get)("/admob-ssv-async/", VALID_CALLBACK)
+
+    assert response.status_code == 200
+    assert admission_controller.in_flight == 0
@@ -0,0 +1,203 @@
+import asyncio
+from datetime import timedelta
+from unittest import mock
+
+import pytest
+from asgiref.sync import async_to_sync
+from django.core.cache import cache
+
+from admob_ssv.http import KeyServerClient
+from admob_ssv.keys import AsyncSingleFlight, unknown_key_ids
+from admob_ssv.signals import valid_admob_ssv
+from admob_ssv.views import AsyncAdmobSSVView
+from tests.project.verifications.models import Verification
+
+from .conftest import VALID_CALLBACK
+from .test_views import PUBLIC_KEY_PEM
+
+pytestmark = pytest.mark.usefixtures("cached_public_keys")
+
+
+@pytest.mark.django_db
+def test_get_with_valid_callback(async_client):
+    response = async_to_sync(async_client.get)("/admob-ssv-async/", VALID_CALLBACK)
+
+    assert response.status_code == 200
+    assert Verification.objects.filter(
+        transaction_id="123456789", user_id="userid42"
+    ).exists()
+
+
+def test_get_with_invalid_signature(async_client):
+    data = {**VALID_CALLBACK, "custom_data": "TEMPERED CUSTOM DATA"}
+    response = async_to_sync(async_client.get)("/admob-ssv-async/", data)
+
+    assert response.status_code == 400
+    assert response.content == b"Invalid signature"
+
+
+def test_get_with_unknown_key_id(async_client):
+    data = {**VALID_CALLBACK, "key_id": 1234567890}
+
+    with mock.patch.object(
+        AsyncAdmobSSVView,
+        "afetch_public_keys",
+        mock.AsyncMock(return_value={"3335741209": PUBLIC_KEY_PEM}),
+    ):
+        response = async_to_sync(async_client.get)("/admob-ssv-async/", data)
+
+    assert response.status_code == 400
+    assert response.content == b"Unknown key_id"
+
+
+def test_get_with_missing_signature(async_client):
+    data = {**VALID_CALLBACK}
+    del data["signature"]
+    response = async_to_sync(async_client.get)("/admob-ssv-async/", data)
+
+    assert response.status_code == 400
+    assert response.content == b"Missing signature"
+
+
+def test_get_with_missing_key_id(async_client):
+    data = {**VALID_CALLBACK}
+    del data["key_id"]
+    response = async_to_sync(async_client.get)("/admob-ssv-async/", data)
+
+    assert response.status_code == 400
+    assert response.content == b"Missing key_id"
+
+
+def test_aget_public_key_fetches_missing_keys(settings):
+    settings.ADMOB_SSV_KEYS_FETCH_LOCK_TIMEOUT = timedelta(seconds=5)
+    cache.delete("admob_ssv.public_keys")
+
+    view = AsyncAdmobSSVView()
+    view.afetch_public_keys = mock.AsyncMock(return_value={"TestKeyId": "TestKey"})
+
+    assert async_to_sync(view.aget_public_key)("TestKeyId") == "TestKey"
+    assert cache.get("admob_ssv.public_keys") == {"TestKeyId": "TestKey"}
+    assert cache.get("admob_ssv.public_keys.lock") is None
+
+
+def test_aget_public_key_waits_for_fleet_lock(settings):
+    settings.ADMOB_SSV_KEYS_FETCH_LOCK_TIMEOUT = timedelta(seconds=5)
+    cache.set("admob_ssv.public_keys.lock", True, 5)
+    cache.delete("admob_ssv.public_keys")
+
+    async def other_worker_finishes_refresh(seconds):
+        await cache.aset("admob_ssv.public_keys", {"TestKeyId": "TestKey"}, 60)
+        await cache.adelete("admob_ssv.public_keys.lock")
+
+    view = AsyncAdmobSSVView()
+    view.afetch_public_keys = mock.AsyncMock()
+
+    with mock.patch("admob_ssv.views.asyncio.sleep", other_worker_finishes_refresh):
+        assert async_to_sync(view.aget_public_key)("TestKeyId") == "TestKey"
+
+    assert not view.afetch_public_keys.called
+
+
+def test_aget_public_key_serves_stale_keys_when_fetch_fails():
+    cache.delete("admob_ssv.public_keys")
+    cache.set("admob_ssv.public_keys.stale", ({"TestKeyId": "TestKey"}, 0), 60)
+
+    view = AsyncAdmobSSVView()
+    view.afetch_public_keys = mock.AsyncMock(side_effect=ConnectionError)
+
+    assert async_to_sync(view.aget_public_key)("TestKeyId") == "TestKey"
+    cache.delete("admob_ssv.public_keys.stale")
+
+
+def test_aget_public_key_limits_forced_refreshes():
+    view = AsyncAdmobSSVView()
+    view.afetch_public_keys = mock.AsyncMock(
+        return_value={"3335741209": PUBLIC_KEY_PEM}
+    )
+
+    assert async_to_sync(view.aget_public_key)("UnknownKeyId1") is None
+    assert async_to_sync(view.aget_public_key)("UnknownKeyId2") is None
+    assert view.afetch_public_keys.call_count == 1
+    assert "UnknownKeyId1" in unknown_key_ids
+    assert "UnknownKeyId2" not in unknown_key_ids
+
+
+def test_async_single_flight_coalesces_concurrent_calls():
+    async def fetch():
+        await asyncio.sleep(0.01)
+        return "result"
+
+    func = mock.AsyncMock(side_effect=fetch)
+    single_flight = AsyncSingleFlight()
+
+    async def call_concurrently():
+        return await asyncio.gather(*[single_flight.do(func) for _ in range(4)])
+
+    assert async_to_sync(call_concurrently)() == ["result"] * 4
+    assert func.call_count == 1
+
+
+def test_averify_signature():
+    signature = AsyncAdmobSSVView().get_signature(
+        mock.Mock(GET={"signature": VALID_CALLBACK["signature"]})
+    )
+    content = b"ad_network=5450213213286189855&ad_unit=1234567890&custom_data=customdata42&reward_amount=1&reward_item=Reward&timestamp=1683852940453&transaction_id=123456789&user_id=userid42"
+
+    view = AsyncAdmobSSVView()
+    assert async_to_sync(view.averify_signature)(PUBLIC_KEY_PEM, signature, content)
+
+
+@pytest.mark.django_db
+def test_ahandle_valid_ssv_calls_async_receivers(rf):
+    received = []
+
+    async def receiver(sender, query, **kwargs):
+        received.append(query)
+
+    valid_admob_ssv.connect(receiver)
+    try:
+        request = rf.get("/admob-ssv-async/", VALID_CALLBACK)
+        async_to_sync(AsyncAdmobSSVView().ahandle_valid_ssv)(request)
+    finally:
+        valid_admob_ssv.disconnect(receiver)
+
+    assert len(received) == 1
+    assert received[0]["user_id"] == "userid42"
+
+
+def test_aget_json_uses_httpx():
+    httpx = pytest.importorskip("httpx")
+
+    async def handle_async_request(self, request):
+        assert request.headers.get("If-None-Match") is None
+        return httpx.Response(200, json={"keys": []}, headers={"ETag": '"v1"'})
+
+    client = KeyServerClient()
+    with mock.patch.object(
+        httpx.AsyncHTTPTransport, "handle_async_request", handle_async_request
+    ):
+        json_data = async_to_sync(client.aget_json)("https://example.com/keys.json")
+
+    assert json_data == {"keys": []}
+
+    async def handle_conditional_request(self, request):
+        assert request.headers["If-None-Match"] == '"v1"'
+        return httpx.Response(304)
+
+    with mock.patch.object(
+        httpx.AsyncHTTPTransport, "handle_async_request", handle_conditional_request
+    ):
+        json_data = async_to_sync(client.aget_json)("https://example.com/keys.json")
+
+    assert json_data == {"keys": []}
+
+
+def test_aget_json_without_httpx(requests_mock):
+    requests_mock.get("https://example.com/keys.json", json={"keys": []})
+
+    with mock.patch.dict("sys.modules", {"httpx": None}):
+        json_data = async_to_sync(KeyServerClient().aget_json)(
+            "https://example.com/keys.json"
+        )
+
+    assert json_data == {"keys": []}
@@ -0,0 +1,101 @@
+import urllib.parse
+from concurrent.futures import ProcessPoolExecutor
+from unittest import mock
+
+import pytest
+
+from admob_ssv.batch import VerificationResult, chunked, verify_callbacks
+from admob_ssv.verifiers import EcdsaVerifier, load_key
+
+from .conftest import VALID_CALLBACK
+from .test_views import PUBLIC_KEY_PEM, mock_admob_ssv_keys_server  # noqa: F401
+
+VALID_QUERY_STRING = urllib.parse.urlencode(VALID_CALLBACK)
+
+BASE64_CALLBACK = {
+    "ad_network": 5450213213286189855,
+    "ad_unit": 1234567890,
+    "custom_data": "8b626840-a5bb-4732-a02b-67517d6b9443",
+    "reward_amount": 1,
+    "reward_item": "Boost",
+    "timestamp": 1683939248995,
+    "transaction_id": 123456789,
+    "user_id": "VXNlcjo0Mg==",
+    "signature": "MEQCIGdfQR4eu9bOi3gg069p0ZcH5H-u3etEFQsSJZ4fPU_EAiB75fI8p8uKetMld8_wT3GNPuGnnJYNpHN2ZP9u7bcpiA",
+    "key_id": 3335741209,
+}
+
+
+pytestmark = pytest.mark.usefixtures("cached_public_keys")
+
+
+CALLBACKS = [
+    VALID_QUERY_STRING,
+    {**BASE64_CALLBACK, "unset_field": None},
+    {**VALID_CALLBACK, "custom_data": "tampered"},
+    {**VALID_CALLBACK, "key_id": 42},
+    {key: value for key, value in VALID_CALLBACK.items() if key != "signature"},
+    {key: value for key, value in VALID_CALLBACK.items() if key != "key_id"},
+    {**VALID_CALLBACK, "signature": "!"},
+]
+
+
+@pytest.mark.parametrize("processes", [0, 2])
+def test_verify_callbacks(processes):
+    results = list(verify_callbacks(CALLBACKS, processes=processes, chunk_size=3))
+
+    assert [(result.is_valid, result.error) for result in results] == [
+        (True, None),
+        (True, None),
+        (False, "Invalid signature"),
+        (False, "Unknown key_id"),
+        (False, "Missing signature"),
+        (False, "Missing key_id"),
+        (False, "Invalid signature"),
+    ]
+    assert results[0] == VerificationResult(
+        {key: str(value) for key, value in VALID_CALLBACK.items()}, True
+    )
+    assert results[1].query["user_id"] == "VXNlcjo0Mg=="
+
+
+def test_verify_callbacks_spawns_worker_processes():
+    with mock.patch(
+        "admob_ssv.batch.ProcessPoolExecutor", wraps=ProcessPoolExecutor
+    ) as executor:
+        results = list(verify_callbacks([VALID_QUERY_STRING], processes=1))
+
+    assert results[0].is_valid
+    assert executor.call_args.kwargs["mp_context"].get_start_method() == "spawn"
+
+
+def test_verify_callbacks_streams_its_input():
+    def callbacks():
+        yield VALID_QUERY_STRING
+        yield VALID_QUERY_STRING
+        raise AssertionError("Read past the first chunk")
+
+    results = verify_callbacks(callbacks(), processes=0, chunk_size=2)
+
+    assert next(results).is_valid
+    assert next(results).is_valid
+
+
+def test_chunked():
+    assert list(chunked(range(5), 2)) == [[0, 1], [2, 3], [4]]
+    assert list(chunked([], 2)) == []
+
+
+def test_load_key_parses_each_key_once():
+    load_key.cache_clear()
+
+    with mock.patch.object(
+        EcdsaVerifier, "load_key", side_effect=lambda public_key: object()
+    ) as ecdsa_load_key:
+        verifying_key = load_key("admob_ssv.verifiers.EcdsaVerifier", PUBLIC_KEY_PEM)
+        assert load_key("admob_ssv.verifiers.EcdsaVerifier", PUBLIC_KEY_PEM) is (
+            verifying_key
+        )
+
+    assert ecdsa_load_key.call_count == 1
+    load_key.cache_clear()
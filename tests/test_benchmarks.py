@@ -0,0 +1,50 @@
+import json
+
+import pytest
+
+from benchmarks import handlers, precompute, processes, ssv
+
+
+@pytest.mark.django_db
+def test_ssv_benchmarks(tmp_path):
+    output = tmp_path / "results.json"
+
+    assert ssv.main(["--number", "10", "--repeat", "1", "--output", str(output)]) == 0
+
+    results = json.loads(output.read_text())["results"]
+    assert "get_public_key.cold" in results
+    assert "end_to_end.warm" in results
+
+    args = ["--number", "10", "--repeat", "1", "--baseline", str(output)]
+    assert ssv.main([*args, "--max-slowdown", "1000"]) == 0
+
+
+def test_compare_reports_regressions():
+    baseline = {"stage": {"seconds_per_call": 1.0}}
+
+    assert ssv.compare({"stage": {"seconds_per_call": 1.2}}, baseline, 1.25) == []
+    assert ssv.compare({"stage": {"seconds_per_call": 2.0}}, baseline, 1.25) == [
+        "stage is 2.00x slower than the baseline"
+    ]
+    assert ssv.compare({"other": {"seconds_per_call": 2.0}}, baseline, 1.25) == []
+
+
+def test_precompute_benchmark():
+    results = precompute.main(number=2, repeat=1)
+
+    assert results["precomputed.verify"]["seconds_per_call"] > 0
+    assert results["speedup"] > 0
+
+
+def test_processes_benchmark():
+    results = processes.main(number=2, max_workers=1)
+
+    assert set(results) == {"threads.1", "processes.1"}
+
+
+@pytest.mark.django_db
+def test_handlers_benchmark():
+    results = handlers.main(number=2, repeat=1)
+
+    assert results["wsgi.standalone"]["seconds_per_call"] > 0
+    assert results["asgi.speedup"] > 0
@@ -0,0 +1,65 @@
+import pytest
+
+from admob_ssv.callbacks import SSVCallback
+
+QUERY = {
+    "ad_network": "5450213213286189855",
+    "ad_unit": "1234567890",
+    "custom_data": "customdata42",
+    "reward_amount": "1",
+    "reward_item": "Reward",
+    "timestamp": "1683852940453",
+    "transaction_id": "123456789",
+    "user_id": "userid42",
+    "signature": "MEQCIAhKY5P-aBmjU0iqxtjq2JPzeNKnQ92ZbSPC33Sp4ByeAiBArqhg9_uafB1LCBYVIXWNOW8vVVlocLc81ptROfE44Q",
+    "key_id": "3335741209",
+}
+
+
+def test_ssv_callback_parses_fields():
+    callback = SSVCallback(QUERY)
+
+    assert callback.ad_network == 5450213213286189855
+    assert callback.ad_unit == 1234567890
+    assert callback.custom_data == "customdata42"
+    assert callback.key_id == 3335741209
+    assert callback.reward_amount == 1
+    assert callback.reward_item == "Reward"
+    assert callback.signature == QUERY["signature"]
+    assert callback.timestamp == 1683852940453
+    assert callback.transaction_id == "123456789"
+    assert callback.user_id == "userid42"
+    assert callback.query is QUERY
+
+
+def test_ssv_callback_parses_each_field_once():
+    query = dict(QUERY)
+    callback = SSVCallback(query)
+    timestamp = callback.timestamp
+
+    query["timestamp"] = "0"
+
+    assert callback.timestamp is timestamp
+
+
+def test_ssv_callback_optional_fields():
+    callback = SSVCallback({"transaction_id": "123456789"})
+
+    assert callback.custom_data is None
+    assert callback.user_id is None
+
+
+def test_ssv_callback_is_immutable():
+    callback = SSVCallback(QUERY)
+
+    with pytest.raises(AttributeError):
+        callback.reward_amount = 2
+    with pytest.raises(AttributeError):
+        callback._timestamp = 0
+    with pytest.raises(AttributeError):
+        del callback.timestamp
+    assert not hasattr(callback, "__dict__")
+
+
+def test_ssv_callback_repr():
+    assert repr(SSVCallback(QUERY)) == "<SSVCallback transaction_id='123456789'>"
@@ -0,0 +1,119 @@
+import json
+import urllib.parse
+from datetime import timedelta
+from io import StringIO
+from unittest import mock
+
+import pytest
+from django.core.cache import cache
+from django.core.management import CommandError, call_command
+
+from admob_ssv.deduplication import transaction_ids
+from admob_ssv.journal import JournalWriter
+from admob_ssv.views import AdmobSSVView
+
+from .conftest import VALID_CALLBACK
+
+
+def test_refresh_admob_keys():
+    cache.delete("admob_ssv.public_keys")
+    stdout = StringIO()
+
+    with mock.patch.object(
+        AdmobSSVView, "fetch_public_keys", return_value={"TestKeyId": "TestKey"}
+    ):
+        call_command("refresh_admob_keys", stdout=stdout)
+
+    assert cache.get("admob_ssv.public_keys") == {"TestKeyId": "TestKey"}
+    assert stdout.getvalue() == "Refreshed 1 Admob SSV public key(s)\n"
+
+
+def test_verify_admob_ssv_callbacks(tmp_path, cached_public_keys):
+    path = tmp_path / "callbacks.txt"
+    path.write_text(
+        f"?{urllib.parse.urlencode(VALID_CALLBACK)}\n"
+        "\n"
+        f"{json.dumps({**VALID_CALLBACK, 'custom_data': 'tampered'})}\n"
+    )
+    stdout = StringIO()
+
+    call_command("verify_admob_ssv_callbacks", str(path), processes=0, stdout=stdout)
+
+    assert stdout.getvalue() == (
+        "Invalid signature: transaction_id=123456789\n"
+        "Verified 2 Admob SSV callback(s), 1 of them invalid\n"
+    )
+
+
+def test_warm_admob_keys(cached_public_keys):
+    stdout = StringIO()
+
+    call_command("warm_admob_keys", stdout=stdout)
+
+    assert stdout.getvalue() == "Warmed 1 Admob SSV public key(s)\n"
+
+
+@pytest.mark.django_db
+def test_replay_admob_ssv_journal(tmp_path, cached_public_keys):
+    writer = JournalWriter(str(tmp_path), segment_size=1024)
+    writer.append(urllib.parse.urlencode(VALID_CALLBACK), 1700000000.0, "error")
+    writer.append(
+        urllib.parse.urlencode({**VALID_CALLBACK, "custom_data": "tampered"}),
+        1700000001.0,
+        "error",
+    )
+    writer.append(urllib.parse.urlencode(VALID_CALLBACK), 1700000002.0, "valid")
+    writer.close()
+    stdout = StringIO()
+
+    with mock.patch("admob_ssv.dispatchers.send_valid_admob_ssv") as send:
+        call_command(
+            "replay_admob_ssv_journal",
+            str(tmp_path),
+            outcome=["error"],
+            dispatch=True,
+            processes=0,
+            stdout=stdout,
+        )
+
+    assert stdout.getvalue() == (
+        "Invalid signature: transaction_id=123456789\n"
+        "Replayed 2 Admob SSV callback(s), 1 of them invalid, 1 dispatched, "
+        "0 dispatched before\n"
+    )
+    assert send.call_args[0][0]["user_id"] == "userid42"
+
+
+@pytest.mark.django_db
+def test_replay_admob_ssv_journal_skips_dispatched_transaction_ids(
+    settings, tmp_path, cached_public_keys
+):
+    settings.ADMOB_SSV_TRANSACTION_IDS_CACHE_TIMEOUT = timedelta(minutes=1)
+    settings.ADMOB_SSV_TRANSACTION_IDS_ALLOW_LIST = ()
+    transaction_ids.discard("123456789")
+    writer = JournalWriter(str(tmp_path), segment_size=1024)
+    writer.append(urllib.parse.urlencode(VALID_CALLBACK), 1700000000.0, "error")
+    writer.append(urllib.parse.urlencode(VALID_CALLBACK), 1700000001.0, "error")
+    writer.close()
+    stdout = StringIO()
+
+    with mock.patch("admob_ssv.dispatchers.send_valid_admob_ssv") as send:
+        call_command(
+            "replay_admob_ssv_journal",
+            str(tmp_path),
+            outcome=["error"],
+            dispatch=True,
+            processes=0,
+            stdout=stdout,
+        )
+
+    assert stdout.getvalue() == (
+        "Replayed 2 Admob SSV callback(s), 0 of them invalid, 1 dispatched, "
+        "1 dispatched before\n"
+    )
+    assert send.call_count == 1
+
+
+def test_replay_admob_ssv_journal_requires_outcome_to_dispatch(tmp_path):
+    with pytest.raises(CommandError, match="--dispatch requires --outcome"):
+        call_command("replay_admob_ssv_journal", str(tmp_path), dispatch=True)
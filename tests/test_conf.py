@@ -16,6 +16,46 @@ def test_settings_keys_server_url_override(settings):
     assert admob_ssv_settings.keys_server_url == "https://example.com/keys.json"
 
 
+def test_settings_keys_server_connect_timeout_default(settings):
+    del settings.ADMOB_SSV_KEYS_SERVER_CONNECT_TIMEOUT
+    assert admob_ssv_settings.keys_server_connect_timeout == timedelta(seconds=3)
+
+
+def test_settings_keys_server_connect_timeout_override(settings):
+    settings.ADMOB_SSV_KEYS_SERVER_CONNECT_TIMEOUT = timedelta(seconds=1)
+    assert admob_ssv_settings.keys_server_connect_timeout == timedelta(seconds=1)
+
+
+def test_settings_keys_server_read_timeout_default(settings):
+    del settings.ADMOB_SSV_KEYS_SERVER_READ_TIMEOUT
+    assert admob_ssv_settings.keys_server_read_timeout == timedelta(seconds=10)
+
+
+def test_settings_keys_server_read_timeout_override(settings):
+    settings.ADMOB_SSV_KEYS_SERVER_READ_TIMEOUT = timedelta(seconds=5)
+    assert admob_ssv_settings.keys_server_read_timeout == timedelta(seconds=5)
+
+
+def test_settings_keys_server_retries_default(settings):
+    del settings.ADMOB_SSV_KEYS_SERVER_RETRIES
+    assert admob_ssv_settings.keys_server_retries == 2
+
+
+def test_settings_keys_server_retries_override(settings):
+    settings.ADMOB_SSV_KEYS_SERVER_RETRIES = 0
+    assert admob_ssv_settings.keys_server_retries == 0
+
+
+def test_settings_keys_server_retry_backoff_default(settings):
+    del settings.ADMOB_SSV_KEYS_SERVER_RETRY_BACKOFF
+    assert admob_ssv_settings.keys_server_retry_backoff == timedelta(milliseconds=500)
+
+
+def test_settings_keys_server_retry_backoff_override(settings):
+    settings.ADMOB_SSV_KEYS_SERVER_RETRY_BACKOFF = timedelta(seconds=1)
+    assert admob_ssv_settings.keys_server_retry_backoff == timedelta(seconds=1)
+
+
 def test_settings_keys_cache_timeout_default(settings):
     del settings.ADMOB_SSV_KEYS_CACHE_TIMEOUT
     assert admob_ssv_settings.keys_cache_timeout == timedelta(days=1)
@@ -34,3 +74,151 @@ def test_settings_keys_cache_key_default(settings):
 def test_settings_keys_cache_key_override(settings):
     settings.ADMOB_SSV_KEYS_CACHE_KEY = "custom_cache_key"
     assert admob_ssv_settings.keys_cache_key == "custom_cache_key"
+
+
+def test_settings_verifying_keys_cache_size_default(settings):
+    del settings.ADMOB_SSV_VERIFYING_KEYS_CACHE_SIZE
+    assert admob_ssv_settings.verifying_keys_cache_size == 16
+
+
+def test_settings_verifying_keys_cache_size_override(settings):
+    settings.ADMOB_SSV_VERIFYING_KEYS_CACHE_SIZE = 4
+    assert admob_ssv_settings.verifying_keys_cache_size == 4
+
+
+def test_settings_verifier_backend_default(settings):
+    del settings.ADMOB_SSV_VERIFIER_BACKEND
+    assert admob_ssv_settings.verifier_backend == "admob_ssv.verifiers.EcdsaVerifier"
+
+
+def test_settings_verifier_backend_override(settings):
+    settings.ADMOB_SSV_VERIFIER_BACKEND = "admob_ssv.verifiers.CryptographyVerifier"
+    assert (
+        admob_ssv_settings.verifier_backend
+        == "admob_ssv.verifiers.CryptographyVerifier"
+    )
+
+
+def test_settings_keys_local_cache_timeout_default(settings):
+    del settings.ADMOB_SSV_KEYS_LOCAL_CACHE_TIMEOUT
+    assert admob_ssv_settings.keys_local_cache_timeout == timedelta(minutes=1)
+
+
+def test_settings_keys_local_cache_timeout_override(settings):
+    settings.ADMOB_SSV_KEYS_LOCAL_CACHE_TIMEOUT = timedelta(seconds=10)
+    assert admob_ssv_settings.keys_local_cache_timeout == timedelta(seconds=10)
+
+
+def test_settings_keys_fetch_lock_timeout_default(settings):
+    del settings.ADMOB_SSV_KEYS_FETCH_LOCK_TIMEOUT
+    assert admob_ssv_settings.keys_fetch_lock_timeout is None
+
+
+def test_settings_keys_fetch_lock_timeout_override(settings):
+    settings.ADMOB_SSV_KEYS_FETCH_LOCK_TIMEOUT = timedelta(seconds=10)
+    assert admob_ssv_settings.keys_fetch_lock_timeout == timedelta(seconds=10)
+
+
+def test_settings_keys_refresh_interval_default(settings):
+    del settings.ADMOB_SSV_KEYS_REFRESH_INTERVAL
+    assert admob_ssv_settings.keys_refresh_interval == timedelta(minutes=1)
+
+
+def test_settings_keys_refresh_interval_override(settings):
+    settings.ADMOB_SSV_KEYS_REFRESH_INTERVAL = timedelta(minutes=5)
+    assert admob_ssv_settings.keys_refresh_interval == timedelta(minutes=5)
+
+
+def test_settings_unknown_key_ids_cache_timeout_default(settings):
+    del settings.ADMOB_SSV_UNKNOWN_KEY_IDS_CACHE_TIMEOUT
+    assert admob_ssv_settings.unknown_key_ids_cache_timeout == timedelta(minutes=10)
+
+
+def test_settings_unknown_key_ids_cache_timeout_override(settings):
+    settings.ADMOB_SSV_UNKNOWN_KEY_IDS_CACHE_TIMEOUT = timedelta(hours=1)
+    assert admob_ssv_settings.unknown_key_ids_cache_timeout == timedelta(hours=1)
+
+
+def test_settings_keys_stale_timeout_default(settings):
+    del settings.ADMOB_SSV_KEYS_STALE_TIMEOUT
+    assert admob_ssv_settings.keys_stale_timeout == timedelta(days=1)
+
+
+def test_settings_keys_stale_timeout_override(settings):
+    settings.ADMOB_SSV_KEYS_STALE_TIMEOUT = timedelta(days=7)
+    assert admob_ssv_settings.keys_stale_timeout == timedelta(days=7)
+
+
+def test_settings_keys_background_refresh_interval_default(settings):
+    del settings.ADMOB_SSV_KEYS_BACKGROUND_REFRESH_INTERVAL
+    assert admob_ssv_settings.keys_background_refresh_interval is None
+
+
+def test_settings_keys_background_refresh_interval_override(settings):
+    settings.ADMOB_SSV_KEYS_BACKGROUND_REFRESH_INTERVAL = timedelta(hours=12)
+    assert admob_ssv_settings.keys_background_refresh_interval == timedelta(hours=12)
+
+
+def test_settings_async_verification_threads_default(settings):
+    del settings.ADMOB_SSV_ASYNC_VERIFICATION_THREADS
+    assert admob_ssv_settings.async_verification_threads == 4
+
+
+def test_settings_async_verification_threads_override(settings):
+    settings.ADMOB_SSV_ASYNC_VERIFICATION_THREADS = 8
+    assert admob_ssv_settings.async_verification_threads == 8
+
+
+def test_settings_dispatcher_backend_default(settings):
+    del settings.ADMOB_SSV_DISPATCHER_BACKEND
+    assert (
+        admob_ssv_settings.dispatcher_backend == "admob_ssv.dispatchers.SyncDispatcher"
+    )
+
+
+def test_settings_dispatcher_backend_override(settings):
+    settings.ADMOB_SSV_DISPATCHER_BACKEND = "admob_ssv.dispatchers.ThreadPoolDispatcher"
+    assert (
+        admob_ssv_settings.dispatcher_backend
+        == "admob_ssv.dispatchers.ThreadPoolDispatcher"
+    )
+
+
+def test_settings_dispatcher_threads_default(settings):
+    del settings.ADMOB_SSV_DISPATCHER_THREADS
+    assert admob_ssv_settings.dispatcher_threads == 4
+
+
+def test_settings_dispatcher_threads_override(settings):
+    settings.ADMOB_SSV_DISPATCHER_THREADS = 8
+    assert admob_ssv_settings.dispatcher_threads == 8
+
+
+def test_settings_dispatcher_task_default(settings):
+    del settings.ADMOB_SSV_DISPATCHER_TASK
+    assert admob_ssv_settings.dispatcher_task is None
+
+
+def test_settings_dispatcher_task_override(settings):
+    settings.ADMOB_SSV_DISPATCHER_TASK = "my_app.tasks.dispatch_admob_ssv"
+    assert admob_ssv_settings.dispatcher_task == "my_app.tasks.dispatch_admob_ssv"
+
+
+def test_settings_transaction_ids_cache_timeout_default(settings):
+    del settings.ADMOB_SSV_TRANSACTION_IDS_CACHE_TIMEOUT
+    assert admob_ssv_settings.transaction_ids_cache_timeout is None
+
+
+def test_settings_transaction_ids_cache_timeout_override(settings):
+    settings.ADMOB_SSV_TRANSACTION_IDS_CACHE_TIMEOUT = timedelta(days=7)
+    assert admob_ssv_settings.transaction_ids_cache_timeout == timedelta(days=7)
+
+
+def test_settings_transaction_ids_allow_list_default(settings):
+    del settings.ADMOB_SSV_TRANSACTION_IDS_ALLOW_LIST
+    assert admob_ssv_settings.transaction_ids_allow_list == ("123456789",)
+
+
+def test_settings_transaction_ids_allow_list_override(settings):
+    settings.ADMOB_SSV_TRANSACTION_IDS_ALLOW_LIST = ["42"]
+    assert admob_ssv_settings.transaction_ids_allow_list == ["42"]
@@ -0,0 +1,118 @@
+import random
+import urllib.parse
+
+import pytest
+
+from admob_ssv.views import AdmobSSVView
+
+SIGNATURE = "MEQCIAhKY5P-aBmjU0iqxtjq2JPzeNKnQ92ZbSPC33Sp4ByeAiBArqhg9_uafB1LCBYVIXWNOW8vVVlocLc81ptROfE44Q"
+
+NAME_ALPHABET = [
+    "a",
+    "b",
+    "_",
+    "+",
+    " ",
+    "%20",
+    "%2B",
+    "%41",
+    "ä",
+    "signature",
+    "key_id",
+]
+
+VALUE_ALPHABET = ["1", "x", "Y", "-", "=", "+", " ", "%20", "%2B", "%3D", "%E2%82%AC"]
+
+# Names and values which don't need any decoding, as sent by Admob.
+PLAIN_NAME_ALPHABET = ["a", "b", "c", "_", "ä"]
+
+PLAIN_VALUE_ALPHABET = ["1", "x", "Y", "-", "=", "+", "ä"]
+
+
+def reference_unverified_content(query_string: str) -> bytes:
+    # The canonicalization used before the fast path was introduced.
+    query_data = urllib.parse.parse_qs(query_string)
+    query_data.pop("signature", None)
+    query_data.pop("key_id", None)
+
+    sorted_query_data = sorted(query_data.items())
+    sorted_query_string = urllib.parse.urlencode(sorted_query_data, doseq=True)
+    return urllib.parse.unquote(sorted_query_string).encode("utf-8")
+
+
+def random_field(rng: random.Random) -> str:
+    name = "".join(rng.choices(NAME_ALPHABET, k=rng.randint(0, 3)))
+    value = "".join(rng.choices(VALUE_ALPHABET, k=rng.randint(0, 3)))
+    return rng.choice([f"{name}={value}", f"{name}={value}", name])
+
+
+def random_query_string(rng: random.Random) -> str:
+    if rng.random() < 0.5:
+        # Callbacks in the form and order sent by Admob.
+        query_data = {
+            "".join(rng.choices(PLAIN_NAME_ALPHABET, k=rng.randint(1, 3))): "".join(
+                rng.choices(PLAIN_VALUE_ALPHABET, k=rng.randint(1, 3))
+            )
+            for _ in range(rng.randint(0, 6))
+        }
+        fields = [f"{name}={value}" for name, value in sorted(query_data.items())]
+    else:
+        fields = [random_field(rng) for _ in range(rng.randint(0, 6))]
+
+    fields += [f"signature={SIGNATURE}", "key_id=3335741209"]
+
+    if rng.random() < 0.2:
+        rng.shuffle(fields)
+
+    return "&".join(fields)
+
+
+def get_unverified_content(rf, query_string: str) -> bytes:
+    request = rf.get("/admob-ssv/")
+    request.META["QUERY_STRING"] = query_string
+    return AdmobSSVView().get_unverified_content(request)
+
+
+@pytest.mark.parametrize(
+    "query_string",
+    [
+        f"ad_network=5450213213286189855&ad_unit=1234567890&custom_data=customdata42&reward_amount=1&reward_item=Reward&timestamp=1683852940453&transaction_id=123456789&user_id=userid42&signature={SIGNATURE}&key_id=3335741209",
+        f"custom_data=TEMPERED+CUSTOM+DATA&reward_amount=1&signature={SIGNATURE}&key_id=3335741209",
+        f"custom_data=a%20b&reward_amount=1&signature={SIGNATURE}&key_id=3335741209",
+        f"custom_data=a b&reward_amount=1&signature={SIGNATURE}&key_id=3335741209",
+        f"reward_amount=1&custom_data=x&signature={SIGNATURE}&key_id=3335741209",
+        f"custom_data=&reward_amount=1&signature={SIGNATURE}&key_id=3335741209",
+        f"a=1&a=2&signature={SIGNATURE}&key_id=3335741209",
+        f"a=1&signature={SIGNATURE}&key_id=3335741209&b=2",
+        f"signature=x&a=1&signature={SIGNATURE}&key_id=3335741209",
+        f"key_id=1&a=1&signature={SIGNATURE}&key_id=3335741209",
+        f"signature={SIGNATURE}&key_id=3335741209",
+        "a=1&b=2",
+        "",
+    ],
+)
+def test_get_unverified_content_matches_reference(rf, query_string):
+    assert get_unverified_content(rf, query_string) == reference_unverified_content(
+        query_string
+    )
+
+
+def test_get_unverified_content_matches_reference_for_random_query_strings(rf):
+    rng = random.Random(random.getrandbits(32))
+
+    for _ in range(2000):
+        query_string = random_query_string(rng)
+        assert get_unverified_content(rf, query_string) == reference_unverified_content(
+            query_string
+        ), query_string
+
+
+def test_get_unverified_content_slices_ordered_query_strings(rf):
+    query_string = f"a=1&b=2&signature={SIGNATURE}&key_id=3335741209"
+
+    view = AdmobSSVView()
+    view.get_sorted_unverified_content = None
+    request = rf.get("/admob-ssv/")
+    request.META["QUERY_STRING"] = query_string
+
+    assert view.get_unverified_content(request) == b"a=1&b=2"
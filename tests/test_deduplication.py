@@ -0,0 +1,153 @@
+from datetime import timedelta
+from unittest import mock
+
+import pytest
+from asgiref.sync import async_to_sync
+from django.core.cache import cache
+
+from admob_ssv.deduplication import TransactionIdStore, transaction_ids
+from admob_ssv.views import AdmobSSVView, AsyncAdmobSSVView
+
+from .conftest import VALID_CALLBACK
+
+
+@pytest.fixture(autouse=True)
+def deduplication(settings):
+    settings.ADMOB_SSV_TRANSACTION_IDS_CACHE_TIMEOUT = timedelta(days=1)
+    # The signed test callbacks all carry Admob's test transaction_id.
+    settings.ADMOB_SSV_TRANSACTION_IDS_ALLOW_LIST = []
+    cache.clear()
+
+
+# Requested after the autouse fixture, so that it isn't cleared.
+pytestmark = pytest.mark.usefixtures("cached_public_keys")
+
+
+def test_transaction_id_store_add_and_contains():
+    store = TransactionIdStore()
+    assert not store.contains("abc")
+    assert store.add("abc")
+    assert store.contains("abc")
+    assert not store.add("abc")
+
+
+def test_transaction_id_store_checks_shared_cache():
+    TransactionIdStore().add("abc")
+
+    store = TransactionIdStore()
+    assert not store.contains_locally("abc")
+    assert store.contains("abc")
+    assert store.contains_locally("abc")
+
+
+def test_transaction_id_store_discard():
+    store = TransactionIdStore()
+    store.add("abc")
+    store.discard("abc")
+    assert not store.contains("abc")
+
+
+def test_transaction_id_store_is_bounded():
+    store = TransactionIdStore()
+    store.max_size = 2
+
+    for transaction_id in ["a", "b", "c"]:
+        store.add_locally(transaction_id)
+
+    assert not store.contains_locally("a")
+    assert store.contains_locally("c")
+
+
+def test_transaction_id_store_disabled(settings):
+    settings.ADMOB_SSV_TRANSACTION_IDS_CACHE_TIMEOUT = None
+    store = TransactionIdStore()
+    assert store.add("abc")
+    assert store.add("abc")
+    assert not store.contains("abc")
+    store.discard("abc")
+
+
+def test_transaction_id_store_allow_list(settings):
+    settings.ADMOB_SSV_TRANSACTION_IDS_ALLOW_LIST = ["123456789"]
+    store = TransactionIdStore()
+    assert store.add("123456789")
+    assert store.add("123456789")
+    assert not store.contains("123456789")
+
+
+def test_transaction_id_store_async():
+    store = TransactionIdStore()
+    assert not async_to_sync(store.acontains)("abc")
+    assert async_to_sync(store.aadd)("abc")
+    assert not async_to_sync(store.aadd)("abc")
+
+    store.clear()
+    assert async_to_sync(store.acontains)("abc")
+
+    async_to_sync(store.adiscard)("abc")
+    assert not async_to_sync(store.acontains)("abc")
+
+
+@pytest.mark.django_db
+def test_get_skips_retried_callbacks(client):
+    with mock.patch.object(AdmobSSVView, "handle_valid_ssv") as handle_valid_ssv:
+        assert client.get("/admob-ssv/", VALID_CALLBACK).status_code == 200
+
+        with mock.patch.object(AdmobSSVView, "verify_signature") as verify_signature:
+            assert client.get("/admob-ssv/", VALID_CALLBACK).status_code == 200
+
+    assert handle_valid_ssv.call_count == 1
+    assert not verify_signature.called
+
+
+def test_get_does_not_record_invalid_callbacks(client):
+    data = {**VALID_CALLBACK, "custom_data": "TEMPERED CUSTOM DATA"}
+
+    assert client.get("/admob-ssv/", data).status_code == 400
+    assert not transaction_ids.contains("123456789")
+
+
+def test_get_skips_concurrently_handled_callbacks(client):
+    transaction_ids.add("123456789")
+
+    with (
+        mock.patch.object(AdmobSSVView, "handle_valid_ssv") as handle_valid_ssv,
+        mock.patch.object(transaction_ids, "contains", return_value=False),
+    ):
+        assert client.get("/admob-ssv/", VALID_CALLBACK).status_code == 200
+
+    assert not handle_valid_ssv.called
+
+
+def test_get_forgets_callbacks_whose_handling_failed(client):
+    with (
+        mock.patch.object(AdmobSSVView, "handle_valid_ssv", side_effect=RuntimeError),
+        pytest.raises(RuntimeError),
+    ):
+        client.get("/admob-ssv/", VALID_CALLBACK)
+
+    assert not transaction_ids.contains("123456789")
+
+
+@pytest.mark.django_db
+def test_async_get_skips_retried_callbacks(async_client):
+    with mock.patch.object(AsyncAdmobSSVView, "ahandle_valid_ssv") as handle_valid_ssv:
+        response = async_to_sync(async_client.get)("/admob-ssv-async/", VALID_CALLBACK)
+        assert response.status_code == 200
+
+        response = async_to_sync(async_client.get)("/admob-ssv-async/", VALID_CALLBACK)
+        assert response.status_code == 200
+
+    assert handle_valid_ssv.call_count == 1
+
+
+def test_async_get_forgets_callbacks_whose_handling_failed(async_client):
+    with (
+        mock.patch.object(
+            AsyncAdmobSSVView, "ahandle_valid_ssv", side_effect=RuntimeError
+        ),
+        pytest.raises(RuntimeError),
+    ):
+        async_to_sync(async_client.get)("/admob-ssv-async/", VALID_CALLBACK)
+
+    assert not transaction_ids.contains("123456789")
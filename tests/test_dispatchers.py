@@ -0,0 +1,228 @@
+import threading
+from datetime import timedelta
+from io import StringIO
+from unittest import mock
+
+import pytest
+from asgiref.sync import async_to_sync
+from django.core.management import call_command
+from django.utils import timezone
+
+from admob_ssv.callbacks import SSVCallback
+from admob_ssv.dispatchers import (
+    CeleryDispatcher,
+    DatabaseOutboxDispatcher,
+    SyncDispatcher,
+    ThreadPoolDispatcher,
+    get_dispatcher,
+    process_outbox,
+)
+from admob_ssv.models import OutboxEntry
+from admob_ssv.signals import valid_admob_ssv
+
+QUERY = {"transaction_id": "123456789", "user_id": "userid42"}
+
+fake_task = mock.Mock()
+
+
+@pytest.fixture
+def receiver():
+    receiver = mock.Mock()
+    valid_admob_ssv.connect(receiver, weak=False)
+    yield receiver
+    valid_admob_ssv.disconnect(receiver)
+
+
+@pytest.fixture(autouse=True)
+def disconnect_store_verification():
+    from tests.project.verifications.signals import store_verification
+
+    valid_admob_ssv.disconnect(store_verification)
+    yield
+    valid_admob_ssv.connect(store_verification)
+
+
+def test_sync_dispatcher(receiver):
+    SyncDispatcher().dispatch(QUERY)
+    receiver.assert_called_once_with(
+        signal=valid_admob_ssv, sender=None, query=QUERY, callback=mock.ANY
+    )
+
+
+def test_sync_dispatcher_adispatch(receiver):
+    async_to_sync(SyncDispatcher().adispatch)(QUERY)
+    receiver.assert_called_once_with(
+        signal=valid_admob_ssv, sender=None, query=QUERY, callback=mock.ANY
+    )
+
+
+def test_thread_pool_dispatcher(receiver):
+    dispatched = threading.Event()
+    receiver.side_effect = lambda **kwargs: dispatched.set()
+
+    ThreadPoolDispatcher().dispatch(QUERY)
+
+    assert dispatched.wait(5)
+    receiver.assert_called_once_with(
+        signal=valid_admob_ssv, sender=None, query=QUERY, callback=mock.ANY
+    )
+
+
+def test_thread_pool_dispatcher_closes_old_connections(receiver):
+    dispatcher = ThreadPoolDispatcher()
+
+    with mock.patch("admob_ssv.dispatchers.close_old_connections") as close:
+        dispatcher.dispatch(QUERY)
+        dispatcher.executor.shutdown(wait=True)
+
+    assert receiver.called
+    assert close.call_count == 2
+
+
+def test_thread_pool_dispatcher_logs_exceptions(receiver, caplog):
+    receiver.side_effect = RuntimeError
+    dispatcher = ThreadPoolDispatcher()
+
+    async_to_sync(dispatcher.adispatch)(QUERY)
+    dispatcher.executor.shutdown(wait=True)
+
+    assert "Dispatching a valid Admob SSV callback failed" in caplog.text
+
+
+@pytest.mark.django_db
+def test_database_outbox_dispatcher(receiver):
+    DatabaseOutboxDispatcher().dispatch(QUERY)
+
+    assert not receiver.called
+    assert OutboxEntry.objects.get().query == QUERY
+
+
+@pytest.mark.django_db
+def test_database_outbox_dispatcher_adispatch(receiver):
+    async_to_sync(DatabaseOutboxDispatcher().adispatch)(QUERY)
+
+    assert OutboxEntry.objects.get().query == QUERY
+
+
+@pytest.mark.django_db
+def test_process_outbox(receiver):
+    OutboxEntry.objects.create(query={"transaction_id": "1"})
+    OutboxEntry.objects.create(query={"transaction_id": "2"})
+    OutboxEntry.objects.create(query={"transaction_id": "3"})
+
+    assert process_outbox(limit=2) == 2
+    assert receiver.call_args_list == [
+        mock.call(
+            signal=valid_admob_ssv,
+            sender=None,
+            query={"transaction_id": "1"},
+            callback=mock.ANY,
+        ),
+        mock.call(
+            signal=valid_admob_ssv,
+            sender=None,
+            query={"transaction_id": "2"},
+            callback=mock.ANY,
+        ),
+    ]
+    assert OutboxEntry.objects.count() == 1
+
+    assert process_outbox() == 1
+    assert not OutboxEntry.objects.exists()
+
+
+@pytest.mark.django_db
+def test_process_outbox_skips_failed_entries(receiver, caplog):
+    def fail_on_poison(query, **kwargs):
+        if query["transaction_id"] == "poison":
+            raise RuntimeError
+
+    receiver.side_effect = fail_on_poison
+    poison = OutboxEntry.objects.create(query={"transaction_id": "poison"})
+    for transaction_id in ("1", "2", "3"):
+        OutboxEntry.objects.create(query={"transaction_id": transaction_id})
+
+    assert process_outbox() == 3
+    assert list(OutboxEntry.objects.all()) == [poison]
+    assert f"Dispatching {poison} failed" in caplog.messages
+
+    poison.refresh_from_db()
+    assert poison.attempts == 1
+    assert poison.available_at > timezone.now() + timedelta(seconds=50)
+
+    assert process_outbox() == 0
+    assert receiver.call_count == 4
+
+
+@pytest.mark.django_db
+def test_process_outbox_gives_up_after_max_attempts(receiver, settings):
+    settings.ADMOB_SSV_OUTBOX_RETRY_DELAY = timedelta(0)
+    settings.ADMOB_SSV_OUTBOX_MAX_ATTEMPTS = 3
+    receiver.side_effect = RuntimeError
+    OutboxEntry.objects.create(query=QUERY)
+
+    assert process_outbox() == 0
+    assert receiver.call_count == 3
+    assert OutboxEntry.objects.get().attempts == 3
+
+    assert process_outbox() == 0
+    assert receiver.call_count == 3
+
+
+@pytest.mark.django_db
+def test_process_admob_ssv_outbox_command(receiver):
+    OutboxEntry.objects.create(query=QUERY)
+    stdout = StringIO()
+
+    call_command("process_admob_ssv_outbox", stdout=stdout)
+
+    assert receiver.call_count == 1
+    assert stdout.getvalue() == "Dispatched 1 Admob SSV callback(s)\n"
+
+
+def test_celery_dispatcher(settings):
+    settings.ADMOB_SSV_DISPATCHER_TASK = "tests.test_dispatchers.fake_task"
+
+    CeleryDispatcher().dispatch(QUERY)
+
+    fake_task.delay.assert_called_once_with(QUERY)
+
+
+def test_get_dispatcher_uses_configured_backend(settings):
+    settings.ADMOB_SSV_DISPATCHER_BACKEND = "admob_ssv.dispatchers.SyncDispatcher"
+    assert isinstance(get_dispatcher(), SyncDispatcher)
+    assert get_dispatcher() is get_dispatcher()
+
+
+@pytest.mark.django_db
+def test_view_dispatches_using_configured_backend(client, settings, cached_public_keys):
+    settings.ADMOB_SSV_DISPATCHER_BACKEND = (
+        "admob_ssv.dispatchers.DatabaseOutboxDispatcher"
+    )
+
+    response = client.get(
+        path="/admob-ssv/",
+        data={
+            "ad_network": 5450213213286189855,
+            "ad_unit": 1234567890,
+            "custom_data": "customdata42",
+            "reward_amount": 1,
+            "reward_item": "Reward",
+            "timestamp": 1683852940453,
+            "transaction_id": 123456789,
+            "user_id": "userid42",
+            "signature": "MEQCIAhKY5P-aBmjU0iqxtjq2JPzeNKnQ92ZbSPC33Sp4ByeAiBArqhg9_uafB1LCBYVIXWNOW8vVVlocLc81ptROfE44Q",
+            "key_id": 3335741209,
+        },
+    )
+
+    assert response.status_code == 200
+    assert OutboxEntry.objects.get().query["transaction_id"] == "123456789"
+
+
+def test_send_valid_admob_ssv_sends_callback(receiver):
+    SyncDispatcher().dispatch(QUERY)
+
+    callback = receiver.call_args.kwargs["callback"]
+    assert isinstance(callback, SSVCallback)
+    assert callback.query is QUERY
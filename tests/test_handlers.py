@@ -0,0 +1,255 @@
+import io
+import urllib.parse
+from unittest import mock
+
+import pytest
+from asgiref.sync import async_to_sync
+from django.core.signals import request_finished, request_started
+
+from admob_ssv.handlers import (
+    AdmobSSVASGIHandler,
+    AdmobSSVWSGIHandler,
+    CallbackRequest,
+)
+from admob_ssv.signals import valid_admob_ssv
+from tests.project.verifications.models import Verification
+
+from .conftest import VALID_CALLBACK
+
+QUERY_STRING = urllib.parse.urlencode(VALID_CALLBACK)
+
+
+pytestmark = pytest.mark.usefixtures("cached_public_keys")
+
+
+def call_wsgi(handler, path="/admob-ssv/", query_string=QUERY_STRING, method="GET"):
+    response = {}
+
+    def start_response(status, headers):
+        response["status"] = status
+        response["headers"] = dict(headers)
+
+    environ = {
+        "REQUEST_METHOD": method,
+        "PATH_INFO": path,
+        "QUERY_STRING": query_string,
+        "wsgi.input": io.BytesIO(),
+    }
+    response["content"] = b"".join(handler(environ, start_response))
+    return response
+
+
+def call_asgi(handler, scope):
+    messages = []
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        messages.append(message)
+
+    async_to_sync(handler)(scope, receive, send)
+    return messages
+
+
+def get_scope(path="/admob-ssv/", query_string=QUERY_STRING, method="GET"):
+    return {
+        "type": "http",
+        "method": method,
+        "path": path,
+        "query_string": query_string.encode("ascii"),
+    }
+
+
+def test_callback_request():
+    request = CallbackRequest("a=1&b=&a=2")
+
+    assert request.META["QUERY_STRING"] == "a=1&b=&a=2"
+    assert request.GET == {"a": "2", "b": ""}
+    assert request.GET.dict() == {"a": "2", "b": ""}
+    assert type(request.GET.dict()) is dict
+    assert request.GET is request.GET
+
+
+@pytest.mark.django_db
+def test_wsgi_handler_with_valid_callback():
+    received = []
+
+    def receiver(sender, query, callback, **kwargs):
+        received.append(callback)
+
+    valid_admob_ssv.connect(receiver)
+    try:
+        response = call_wsgi(AdmobSSVWSGIHandler())
+    finally:
+        valid_admob_ssv.disconnect(receiver)
+
+    assert response["status"] == "200 OK"
+    assert response["headers"]["Content-Length"] == "0"
+    assert received[0].user_id == "userid42"
+    assert Verification.objects.filter(transaction_id="123456789").exists()
+
+
+@pytest.mark.django_db
+def test_wsgi_handler_with_invalid_signature():
+    query_string = urllib.parse.urlencode({**VALID_CALLBACK, "custom_data": "x"})
+    response = call_wsgi(AdmobSSVWSGIHandler(), query_string=query_string)
+
+    assert response["status"] == "400 Bad Request"
+    assert response["content"] == b"Invalid signature"
+
+
+@pytest.mark.django_db
+def test_wsgi_handler_with_missing_signature():
+    response = call_wsgi(AdmobSSVWSGIHandler(), query_string="key_id=3335741209")
+
+    assert response["status"] == "400 Bad Request"
+    assert response["content"] == b"Missing signature"
+
+
+def test_wsgi_handler_rejects_other_methods():
+    response = call_wsgi(AdmobSSVWSGIHandler(), method="POST")
+
+    assert response["status"] == "405 Method Not Allowed"
+    assert response["headers"]["Allow"] == "GET"
+
+
+def test_wsgi_handler_passes_other_paths_on():
+    application = mock.Mock(return_value=[b"Django"])
+    handler = AdmobSSVWSGIHandler(application)
+
+    assert call_wsgi(handler, path="/admin/")["content"] == b"Django"
+    assert application.call_args[0][0]["PATH_INFO"] == "/admin/"
+
+
+def test_wsgi_handler_without_application():
+    response = call_wsgi(AdmobSSVWSGIHandler(), path="/admin/")
+
+    assert response["status"] == "404 Not Found"
+
+
+@pytest.mark.django_db
+def test_asgi_handler_with_valid_callback():
+    messages = call_asgi(AdmobSSVASGIHandler(), get_scope())
+
+    assert messages[0]["type"] == "http.response.start"
+    assert messages[0]["status"] == 200
+    assert (b"content-length", b"0") in messages[0]["headers"]
+    assert messages[1] == {"type": "http.response.body", "body": b""}
+    assert Verification.objects.filter(transaction_id="123456789").exists()
+
+
+@pytest.mark.django_db
+def test_asgi_handler_with_invalid_signature():
+    query_string = urllib.parse.urlencode({**VALID_CALLBACK, "custom_data": "x"})
+    messages = call_asgi(AdmobSSVASGIHandler(), get_scope(query_string=query_string))
+
+    assert messages[0]["status"] == 400
+    assert messages[1]["body"] == b"Invalid signature"
+
+
+def test_asgi_handler_rejects_other_methods():
+    messages = call_asgi(AdmobSSVASGIHandler(), get_scope(method="POST"))
+
+    assert messages[0]["status"] == 405
+    assert (b"allow", b"GET") in messages[0]["headers"]
+
+
+def test_asgi_handler_passes_other_paths_on():
+    application = mock.AsyncMock()
+    handler = AdmobSSVASGIHandler(application)
+
+    call_asgi(handler, get_scope(path="/admin/"))
+
+    assert application.call_args[0][0]["path"] == "/admin/"
+
+
+def test_asgi_handler_without_application():
+    messages = call_asgi(AdmobSSVASGIHandler(), get_scope(path="/admin/"))
+
+    assert messages[0]["status"] == 404
+
+
+def test_asgi_handler_acknowledges_lifespan_events():
+    events = [{"type": "lifespan.startup"}, {"type": "lifespan.shutdown"}]
+    messages = []
+
+    async def receive():
+        return events.pop(0)
+
+    async def send(message):
+        messages.append(message)
+
+    async_to_sync(AdmobSSVASGIHandler())({"type": "lifespan"}, receive, send)
+
+    assert messages == [
+        {"type": "lifespan.startup.complete"},
+        {"type": "lifespan.shutdown.complete"},
+    ]
+
+
+@pytest.mark.django_db
+def test_wsgi_handler_sends_request_signals():
+    handler = AdmobSSVWSGIHandler()
+    started, finished = mock.Mock(), mock.Mock()
+    request_started.connect(started)
+    request_finished.connect(finished)
+    try:
+        call_wsgi(handler, query_string="key_id=3335741209")
+    finally:
+        request_started.disconnect(started)
+        request_finished.disconnect(finished)
+
+    assert started.call_args.kwargs["sender"] is AdmobSSVWSGIHandler
+    assert started.call_args.kwargs["environ"]["PATH_INFO"] == "/admob-ssv/"
+    assert finished.call_count == 1
+
+
+@pytest.mark.django_db
+def test_wsgi_handler_turns_errors_into_server_errors(caplog):
+    view = mock.Mock()
+    view.get.side_effect = ConnectionError
+    finished = mock.Mock()
+    request_finished.connect(finished)
+    try:
+        response = call_wsgi(AdmobSSVWSGIHandler(view=view))
+    finally:
+        request_finished.disconnect(finished)
+
+    assert response["status"] == "500 Internal Server Error"
+    assert finished.call_count == 1
+    assert caplog.records[-1].name == "django.request"
+    assert caplog.records[-1].exc_info[0] is ConnectionError
+
+
+@pytest.mark.django_db
+def test_asgi_handler_sends_request_signals():
+    started, finished = mock.Mock(), mock.Mock()
+    request_started.connect(started)
+    request_finished.connect(finished)
+    try:
+        call_asgi(AdmobSSVASGIHandler(), get_scope(query_string="key_id=3335741209"))
+    finally:
+        request_started.disconnect(started)
+        request_finished.disconnect(finished)
+
+    assert started.call_args.kwargs["sender"] is AdmobSSVASGIHandler
+    assert started.call_args.kwargs["scope"]["path"] == "/admob-ssv/"
+    assert finished.call_count == 1
+
+
+@pytest.mark.django_db
+def test_asgi_handler_turns_errors_into_server_errors(caplog):
+    view = mock.Mock()
+    view.get = mock.AsyncMock(side_effect=ConnectionError)
+    finished = mock.Mock()
+    request_finished.connect(finished)
+    try:
+        messages = call_asgi(AdmobSSVASGIHandler(view=view), get_scope())
+    finally:
+        request_finished.disconnect(finished)
+
+    assert messages[0]["status"] == 500
+    assert finished.call_count == 1
+    assert caplog.records[-1].name == "django.request"
+    assert caplog.records[-1].exc_info[0] is ConnectionError
@@ -0,0 +1,69 @@
+from datetime import timedelta
+
+import pytest
+import requests
+
+from admob_ssv.http import KeyServerClient
+
+KEYS_SERVER_URL = "https://www.gstatic.com/admob/reward/verifier-keys.json"
+
+
+def test_get_json_reuses_session():
+    client = KeyServerClient()
+    assert client.get_session() is client.get_session()
+
+
+def test_get_json_configures_retries(settings):
+    settings.ADMOB_SSV_KEYS_SERVER_RETRIES = 3
+    client = KeyServerClient()
+
+    adapter = client.get_session().get_adapter(KEYS_SERVER_URL)
+    assert adapter.max_retries.total == 3
+    assert adapter.max_retries.backoff_factor == 0.5
+
+
+def test_get_json_uses_timeouts(settings, requests_mock):
+    settings.ADMOB_SSV_KEYS_SERVER_CONNECT_TIMEOUT = timedelta(seconds=1)
+    settings.ADMOB_SSV_KEYS_SERVER_READ_TIMEOUT = timedelta(seconds=2)
+    requests_mock.get(KEYS_SERVER_URL, json={"keys": []})
+
+    assert KeyServerClient().get_json(KEYS_SERVER_URL) == {"keys": []}
+    assert requests_mock.last_request.timeout == (1, 2)
+
+
+def test_get_json_revalidates_responses(requests_mock):
+    requests_mock.get(
+        KEYS_SERVER_URL,
+        [
+            {
+                "json": {"keys": []},
+                "headers": {
+                    "ETag": '"v1"',
+                    "Last-Modified": "Wed, 01 Oct 2025 00:00:00 GMT",
+                },
+            },
+            {"status_code": 304},
+        ],
+    )
+    client = KeyServerClient()
+
+    assert client.get_json(KEYS_SERVER_URL) == {"keys": []}
+    assert client.get_json(KEYS_SERVER_URL) == {"keys": []}
+
+    headers = requests_mock.last_request.headers
+    assert headers["If-None-Match"] == '"v1"'
+    assert headers["If-Modified-Since"] == "Wed, 01 Oct 2025 00:00:00 GMT"
+
+
+def test_get_json_raises_for_errors(requests_mock):
+    requests_mock.get(KEYS_SERVER_URL, status_code=404)
+
+    with pytest.raises(requests.HTTPError):
+        KeyServerClient().get_json(KEYS_SERVER_URL)
+
+
+def test_close_discards_session():
+    client = KeyServerClient()
+    session = client.get_session()
+    client.close()
+    assert client.get_session() is not session
@@ -0,0 +1,88 @@
+import json
+import os
+import subprocess
+import sys
+from unittest import mock
+
+from django.apps import apps
+
+from admob_ssv.sources import HttpKeySource
+from admob_ssv.verifiers import EcdsaVerifier
+
+# Imports admob_ssv in a fresh interpreter, after Django has been set up, and
+# reports the time and memory this took and the heavy dependencies it pulled in.
+IMPORT_SCRIPT = """
+import json
+import sys
+from unittest import mock
+import time
+import tracemalloc
+
+import django
+
+django.setup()
+
+tracemalloc.start()
+started_at = time.perf_counter()
+
+import admob_ssv.views
+
+elapsed = time.perf_counter() - started_at
+_, peak_memory = tracemalloc.get_traced_memory()
+
+print(json.dumps({
+    "seconds": elapsed,
+    "peak_memory": peak_memory,
+    "modules": sorted(
+        name for name in ("cryptography", "ecdsa", "httpx", "requests", "urllib3")
+        if name in sys.modules
+    ),
+}))
+"""
+
+
+def import_admob_ssv() -> dict:
+    completed_process = subprocess.run(
+        [sys.executable, "-c", IMPORT_SCRIPT],
+        capture_output=True,
+        check=True,
+        env={
+            **os.environ,
+            "DJANGO_SETTINGS_MODULE": "tests.project.project.settings",
+        },
+        text=True,
+    )
+    return json.loads(completed_process.stdout)
+
+
+def test_import_defers_heavy_dependencies():
+    assert import_admob_ssv()["modules"] == []
+
+
+def test_import_time_and_memory_are_capped():
+    result = import_admob_ssv()
+
+    # Generous caps, importing takes a few milliseconds and about 1 MB.
+    assert result["seconds"] < 0.25
+    assert result["peak_memory"] < 4 * 1024 * 1024
+
+
+def test_app_config_preloads_dependencies(settings):
+    settings.ADMOB_SSV_PRELOAD_ON_STARTUP = True
+
+    with (
+        mock.patch.object(EcdsaVerifier, "preload") as preload_verifier,
+        mock.patch.object(HttpKeySource, "preload") as preload_key_source,
+    ):
+        apps.get_app_config("admob_ssv").ready()
+
+    assert preload_verifier.call_count == 1
+    assert preload_key_source.call_count == 1
+
+
+def test_preload_imports_modules():
+    EcdsaVerifier().preload()
+    HttpKeySource().preload()
+
+    assert "ecdsa.util" in sys.modules
+    assert "requests" in sys.modules
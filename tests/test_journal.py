@@ -0,0 +1,244 @@
+import os
+import urllib.parse
+from unittest import mock
+
+import pytest
+from asgiref.sync import async_to_sync
+
+from admob_ssv.journal import (
+    JournalRecord,
+    JournalWriter,
+    close_journal,
+    get_journal,
+    get_segments,
+    read_journal,
+    read_segment,
+)
+from admob_ssv.views import AdmobSSVView, AsyncAdmobSSVView
+
+from .conftest import VALID_CALLBACK
+
+QUERY_STRING = urllib.parse.urlencode(VALID_CALLBACK)
+
+
+@pytest.fixture
+def journal_directory(settings, tmp_path, cached_public_keys):
+    settings.ADMOB_SSV_JOURNAL_DIRECTORY = str(tmp_path)
+    yield str(tmp_path)
+    close_journal()
+
+
+def test_read_journal_returns_appended_records(tmp_path):
+    writer = JournalWriter(str(tmp_path), segment_size=1024)
+    writer.append("a=1&b=ü", 1700000000.5, "valid")
+    writer.append("", 1700000001.0, "malformed_request")
+    writer.close()
+
+    assert list(read_journal(str(tmp_path))) == [
+        JournalRecord("a=1&b=ü", 1700000000.5, "valid"),
+        JournalRecord("", 1700000001.0, "malformed_request"),
+    ]
+
+
+def test_journal_writer_buffers_records(tmp_path):
+    writer = JournalWriter(str(tmp_path), segment_size=1024)
+    writer.append("a=1", 1700000000.0, "valid")
+    (path,) = get_segments(str(tmp_path))
+
+    assert os.path.getsize(path) == 0
+
+    writer.flush()
+    assert list(read_segment(path)) == [JournalRecord("a=1", 1700000000.0, "valid")]
+    writer.close()
+
+
+def test_journal_writer_rotates_segments(tmp_path):
+    writer = JournalWriter(str(tmp_path), segment_size=100)
+    for index in range(10):
+        writer.append(f"transaction_id={index}", 1700000000.0 + index, "valid")
+    writer.close()
+
+    segments = get_segments(str(tmp_path))
+
+    assert len(segments) == 5
+    assert all(os.path.getsize(path) <= 100 for path in segments)
+    assert [record.query_string for record in read_journal(str(tmp_path))] == [
+        f"transaction_id={index}" for index in range(10)
+    ]
+
+
+def test_journal_writer_deletes_old_segments(tmp_path):
+    writer = JournalWriter(str(tmp_path), segment_size=100, max_segments=2)
+    for index in range(4):
+        writer.append("a" * 50, 1700000000.0 + index, "valid")
+    writer.close()
+
+    assert [record.received_at for record in read_journal(str(tmp_path))] == [
+        1700000002.0,
+        1700000003.0,
+    ]
+    assert len(get_segments(str(tmp_path))) == 2
+
+
+def test_journal_writers_only_delete_their_own_segments(tmp_path):
+    # Each writer stands in for a worker process sharing the directory.
+    writers = {
+        pid: JournalWriter(str(tmp_path), segment_size=100, max_segments=2)
+        for pid in (1, 2, 3)
+    }
+
+    for index in range(3):
+        for pid, writer in writers.items():
+            with mock.patch("admob_ssv.journal.os.getpid", return_value=pid):
+                writer.append("a" * 50, pid * 100 + index, "valid")
+
+    for pid, writer in writers.items():
+        with mock.patch("admob_ssv.journal.os.getpid", return_value=pid):
+            writer.close()
+
+    assert sorted(record.received_at for record in read_journal(str(tmp_path))) == [
+        101.0,
+        102.0,
+        201.0,
+        202.0,
+        301.0,
+        302.0,
+    ]
+
+
+def test_read_segment_stops_at_truncated_record(tmp_path, caplog):
+    writer = JournalWriter(str(tmp_path), segment_size=1024)
+    writer.append("a=1", 1700000000.0, "valid")
+    writer.append("a=2", 1700000001.0, "valid")
+    writer.close()
+    (path,) = get_segments(str(tmp_path))
+    os.truncate(path, os.path.getsize(path) - 1)
+
+    assert [record.query_string for record in read_segment(path)] == ["a=1"]
+    assert caplog.messages == [f"Truncated record at {path}:25"]
+
+
+def test_read_segment_stops_at_corrupted_record(tmp_path, caplog):
+    writer = JournalWriter(str(tmp_path), segment_size=1024)
+    writer.append("a=1", 1700000000.0, "valid")
+    writer.append("a=2", 1700000001.0, "valid")
+    writer.close()
+    (path,) = get_segments(str(tmp_path))
+
+    with open(path, "r+b") as file:
+        file.seek(-1, os.SEEK_END)
+        file.write(b"3")
+
+    assert [record.query_string for record in read_segment(path)] == ["a=1"]
+    assert caplog.messages == [f"Corrupted record at {path}:25"]
+
+
+def test_read_segment_of_empty_segment(tmp_path):
+    path = tmp_path / "00000000000000000000-1.journal"
+    path.touch()
+
+    assert list(read_segment(str(path))) == []
+
+
+def test_read_journal_filters_records(tmp_path):
+    writer = JournalWriter(str(tmp_path), segment_size=1024)
+    writer.append("a=1", 1700000000.0, "valid")
+    writer.append("a=2", 1700000001.0, "invalid_signature")
+    writer.append("a=3", 1700000002.0, "valid")
+    writer.append("a=4", 1700000003.0, "error")
+    writer.close()
+
+    def query_strings(**kwargs):
+        return [record.query_string for record in read_journal(str(tmp_path), **kwargs)]
+
+    assert query_strings(outcomes=["valid", "error"]) == ["a=1", "a=3", "a=4"]
+    assert query_strings(since=1700000001.0) == ["a=2", "a=3", "a=4"]
+    assert query_strings(until=1700000002.0) == ["a=1", "a=2"]
+
+
+def test_get_journal_is_disabled_by_default():
+    assert get_journal() is None
+
+
+def test_get_journal_follows_directory(settings, tmp_path):
+    settings.ADMOB_SSV_JOURNAL_DIRECTORY = str(tmp_path / "a")
+    journal = get_journal()
+
+    assert journal is get_journal()
+    assert journal.directory == str(tmp_path / "a")
+
+    settings.ADMOB_SSV_JOURNAL_DIRECTORY = str(tmp_path / "b")
+    assert get_journal().directory == str(tmp_path / "b")
+    close_journal()
+
+
+@pytest.mark.django_db
+def test_get_journals_callbacks(client, journal_directory):
+    tampered_query_string = urllib.parse.urlencode(
+        {**VALID_CALLBACK, "custom_data": "tampered"}
+    )
+
+    with mock.patch("admob_ssv.views.time.time", return_value=1700000000.0):
+        client.get(f"/admob-ssv/?{QUERY_STRING}")
+        client.get(f"/admob-ssv/?{tampered_query_string}")
+        client.get("/admob-ssv/?key_id=3335741209")
+
+    get_journal().flush()
+
+    assert list(read_journal(journal_directory)) == [
+        JournalRecord(QUERY_STRING, 1700000000.0, "valid"),
+        JournalRecord(tampered_query_string, 1700000000.0, "invalid_signature"),
+        JournalRecord("key_id=3335741209", 1700000000.0, "malformed_request"),
+    ]
+
+
+def test_get_journals_failed_callbacks(client, journal_directory):
+    with (
+        mock.patch.object(AdmobSSVView, "get_public_key", side_effect=ConnectionError),
+        pytest.raises(ConnectionError),
+    ):
+        client.get(f"/admob-ssv/?{QUERY_STRING}")
+
+    get_journal().flush()
+
+    assert [record.outcome for record in read_journal(journal_directory)] == ["error"]
+
+
+@pytest.mark.django_db
+def test_async_get_journals_callbacks(async_client, journal_directory):
+    async_to_sync(async_client.get)(f"/admob-ssv-async/?{QUERY_STRING}")
+
+    with mock.patch.object(
+        AsyncAdmobSSVView, "aget_public_key", mock.AsyncMock(return_value=None)
+    ):
+        async_to_sync(async_client.get)(f"/admob-ssv-async/?{QUERY_STRING}")
+
+    get_journal().flush()
+
+    assert [record.outcome for record in read_journal(journal_directory)] == [
+        "valid",
+        "unknown_key_id",
+    ]
+
+
+def test_get_journals_oversized_callbacks_up_to_the_limit(
+    client, settings, journal_directory
+):
+    settings.ADMOB_SSV_MAX_QUERY_LENGTH = 16
+
+    client.get(f"/admob-ssv/?{'a' * 1024}")
+
+    get_journal().flush()
+
+    assert [record.query_string for record in read_journal(journal_directory)] == [
+        "a" * 16
+    ]
+
+
+@pytest.mark.django_db
+def test_get_survives_journal_errors(client, journal_directory, caplog):
+    with mock.patch.object(JournalWriter, "append", side_effect=OSError):
+        response = client.get(f"/admob-ssv/?{QUERY_STRING}")
+
+    assert response.status_code == 200
+    assert "Journaling Admob SSV callback failed" in caplog.text
@@ -0,0 +1,480 @@
+import json
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+from unittest import mock
+
+import ecdsa
+import pytest
+from django.apps import apps
+from django.core.cache import cache
+
+from admob_ssv.keys import (
+    BackgroundRefresher,
+    LocalPublicKeyCache,
+    SingleFlight,
+    UnknownKeyIdCache,
+    VerifyingKeyCache,
+    invalidate_public_keys,
+    local_public_keys,
+    public_keys_refresh,
+    unknown_key_ids,
+    verifying_keys,
+)
+from admob_ssv.views import AdmobSSVView
+
+from .test_views import PUBLIC_KEY_PEM
+
+
+def test_verifying_key_cache_parses_each_key_once():
+    loader = mock.Mock(side_effect=lambda public_key: object())
+    verifying_key_cache = VerifyingKeyCache()
+
+    first = verifying_key_cache.get("pem-a", loader)
+    second = verifying_key_cache.get("pem-a", loader)
+
+    assert first is second
+    assert loader.call_count == 1
+
+
+def test_verifying_key_cache_is_bounded(settings):
+    settings.ADMOB_SSV_VERIFYING_KEYS_CACHE_SIZE = 2
+    loader = mock.Mock(side_effect=lambda public_key: object())
+    verifying_key_cache = VerifyingKeyCache()
+
+    verifying_key_cache.get("pem-a", loader)
+    verifying_key_cache.get("pem-b", loader)
+    verifying_key_cache.get("pem-a", loader)
+    verifying_key_cache.get("pem-c", loader)
+    assert len(verifying_key_cache) == 2
+
+    # "pem-b" was the least recently used key and got evicted.
+    verifying_key_cache.get("pem-a", loader)
+    verifying_key_cache.get("pem-b", loader)
+    assert loader.call_count == 4
+
+
+def test_verifying_key_cache_retain_evicts_rotated_keys():
+    loader = mock.Mock(side_effect=lambda public_key: object())
+    verifying_key_cache = VerifyingKeyCache()
+
+    verifying_key_cache.get("pem-a", loader)
+    verifying_key_cache.get("pem-b", loader)
+    verifying_key_cache.retain(["pem-b"])
+    assert len(verifying_key_cache) == 1
+
+    verifying_key_cache.get("pem-b", loader)
+    assert loader.call_count == 2
+
+
+def test_verify_signature_reuses_parsed_verifying_key():
+    signature = b"0D\x02 \x08Jc\x93\xfeh\x19\xa3SH\xaa\xc6\xd8\xea\xd8\x93\xf3x\xd2\xa7C\xdd\x99m#\xc2\xdft\xa9\xe0\x1c\x9e\x02 @\xae\xa8`\xf7\xfb\x9a|\x1dK\x08\x16\x15!u\x8d9o/UYhp\xb7<\xd6\x9bQ9\xf18\xe1"
+    content = b"ad_network=5450213213286189855&ad_unit=1234567890&custom_data=customdata42&reward_amount=1&reward_item=Reward&timestamp=1683852940453&transaction_id=123456789&user_id=userid42"
+    view = AdmobSSVView()
+    from_pem = mock.Mock(wraps=ecdsa.VerifyingKey.from_pem)
+    with mock.patch("ecdsa.VerifyingKey.from_pem", from_pem):
+        assert view.verify_signature(PUBLIC_KEY_PEM, signature, content)
+        assert view.verify_signature(PUBLIC_KEY_PEM, signature, content)
+
+    assert from_pem.call_count == 1
+
+
+def test_get_public_key_evicts_rotated_verifying_keys():
+    verifying_keys.get("rotated-pem", lambda public_key: object())
+
+    view = AdmobSSVView()
+    view.fetch_public_keys = mock.Mock(return_value={"3335741209": PUBLIC_KEY_PEM})
+    view.get_public_key("UnknownKeyId")
+
+    assert len(verifying_keys) == 0
+
+
+def test_local_public_key_cache_expires(settings):
+    settings.ADMOB_SSV_KEYS_LOCAL_CACHE_TIMEOUT = timedelta(minutes=1)
+    local_public_key_cache = LocalPublicKeyCache()
+    local_public_key_cache.set({"TestKeyId": "TestKey"})
+    assert local_public_key_cache.get() == {"TestKeyId": "TestKey"}
+
+    settings.ADMOB_SSV_KEYS_LOCAL_CACHE_TIMEOUT = timedelta(0)
+    local_public_key_cache.set({"TestKeyId": "TestKey"})
+    assert local_public_key_cache.get() is None
+
+
+def test_get_public_key_prefers_local_cache():
+    cache.set("admob_ssv.public_keys", {"TestKeyId": "SharedKey"}, 24 * 60 * 60)
+    local_public_keys.set({"TestKeyId": "LocalKey"})
+
+    assert AdmobSSVView().get_public_key("TestKeyId") == "LocalKey"
+
+
+def test_get_public_key_fills_local_cache_from_shared_cache():
+    cache.set("admob_ssv.public_keys", {"TestKeyId": "SharedKey"}, 24 * 60 * 60)
+
+    assert AdmobSSVView().get_public_key("TestKeyId") == "SharedKey"
+    assert local_public_keys.get() == {"TestKeyId": "SharedKey"}
+
+
+def test_get_public_key_falls_back_to_shared_cache_for_missing_keys():
+    cache.set("admob_ssv.public_keys", {"TestKeyId": "SharedKey"}, 24 * 60 * 60)
+    local_public_keys.set({"OtherKeyId": "LocalKey"})
+
+    assert AdmobSSVView().get_public_key("TestKeyId") == "SharedKey"
+
+
+def test_invalidate_public_keys():
+    cache.set("admob_ssv.public_keys", {"TestKeyId": "SharedKey"}, 24 * 60 * 60)
+    local_public_keys.set({"TestKeyId": "LocalKey"})
+    verifying_keys.get("LocalKey", lambda public_key: object())
+
+    invalidate_public_keys()
+
+    assert cache.get("admob_ssv.public_keys") is None
+    assert local_public_keys.get() is None
+    assert len(verifying_keys) == 0
+
+
+def test_single_flight_coalesces_concurrent_calls():
+    started = threading.Event()
+    release = threading.Event()
+
+    def fetch():
+        started.set()
+        release.wait()
+        return "result"
+
+    func = mock.Mock(side_effect=fetch)
+    single_flight = SingleFlight()
+
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        first = executor.submit(single_flight.do, func)
+        started.wait()
+        others = [executor.submit(single_flight.do, func) for _ in range(3)]
+        time.sleep(0.1)
+        release.set()
+        results = [first.result()] + [other.result() for other in others]
+
+    assert results == ["result"] * 4
+    assert func.call_count == 1
+
+
+def test_single_flight_retries_after_failure():
+    func = mock.Mock(side_effect=[RuntimeError, "result"])
+    single_flight = SingleFlight()
+
+    with pytest.raises(RuntimeError):
+        single_flight.do(func)
+
+    assert single_flight.do(func) == "result"
+
+
+def test_single_flight_shares_failure_with_waiting_callers():
+    started = threading.Event()
+    release = threading.Event()
+
+    def fetch():
+        started.set()
+        release.wait()
+        raise ConnectionError
+
+    func = mock.Mock(side_effect=fetch)
+    single_flight = SingleFlight()
+
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        first = executor.submit(single_flight.do, func)
+        started.wait()
+        others = [executor.submit(single_flight.do, func) for _ in range(3)]
+        time.sleep(0.1)
+        release.set()
+
+        for future in [first, *others]:
+            with pytest.raises(ConnectionError):
+                future.result()
+
+    assert func.call_count == 1
+    assert single_flight.completed_at is None
+
+
+def test_refresh_public_keys_takes_fleet_lock(settings):
+    settings.ADMOB_SSV_KEYS_FETCH_LOCK_TIMEOUT = timedelta(seconds=5)
+    cache.delete("admob_ssv.public_keys.lock")
+
+    view = AdmobSSVView()
+    view.fetch_public_keys = mock.Mock(
+        side_effect=lambda: {"Locked": str(cache.get("admob_ssv.public_keys.lock"))}
+    )
+
+    assert view.refresh_public_keys() == {"Locked": "True"}
+    assert cache.get("admob_ssv.public_keys.lock") is None
+
+
+def test_refresh_public_keys_waits_for_fleet_lock(settings):
+    settings.ADMOB_SSV_KEYS_FETCH_LOCK_TIMEOUT = timedelta(seconds=5)
+    cache.set("admob_ssv.public_keys.lock", True, 5)
+    cache.delete("admob_ssv.public_keys")
+
+    def other_worker_finishes_refresh(seconds):
+        cache.set("admob_ssv.public_keys", {"TestKeyId": "TestKey"}, 60)
+        cache.delete("admob_ssv.public_keys.lock")
+
+    view = AdmobSSVView()
+    view.fetch_public_keys = mock.Mock()
+
+    with mock.patch("admob_ssv.views.time.sleep", other_worker_finishes_refresh):
+        assert view.refresh_public_keys() == {"TestKeyId": "TestKey"}
+
+    assert not view.fetch_public_keys.called
+    assert local_public_keys.get() == {"TestKeyId": "TestKey"}
+
+
+def test_refresh_public_keys_fetches_after_fleet_lock_expires(settings):
+    settings.ADMOB_SSV_KEYS_FETCH_LOCK_TIMEOUT = timedelta(0)
+    cache.set("admob_ssv.public_keys.lock", True, 5)
+    cache.delete("admob_ssv.public_keys")
+
+    view = AdmobSSVView()
+    view.fetch_public_keys = mock.Mock(return_value={"TestKeyId": "TestKey"})
+
+    assert view.refresh_public_keys() == {"TestKeyId": "TestKey"}
+    assert cache.get("admob_ssv.public_keys") == {"TestKeyId": "TestKey"}
+    cache.delete("admob_ssv.public_keys.lock")
+
+
+def test_unknown_key_id_cache_expires(settings):
+    settings.ADMOB_SSV_UNKNOWN_KEY_IDS_CACHE_TIMEOUT = timedelta(minutes=10)
+    unknown_key_id_cache = UnknownKeyIdCache()
+    unknown_key_id_cache.add("UnknownKeyId")
+    assert "UnknownKeyId" in unknown_key_id_cache
+    assert "OtherKeyId" not in unknown_key_id_cache
+
+    settings.ADMOB_SSV_UNKNOWN_KEY_IDS_CACHE_TIMEOUT = timedelta(0)
+    unknown_key_id_cache.add("UnknownKeyId")
+    assert "UnknownKeyId" not in unknown_key_id_cache
+
+
+def test_unknown_key_id_cache_is_bounded():
+    unknown_key_id_cache = UnknownKeyIdCache()
+    unknown_key_id_cache.max_size = 2
+
+    for key_id in ["a", "b", "c"]:
+        unknown_key_id_cache.add(key_id)
+
+    assert "a" not in unknown_key_id_cache
+    assert "b" in unknown_key_id_cache
+    assert "c" in unknown_key_id_cache
+
+
+def test_get_public_key_caches_unknown_key_ids():
+    invalidate_public_keys()
+    view = AdmobSSVView()
+    view.fetch_public_keys = mock.Mock(return_value={"TestKeyId": "TestKey"})
+
+    assert view.get_public_key("UnknownKeyId") is None
+    assert "UnknownKeyId" in unknown_key_ids
+
+    public_keys_refresh.reset()
+    assert view.get_public_key("UnknownKeyId") is None
+    assert view.fetch_public_keys.call_count == 1
+
+
+def test_get_public_key_limits_forced_refreshes(settings):
+    settings.ADMOB_SSV_KEYS_REFRESH_INTERVAL = timedelta(minutes=1)
+    invalidate_public_keys()
+    view = AdmobSSVView()
+    view.fetch_public_keys = mock.Mock(return_value={"TestKeyId": "TestKey"})
+
+    assert view.get_public_key("UnknownKeyId1") is None
+    assert view.get_public_key("UnknownKeyId2") is None
+    assert view.fetch_public_keys.call_count == 1
+    assert "UnknownKeyId1" in unknown_key_ids
+    assert "UnknownKeyId2" not in unknown_key_ids
+
+    settings.ADMOB_SSV_KEYS_REFRESH_INTERVAL = timedelta(0)
+    assert view.get_public_key("UnknownKeyId3") is None
+    assert view.fetch_public_keys.call_count == 2
+
+
+def test_get_public_key_refreshes_empty_cache_regardless_of_interval(settings):
+    settings.ADMOB_SSV_KEYS_REFRESH_INTERVAL = timedelta(minutes=1)
+    invalidate_public_keys()
+    view = AdmobSSVView()
+    view.fetch_public_keys = mock.Mock(return_value={"TestKeyId": "TestKey"})
+    view.get_public_key("TestKeyId")
+
+    invalidate_public_keys()
+    assert view.get_public_key("TestKeyId") == "TestKey"
+    assert view.fetch_public_keys.call_count == 2
+
+
+def test_get_public_key_doesnt_remember_key_ids_missing_from_stale_keys():
+    cache.delete("admob_ssv.public_keys")
+    cache.set("admob_ssv.public_keys.stale", ({"TestKeyId": "TestKey"}, 0), 60)
+    view = AdmobSSVView()
+    view.fetch_public_keys = mock.Mock(side_effect=ConnectionError)
+
+    assert view.get_public_key("RotatedKeyId") is None
+    assert "RotatedKeyId" not in unknown_key_ids
+    cache.delete("admob_ssv.public_keys.stale")
+
+
+def test_store_public_keys_clears_unknown_key_ids():
+    unknown_key_ids.add("RotatedKeyId")
+
+    AdmobSSVView().store_public_keys({"RotatedKeyId": "RotatedKey"})
+
+    assert "RotatedKeyId" not in unknown_key_ids
+
+
+def test_store_public_keys_keeps_stale_copy():
+    AdmobSSVView().store_public_keys({"TestKeyId": "TestKey"})
+
+    stale_public_keys, fetched_at = cache.get("admob_ssv.public_keys.stale")
+    assert stale_public_keys == {"TestKeyId": "TestKey"}
+    assert time.time() - fetched_at < 60
+
+
+def test_get_public_key_serves_stale_keys_when_fetch_fails():
+    AdmobSSVView().store_public_keys({"TestKeyId": "TestKey"})
+    cache.delete("admob_ssv.public_keys")
+    local_public_keys.clear()
+
+    view = AdmobSSVView()
+    view.fetch_public_keys = mock.Mock(side_effect=ConnectionError)
+
+    assert view.get_public_key("TestKeyId") == "TestKey"
+    assert local_public_keys.get() == {"TestKeyId": "TestKey"}
+
+
+def test_get_public_key_raises_when_fetch_fails_without_stale_keys():
+    invalidate_public_keys()
+
+    view = AdmobSSVView()
+    view.fetch_public_keys = mock.Mock(side_effect=ConnectionError)
+
+    with pytest.raises(ConnectionError):
+        view.get_public_key("TestKeyId")
+
+
+def test_revalidate_public_keys_skips_recently_refreshed_keys(settings):
+    settings.ADMOB_SSV_KEYS_BACKGROUND_REFRESH_INTERVAL = timedelta(hours=12)
+    AdmobSSVView().store_public_keys({"TestKeyId": "TestKey"})
+
+    view = AdmobSSVView()
+    view.fetch_public_keys = mock.Mock()
+
+    assert view.revalidate_public_keys() == {"TestKeyId": "TestKey"}
+    assert not view.fetch_public_keys.called
+
+
+def test_revalidate_public_keys_refreshes_outdated_keys(settings):
+    settings.ADMOB_SSV_KEYS_BACKGROUND_REFRESH_INTERVAL = timedelta(hours=12)
+    cache.set(
+        "admob_ssv.public_keys.stale",
+        ({"TestKeyId": "OldKey"}, time.time() - 13 * 60 * 60),
+        60,
+    )
+
+    view = AdmobSSVView()
+    view.fetch_public_keys = mock.Mock(return_value={"TestKeyId": "NewKey"})
+
+    assert view.revalidate_public_keys() == {"TestKeyId": "NewKey"}
+    assert cache.get("admob_ssv.public_keys") == {"TestKeyId": "NewKey"}
+
+
+def test_background_refresher_refreshes_periodically():
+    refreshed = threading.Event()
+
+    def refresh_once_failed():
+        if refresh.call_count == 1:
+            raise RuntimeError
+        refreshed.set()
+
+    refresh = mock.Mock(side_effect=refresh_once_failed)
+    background_refresher = BackgroundRefresher()
+
+    background_refresher.start(refresh, 0.01)
+    background_refresher.start(refresh, 0.01)
+
+    try:
+        assert refreshed.wait(5)
+    finally:
+        background_refresher.stop()
+
+    assert refresh.call_count >= 2
+
+
+def test_get_public_key_starts_background_refresher(settings):
+    settings.ADMOB_SSV_KEYS_BACKGROUND_REFRESH_INTERVAL = timedelta(hours=12)
+    cache.set("admob_ssv.public_keys", {"TestKeyId": "TestKey"}, 60)
+
+    with mock.patch("admob_ssv.views.background_refresher") as background_refresher:
+        AdmobSSVView().get_public_key("TestKeyId")
+
+    start = background_refresher.start
+    assert start.call_count == 1
+    assert start.call_args.args[1] == 12 * 60 * 60
+
+
+def test_warm_public_keys_uses_shared_cache():
+    cache.set("admob_ssv.public_keys", {"3335741209": PUBLIC_KEY_PEM}, 60)
+
+    view = AdmobSSVView()
+    view.fetch_public_keys = mock.Mock()
+
+    assert view.warm_public_keys() == {"3335741209": PUBLIC_KEY_PEM}
+    assert not view.fetch_public_keys.called
+    assert local_public_keys.get() == {"3335741209": PUBLIC_KEY_PEM}
+    assert len(verifying_keys) == 1
+
+
+def test_warm_public_keys_fetches_missing_keys():
+    invalidate_public_keys()
+
+    view = AdmobSSVView()
+    view.fetch_public_keys = mock.Mock(return_value={"3335741209": PUBLIC_KEY_PEM})
+
+    assert view.warm_public_keys() == {"3335741209": PUBLIC_KEY_PEM}
+    assert view.fetch_public_keys.call_count == 1
+    assert cache.get("admob_ssv.public_keys") == {"3335741209": PUBLIC_KEY_PEM}
+    assert len(verifying_keys) == 1
+
+
+def test_fetch_public_keys_falls_back_to_keys_file(settings, tmp_path, requests_mock):
+    requests_mock.get(settings.ADMOB_SSV_KEYS_SERVER_URL, exc=ConnectionError)
+    path = tmp_path / "keys.json"
+    path.write_text(json.dumps({"keys": [{"keyId": 42, "pem": "TestKey"}]}))
+    settings.ADMOB_SSV_KEYS_FILE = str(path)
+
+    assert AdmobSSVView().fetch_public_keys() == {"42": "TestKey"}
+
+
+def test_fetch_public_keys_raises_without_keys_file(settings, requests_mock):
+    requests_mock.get(settings.ADMOB_SSV_KEYS_SERVER_URL, exc=ConnectionError)
+
+    with pytest.raises(ConnectionError):
+        AdmobSSVView().fetch_public_keys()
+
+
+def test_app_config_warms_public_keys_on_startup(settings):
+    settings.ADMOB_SSV_WARM_KEYS_ON_STARTUP = True
+
+    with mock.patch.object(AdmobSSVView, "warm_public_keys") as warm_public_keys:
+        apps.get_app_config("admob_ssv").ready()
+
+    assert warm_public_keys.call_count == 1
+
+
+def test_app_config_survives_failing_warm_up(settings):
+    settings.ADMOB_SSV_WARM_KEYS_ON_STARTUP = True
+
+    with mock.patch.object(
+        AdmobSSVView, "warm_public_keys", side_effect=ConnectionError
+    ):
+        apps.get_app_config("admob_ssv").ready()
+
+
+def test_app_config_skips_warm_up_by_default():
+    with mock.patch.object(AdmobSSVView, "warm_public_keys") as warm_public_keys:
+        apps.get_app_config("admob_ssv").ready()
+
+    assert not warm_public_keys.called
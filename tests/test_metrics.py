@@ -0,0 +1,124 @@
+import logging
+
+import pytest
+from asgiref.sync import async_to_sync
+from django.core.cache import cache
+
+from admob_ssv.metrics import (
+    LoggingMetrics,
+    NullMetrics,
+    PrometheusMetrics,
+    get_metrics,
+    load_metrics,
+)
+
+from .conftest import VALID_CALLBACK
+from .test_views import PUBLIC_KEY_PEM, mock_admob_ssv_keys_server  # noqa: F401
+
+
+@pytest.fixture
+def metrics(settings):
+    settings.ADMOB_SSV_METRICS_BACKEND = "admob_ssv.metrics.PrometheusMetrics"
+    metrics = get_metrics()
+    metrics.clear()
+    cache.clear()
+    yield metrics
+    metrics.clear()
+
+
+def test_get_metrics_uses_null_metrics_by_default():
+    metrics = get_metrics()
+    assert isinstance(metrics, NullMetrics)
+    assert metrics is load_metrics("admob_ssv.metrics.NullMetrics")
+
+
+def test_null_metrics_timer_is_shared():
+    metrics = NullMetrics()
+    assert metrics.timer("verify_signature") is metrics.timer("get_public_key")
+
+
+def test_logging_metrics(caplog):
+    metrics = LoggingMetrics()
+
+    with caplog.at_level(logging.DEBUG, logger="admob_ssv.metrics"):
+        metrics.increment("invalid_signature")
+        with metrics.timer("verify_signature"):
+            pass
+
+    assert caplog.messages[0] == "Admob SSV invalid_signature"
+    assert caplog.messages[1].startswith("Admob SSV verify_signature took ")
+
+
+def test_prometheus_metrics_render():
+    metrics = PrometheusMetrics()
+    metrics.increment("invalid_signature")
+    metrics.increment("invalid_signature")
+    metrics.observe("verify_signature", 0.002)
+    metrics.observe("verify_signature", 20.0)
+
+    lines = metrics.render().splitlines()
+
+    assert 'admob_ssv_events_total{event="invalid_signature"} 2' in lines
+    assert (
+        'admob_ssv_stage_duration_seconds_bucket{stage="verify_signature",le="0.001"} 0'
+        in lines
+    )
+    assert (
+        'admob_ssv_stage_duration_seconds_bucket{stage="verify_signature",le="0.0025"} 1'
+        in lines
+    )
+    assert (
+        'admob_ssv_stage_duration_seconds_bucket{stage="verify_signature",le="10.0"} 1'
+        in lines
+    )
+    assert (
+        'admob_ssv_stage_duration_seconds_bucket{stage="verify_signature",le="+Inf"} 2'
+        in lines
+    )
+    assert (
+        'admob_ssv_stage_duration_seconds_sum{stage="verify_signature"} 20.002' in lines
+    )
+    assert 'admob_ssv_stage_duration_seconds_count{stage="verify_signature"} 2' in lines
+
+
+@pytest.mark.django_db
+def test_view_records_metrics(client, metrics):
+    assert client.get("/admob-ssv/", VALID_CALLBACK).status_code == 200
+    assert client.get("/admob-ssv/", VALID_CALLBACK).status_code == 200
+    assert (
+        client.get("/admob-ssv/", {**VALID_CALLBACK, "key_id": 42}).status_code == 400
+    )
+    assert (
+        client.get("/admob-ssv/", {**VALID_CALLBACK, "user_id": "x"}).status_code == 400
+    )
+
+    assert metrics._counters == {
+        "local_public_keys.hit": 2,
+        "local_public_keys.miss": 2,
+        "public_keys.miss": 2,
+        "public_keys.fetch": 1,
+        "unknown_key_id": 1,
+        "invalid_signature": 1,
+    }
+    assert {
+        name: counts for name, (counts, _) in metrics._histograms.items()
+    }.keys() == {
+        "get_public_key",
+        "fetch_public_keys",
+        "get_unverified_content",
+        "verify_signature",
+        "handle_valid_ssv",
+    }
+
+
+@pytest.mark.django_db
+def test_async_view_records_metrics(async_client, metrics, cached_public_keys):
+    response = async_to_sync(async_client.get)("/admob-ssv-async/", VALID_CALLBACK)
+
+    assert response.status_code == 200
+    assert metrics._counters == {
+        "local_public_keys.miss": 1,
+        "public_keys.hit": 1,
+    }
+    assert "verify_signature" in metrics._histograms
+    assert "handle_valid_ssv" in metrics._histograms
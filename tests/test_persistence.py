@@ -0,0 +1,258 @@
+import threading
+import time
+from datetime import timedelta
+from unittest import mock
+
+import pytest
+
+from admob_ssv.callbacks import SSVCallback
+from admob_ssv.persistence import BulkCreateReceiver
+from tests.project.verifications.models import Verification
+
+from .test_callbacks import QUERY
+
+
+def build_verification(callback: SSVCallback) -> Verification:
+    return Verification(
+        ad_network=callback.ad_network,
+        ad_unit=callback.ad_unit,
+        custom_data=callback.custom_data,
+        key_id=callback.key_id,
+        reward_amount=callback.reward_amount,
+        reward_item=callback.reward_item,
+        signature=callback.signature,
+        timestamp=callback.timestamp,
+        transaction_id=callback.transaction_id,
+        user_id=callback.user_id,
+    )
+
+
+def mock_model() -> mock.Mock:
+    model = mock.Mock()
+    model.inserted = threading.Event()
+    model._default_manager.bulk_create.side_effect = lambda *args, **kwargs: (
+        model.inserted.set()
+    )
+    return model
+
+
+@pytest.mark.django_db
+def test_durable_bulk_create_receiver_stores_callback_right_away():
+    receiver = BulkCreateReceiver(Verification, build_verification, durable=True)
+
+    receiver(sender=None, callback=SSVCallback(QUERY))
+
+    assert Verification.objects.get().timestamp == 1683852940453
+
+
+@pytest.mark.django_db
+def test_bulk_create_receiver_skips_conflicting_rows():
+    def build_conflicting_verification(callback: SSVCallback) -> Verification:
+        verification = build_verification(callback)
+        verification.pk = 1
+        return verification
+
+    receiver = BulkCreateReceiver(
+        Verification, build_conflicting_verification, durable=True
+    )
+
+    receiver(sender=None, callback=SSVCallback(QUERY))
+    receiver(sender=None, callback=SSVCallback(QUERY))
+
+    assert Verification.objects.count() == 1
+
+
+@pytest.mark.django_db
+def test_bulk_create_receiver_flushes_full_batches():
+    model = mock_model()
+    receiver = BulkCreateReceiver(
+        model, mock.Mock(), batch_size=2, flush_interval=timedelta(hours=1)
+    )
+
+    try:
+        receiver(sender=None, callback=SSVCallback(QUERY))
+        assert not model.inserted.wait(0.1)
+
+        receiver(sender=None, callback=SSVCallback(QUERY))
+        assert model.inserted.wait(5)
+    finally:
+        receiver.close()
+
+    instances = model._default_manager.bulk_create.call_args.args[0]
+    assert len(instances) == 2
+    assert model._default_manager.bulk_create.call_args.kwargs == {
+        "batch_size": 2,
+        "ignore_conflicts": True,
+    }
+
+
+@pytest.mark.django_db
+def test_bulk_create_receiver_flushes_after_interval():
+    model = mock_model()
+    receiver = BulkCreateReceiver(
+        model, mock.Mock(), flush_interval=timedelta(milliseconds=10)
+    )
+
+    try:
+        receiver(sender=None, callback=SSVCallback(QUERY))
+        assert model.inserted.wait(5)
+    finally:
+        receiver.close()
+
+
+@pytest.mark.django_db
+def test_bulk_create_receiver_close_flushes_pending_instances():
+    model = mock_model()
+    receiver = BulkCreateReceiver(model, mock.Mock(), flush_interval=timedelta(hours=1))
+
+    receiver(sender=None, callback=SSVCallback(QUERY))
+    receiver.close()
+
+    assert model._default_manager.bulk_create.call_count == 1
+    assert receiver.flush() == 0
+
+
+@pytest.mark.django_db
+def test_bulk_create_receiver_closes_old_connections():
+    model = mock_model()
+    receiver = BulkCreateReceiver(
+        model, mock.Mock(), flush_interval=timedelta(milliseconds=10)
+    )
+
+    with mock.patch("admob_ssv.persistence.close_old_connections") as close:
+        receiver(sender=None, callback=SSVCallback(QUERY))
+        assert model.inserted.wait(5)
+        thread = receiver._thread
+        receiver.close()
+        thread.join(5)
+
+    assert close.call_count >= 2
+    assert close.call_count % 2 == 0
+
+
+@pytest.mark.django_db(transaction=True)
+def test_durable_bulk_create_receiver_raises_and_drops_failed_inserts():
+    model = mock.Mock()
+    model._default_manager.bulk_create.side_effect = [ConnectionError, None]
+    receiver = BulkCreateReceiver(model, mock.Mock(), durable=True)
+
+    with pytest.raises(ConnectionError):
+        receiver(sender=None, callback=SSVCallback(QUERY))
+
+    # Admob retries the callback instead.
+    assert receiver.flush() == 0
+    assert model._default_manager.bulk_create.call_count == 1
+
+
+@pytest.mark.django_db(transaction=True)
+def test_durable_bulk_create_receiver_fails_requests_of_failed_rows():
+    started, release = threading.Event(), threading.Event()
+
+    def bulk_create(instances, **kwargs):
+        if not started.is_set():
+            # Holds up the first request, while two more queue up behind it.
+            started.set()
+            release.wait(5)
+        elif "unstorable" in instances:
+            raise ValueError
+
+    model = mock.Mock()
+    model._default_manager.bulk_create.side_effect = bulk_create
+    receiver = BulkCreateReceiver(
+        model, lambda callback: callback.custom_data, durable=True
+    )
+    errors = {}
+
+    def call(custom_data):
+        try:
+            receiver(
+                sender=None, callback=SSVCallback({**QUERY, "custom_data": custom_data})
+            )
+        except ValueError as error:
+            errors[custom_data] = error
+
+    threads = [threading.Thread(target=call, args=("first",))]
+    threads[0].start()
+    assert started.wait(5)
+
+    for custom_data in ("unstorable", "storable"):
+        threads.append(threading.Thread(target=call, args=(custom_data,)))
+        threads[-1].start()
+    while len(receiver._pending) < 2:
+        time.sleep(0.001)
+
+    release.set()
+    for thread in threads:
+        thread.join(5)
+
+    # Both rows were in the batch of one request, but only one of them failed.
+    assert list(errors) == ["unstorable"]
+    assert isinstance(errors["unstorable"], ValueError)
+    assert receiver.flush() == 0
+
+
+@pytest.mark.django_db
+def test_durable_bulk_create_receiver_inserts_alone_within_transactions():
+    model = mock.Mock()
+    receiver = BulkCreateReceiver(model, mock.Mock(), durable=True)
+    receiver._pending.append(("other", None))
+
+    receiver(sender=None, callback=SSVCallback(QUERY))
+
+    assert len(model._default_manager.bulk_create.call_args.args[0]) == 1
+    assert receiver._pending == [("other", None)]
+
+
+@pytest.mark.django_db
+def test_bulk_create_receiver_drops_rows_that_cant_be_inserted(caplog):
+    def build_unstorable_verification(callback: SSVCallback) -> Verification:
+        verification = build_verification(callback)
+        if callback.custom_data == "unstorable":
+            # Exceeds SQLite's integer range.
+            verification.timestamp = 2**64
+        return verification
+
+    receiver = BulkCreateReceiver(
+        Verification, build_unstorable_verification, flush_interval=timedelta(hours=1)
+    )
+
+    try:
+        receiver(
+            sender=None, callback=SSVCallback({**QUERY, "custom_data": "unstorable"})
+        )
+        receiver(sender=None, callback=SSVCallback(QUERY))
+        receiver(sender=None, callback=SSVCallback(QUERY))
+
+        assert receiver.flush() == 2
+        assert Verification.objects.count() == 2
+        assert "Dropping Admob SSV callback that can't be stored" in caplog.text
+
+        receiver(sender=None, callback=SSVCallback(QUERY))
+        assert receiver.flush() == 1
+        assert Verification.objects.count() == 3
+    finally:
+        receiver.close()
+
+
+@pytest.mark.django_db
+def test_bulk_create_receiver_keeps_rows_while_all_of_them_fail():
+    receiver = BulkCreateReceiver(
+        Verification, build_verification, flush_interval=timedelta(hours=1)
+    )
+
+    try:
+        receiver(sender=None, callback=SSVCallback(QUERY))
+        receiver(sender=None, callback=SSVCallback(QUERY))
+
+        with (
+            mock.patch.object(
+                Verification.objects, "bulk_create", side_effect=ConnectionError
+            ),
+            pytest.raises(ConnectionError),
+        ):
+            receiver.flush()
+
+        assert receiver.flush() == 2
+        assert Verification.objects.count() == 2
+    finally:
+        receiver.close()
@@ -0,0 +1,77 @@
+from concurrent.futures import Future
+from concurrent.futures.process import BrokenProcessPool
+from unittest import mock
+
+import pytest
+
+from admob_ssv import views
+from admob_ssv.keys import local_public_keys
+from admob_ssv.verifiers import load_key, warm_up
+from admob_ssv.views import (
+    AdmobSSVView,
+    get_verification_process_pool,
+    shutdown_verification_process_pool,
+)
+
+from .test_verifiers import SIGNED_CONTENTS, decode_signature
+from .test_views import PUBLIC_KEY_PEM
+
+
+@pytest.fixture
+def verification_processes(settings):
+    settings.ADMOB_SSV_VERIFICATION_PROCESSES = 1
+    settings.ADMOB_SSV_VERIFICATION_QUEUE_SIZE = 2
+    shutdown_verification_process_pool()
+    yield
+    shutdown_verification_process_pool()
+
+
+def test_verify_signature_in_process_pool(verification_processes):
+    local_public_keys.set({"3335741209": PUBLIC_KEY_PEM})
+    content, encoded_signature = SIGNED_CONTENTS[0]
+    signature = decode_signature(encoded_signature)
+
+    view = AdmobSSVView()
+
+    with mock.patch.object(
+        view,
+        "verify_signature_in_process_pool",
+        wraps=view.verify_signature_in_process_pool,
+    ) as verify_signature_in_process_pool:
+        assert view.verify_signature(PUBLIC_KEY_PEM, signature, content)
+        assert not view.verify_signature(PUBLIC_KEY_PEM, signature, content + b"!")
+
+    assert verify_signature_in_process_pool.call_count == 2
+
+
+def test_verification_process_pool_is_bounded(verification_processes):
+    executor, slots = get_verification_process_pool()
+
+    assert executor._max_workers == 1
+    assert slots._initial_value == 2
+    assert get_verification_process_pool()[0] is executor
+
+
+def test_broken_verification_process_pool_gets_replaced(verification_processes):
+    executor, _ = get_verification_process_pool()
+    future = Future()
+    future.set_exception(BrokenProcessPool())
+
+    with (
+        mock.patch.object(executor, "submit", return_value=future),
+        pytest.raises(BrokenProcessPool),
+    ):
+        AdmobSSVView().verify_signature(PUBLIC_KEY_PEM, b"", b"")
+
+    assert views._verification_process_pool is None
+    assert get_verification_process_pool()[0] is not executor
+
+
+def test_warm_up_loads_keys():
+    load_key.cache_clear()
+
+    warm_up("admob_ssv.verifiers.EcdsaVerifier", [PUBLIC_KEY_PEM])
+    load_key("admob_ssv.verifiers.EcdsaVerifier", PUBLIC_KEY_PEM)
+
+    assert load_key.cache_info().hits == 1
+    load_key.cache_clear()
@@ -0,0 +1,128 @@
+import json
+import os
+from unittest import mock
+
+import pytest
+from asgiref.sync import async_to_sync
+
+from admob_ssv.sources import (
+    CompositeKeySource,
+    FileKeySource,
+    HttpKeySource,
+    KeySource,
+    get_key_source,
+)
+
+from .test_views import PUBLIC_KEY_PEM, mock_admob_ssv_keys_server  # noqa: F401
+
+KEYS_JSON = {
+    "keys": [
+        {"keyId": 3335741209, "pem": PUBLIC_KEY_PEM, "base64": "MFkwEwYH"},
+        {"keyId": 42, "pem": "TestKey", "base64": "VGVzdEtleQ=="},
+    ]
+}
+
+
+@pytest.fixture
+def keys_file(settings, tmp_path):
+    path = tmp_path / "keys.json"
+    path.write_text(json.dumps(KEYS_JSON))
+    settings.ADMOB_SSV_KEYS_FILE = str(path)
+    return path
+
+
+def test_http_key_source():
+    assert HttpKeySource().get_public_keys() == {"3335741209": PUBLIC_KEY_PEM}
+
+
+def test_file_key_source(keys_file):
+    assert FileKeySource().get_public_keys() == {
+        "3335741209": PUBLIC_KEY_PEM,
+        "42": "TestKey",
+    }
+
+
+def test_file_key_source_parses_unchanged_file_once(keys_file):
+    source = FileKeySource()
+
+    with mock.patch.object(source, "parse", wraps=source.parse) as parse:
+        public_keys = source.get_public_keys()
+        assert source.get_public_keys() is public_keys
+
+    assert parse.call_count == 1
+
+
+def test_file_key_source_reparses_replaced_file(keys_file, tmp_path):
+    source = FileKeySource()
+    source.get_public_keys()
+
+    replacement = tmp_path / "keys.json.tmp"
+    replacement.write_text(json.dumps({"keys": [{"keyId": 1, "pem": "NewKey"}]}))
+    os.replace(replacement, keys_file)
+
+    assert source.get_public_keys() == {"1": "NewKey"}
+
+
+def test_file_key_source_rejects_malformed_file(keys_file):
+    keys_file.write_text(json.dumps([{"keyId": 1, "pem": "NewKey"}]))
+
+    with pytest.raises(TypeError):
+        FileKeySource().get_public_keys()
+
+
+def test_file_key_source_requires_keys_file():
+    with pytest.raises(ValueError):
+        FileKeySource().get_public_keys()
+
+
+def test_composite_key_source_falls_back():
+    failing_source = mock.Mock(spec=KeySource)
+    failing_source.get_public_keys.side_effect = ConnectionError
+    source = mock.Mock(spec=KeySource)
+    source.get_public_keys.return_value = {"42": "TestKey"}
+
+    composite_source = CompositeKeySource([failing_source, source])
+
+    assert composite_source.get_public_keys() == {"42": "TestKey"}
+
+
+def test_composite_key_source_raises_when_all_sources_fail():
+    failing_source = mock.Mock(spec=KeySource)
+    failing_source.get_public_keys.side_effect = ConnectionError
+
+    composite_source = CompositeKeySource([failing_source, failing_source])
+
+    with pytest.raises(ConnectionError):
+        composite_source.get_public_keys()
+    assert failing_source.get_public_keys.call_count == 2
+
+
+def test_composite_key_source_falls_back_asynchronously(keys_file):
+    failing_source = mock.Mock(spec=KeySource)
+    failing_source.aget_public_keys.side_effect = ConnectionError
+
+    composite_source = CompositeKeySource([failing_source, FileKeySource()])
+
+    public_keys = async_to_sync(composite_source.aget_public_keys)()
+    assert public_keys["42"] == "TestKey"
+
+
+def test_get_key_source_uses_http_by_default():
+    assert isinstance(get_key_source(), HttpKeySource)
+
+
+def test_get_key_source_falls_back_to_keys_file(keys_file):
+    key_source = get_key_source()
+
+    assert isinstance(key_source, CompositeKeySource)
+    assert [type(source) for source in key_source.sources] == [
+        HttpKeySource,
+        FileKeySource,
+    ]
+
+
+def test_get_key_source_uses_configured_sources(settings, keys_file):
+    settings.ADMOB_SSV_KEYS_SOURCES = ["admob_ssv.sources.FileKeySource"]
+
+    assert isinstance(get_key_source(), FileKeySource)
+    assert get_key_source() is get_key_source()
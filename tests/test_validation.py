@@ -0,0 +1,53 @@
+import base64
+from unittest import mock
+
+import pytest
+
+from admob_ssv.views import AdmobSSVView
+
+from .conftest import VALID_CALLBACK
+
+
+def encode_signature(signature: bytes) -> str:
+    return base64.urlsafe_b64encode(signature).decode("ascii").rstrip("=")
+
+
+@pytest.mark.parametrize(
+    "data, error",
+    [
+        ({**VALID_CALLBACK, "custom_data": "x" * 4096}, b"Query string too long"),
+        (
+            {**VALID_CALLBACK, **{f"param{i}": i for i in range(30)}},
+            b"Too many query parameters",
+        ),
+        ({**VALID_CALLBACK, "key_id": "unknown"}, b"Invalid key_id"),
+        ({**VALID_CALLBACK, "key_id": "-1"}, b"Invalid key_id"),
+        ({**VALID_CALLBACK, "key_id": "²"}, b"Invalid key_id"),
+        ({**VALID_CALLBACK, "key_id": ""}, b"Invalid key_id"),
+        ({**VALID_CALLBACK, "signature": "a"}, b"Invalid signature"),
+        ({**VALID_CALLBACK, "signature": ""}, b"Invalid signature"),
+        ({**VALID_CALLBACK, "signature": "é"}, b"Invalid signature"),
+        (
+            {**VALID_CALLBACK, "signature": encode_signature(b"\x30" * 70)},
+            b"Invalid signature",
+        ),
+    ],
+)
+def test_get_rejects_malformed_callbacks_without_key_lookup(client, data, error):
+    with mock.patch.object(AdmobSSVView, "get_public_key") as get_public_key:
+        response = client.get("/admob-ssv/", data)
+
+    assert response.status_code == 400
+    assert response.content == error
+    assert not get_public_key.called
+
+
+def test_max_query_length_and_params_are_configurable(settings, client):
+    settings.ADMOB_SSV_MAX_QUERY_LENGTH = 100
+    response = client.get("/admob-ssv/", VALID_CALLBACK)
+    assert response.content == b"Query string too long"
+
+    settings.ADMOB_SSV_MAX_QUERY_PARAMS = 5
+    settings.ADMOB_SSV_MAX_QUERY_LENGTH = 4096
+    response = client.get("/admob-ssv/", VALID_CALLBACK)
+    assert response.content == b"Too many query parameters"
@@ -0,0 +1,135 @@
+import base64
+
+import pytest
+
+from admob_ssv.verifiers import (
+    CryptographyVerifier,
+    EcdsaVerifier,
+    Verifier,
+    get_verifier,
+    is_der_signature,
+)
+from admob_ssv.views import AdmobSSVView
+
+from .test_views import PUBLIC_KEY_PEM
+
+SIGNED_CONTENTS = [
+    (
+        b"ad_network=5450213213286189855&ad_unit=1234567890&custom_data=customdata42&reward_amount=1&reward_item=Reward&timestamp=1683852940453&transaction_id=123456789&user_id=userid42",
+        "MEQCIAhKY5P-aBmjU0iqxtjq2JPzeNKnQ92ZbSPC33Sp4ByeAiBArqhg9_uafB1LCBYVIXWNOW8vVVlocLc81ptROfE44Q",
+    ),
+    (
+        b"ad_network=5450213213286189855&ad_unit=1234567890&custom_data=8b626840-a5bb-4732-a02b-67517d6b9443&reward_amount=1&reward_item=Boost&timestamp=1683939248995&transaction_id=123456789&user_id=VXNlcjo0Mg==",
+        "MEQCIGdfQR4eu9bOi3gg069p0ZcH5H-u3etEFQsSJZ4fPU_EAiB75fI8p8uKetMld8_wT3GNPuGnnJYNpHN2ZP9u7bcpiA",
+    ),
+]
+
+
+def decode_signature(encoded_signature: str) -> bytes:
+    return base64.urlsafe_b64decode(encoded_signature + "===")
+
+
+@pytest.fixture(params=[EcdsaVerifier, CryptographyVerifier])
+def verifier(request) -> Verifier:
+    if request.param is CryptographyVerifier:
+        pytest.importorskip("cryptography")
+    return request.param()
+
+
+@pytest.mark.parametrize("content, encoded_signature", SIGNED_CONTENTS)
+def test_verifier_accepts_valid_signatures(verifier, content, encoded_signature):
+    verifying_key = verifier.load_key(PUBLIC_KEY_PEM)
+    signature = decode_signature(encoded_signature)
+    assert verifier.verify(verifying_key, signature, content)
+
+
+@pytest.mark.parametrize("content, encoded_signature", SIGNED_CONTENTS)
+def test_verifier_rejects_tampered_content(verifier, content, encoded_signature):
+    verifying_key = verifier.load_key(PUBLIC_KEY_PEM)
+    signature = decode_signature(encoded_signature)
+    assert not verifier.verify(verifying_key, signature, content + b"&tampered=1")
+
+
+def test_verifier_rejects_mismatching_signatures(verifier):
+    verifying_key = verifier.load_key(PUBLIC_KEY_PEM)
+    content = SIGNED_CONTENTS[0][0]
+    signature = decode_signature(SIGNED_CONTENTS[1][1])
+    assert not verifier.verify(verifying_key, signature, content)
+
+
+def test_verifier_rejects_malformed_signatures(verifier):
+    verifying_key = verifier.load_key(PUBLIC_KEY_PEM)
+    content = SIGNED_CONTENTS[0][0]
+    assert not verifier.verify(verifying_key, b"not a DER signature", content)
+
+
+def test_get_verifier_uses_configured_backend(settings):
+    settings.ADMOB_SSV_VERIFIER_BACKEND = "admob_ssv.verifiers.EcdsaVerifier"
+    assert isinstance(get_verifier(), EcdsaVerifier)
+    assert get_verifier() is get_verifier()
+
+
+def test_verify_signature_with_cryptography_backend(settings):
+    pytest.importorskip("cryptography")
+    settings.ADMOB_SSV_VERIFIER_BACKEND = "admob_ssv.verifiers.CryptographyVerifier"
+    content, encoded_signature = SIGNED_CONTENTS[0]
+
+    view = AdmobSSVView()
+    signature = decode_signature(encoded_signature)
+    assert view.verify_signature(PUBLIC_KEY_PEM, signature, content)
+    assert not view.verify_signature(PUBLIC_KEY_PEM, signature, content + b"!")
+
+
+@pytest.mark.parametrize("_, encoded_signature", SIGNED_CONTENTS)
+def test_is_der_signature_accepts_admob_signatures(_, encoded_signature):
+    assert is_der_signature(decode_signature(encoded_signature))
+
+
+@pytest.mark.parametrize(
+    "signature",
+    [
+        b"",
+        b"not a DER signature",
+        # Sequence length doesn't match.
+        b"\x30\x07\x02\x01\x01\x02\x01\x01",
+        # Not a sequence.
+        b"\x31\x06\x02\x01\x01\x02\x01\x01",
+        # Second element isn't an integer.
+        b"\x30\x06\x02\x01\x01\x04\x01\x01",
+        # Integer length exceeds the sequence.
+        b"\x30\x06\x02\x01\x01\x02\x02\x01",
+        # Trailing bytes.
+        b"\x30\x08\x02\x01\x01\x02\x01\x01\x00\x00",
+        # Negative integer.
+        b"\x30\x06\x02\x01\x81\x02\x01\x01",
+        # Unneeded zero padding.
+        b"\x30\x07\x02\x02\x00\x01\x02\x01\x01",
+        # Integer longer than 33 bytes.
+        b"\x30\x27\x02\x22" + b"\x01" * 34 + b"\x02\x01\x01",
+    ],
+)
+def test_is_der_signature_rejects_malformed_signatures(signature):
+    assert not is_der_signature(signature)
+
+
+def test_is_der_signature_accepts_minimal_signature():
+    assert is_der_signature(b"\x30\x06\x02\x01\x01\x02\x01\x01")
+    assert is_der_signature(b"\x30\x07\x02\x02\x00\x81\x02\x01\x01")
+
+
+def test_ecdsa_verifier_precomputes_tables():
+    class PlainEcdsaVerifier(EcdsaVerifier):
+        precompute = False
+
+    content, encoded_signature = SIGNED_CONTENTS[0]
+    signature = decode_signature(encoded_signature)
+
+    for verifier in (EcdsaVerifier(), PlainEcdsaVerifier()):
+        verifying_key = verifier.load_key(PUBLIC_KEY_PEM)
+        assert verifier.verify(verifying_key, signature, content)
+        assert not verifier.verify(verifying_key, signature, content + b"!")
+
+    plain_point = PlainEcdsaVerifier().load_key(PUBLIC_KEY_PEM).pubkey.point
+    precomputed_point = EcdsaVerifier().load_key(PUBLIC_KEY_PEM).pubkey.point
+    assert precomputed_point == plain_point
+    assert precomputed_point.order() is not None
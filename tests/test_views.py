@@ -192,7 +192,7 @@ def test_get_with_unknown_key_id(client):
             "transaction_id": 123456789,
             "user_id": "userid42",
             "signature": "MEQCIAhKY5P-aBmjU0iqxtjq2JPzeNKnQ92ZbSPC33Sp4ByeAiBArqhg9_uafB1LCBYVIXWNOW8vVVlocLc81ptROfE44Q",
-            "key_id": "unknown",
+            "key_id": 1234567890,
         },
     )
 